@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Channel Splitter - headless batch processing.
+
+Splits, registers and exports every 3x5 tiled image in a directory or glob
+without the GUI. Each frame is written as its own set of *nm.png files.
+"""
+
+import argparse
+import glob
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+from src.image_splitter import GRID_COLS, GRID_ROWS, split_image
+from src.image_registration import (
+    register_channels, export_registered_channels,
+    configure_registration_service, shutdown_registration_service,
+    load_shift_calibration, default_verify_index
+)
+
+# Same extensions the GUI accepts via drag and drop
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif')
+
+# Marks the end of the frame queue for a worker
+_DONE = object()
+
+
+def find_mosaics(pattern: str) -> List[str]:
+    """
+    Resolve a directory or glob pattern to a sorted list of image files.
+
+    Args:
+        pattern: Directory containing mosaics, or a glob such as "raw/*.png".
+
+    Returns:
+        Sorted list of image file paths.
+    """
+    if os.path.isdir(pattern):
+        candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+    else:
+        candidates = glob.glob(pattern)
+
+    return sorted(
+        path for path in candidates
+        if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+def check_unique_stems(paths: List[str]) -> None:
+    """
+    Make sure no two images would be exported to the same directory.
+
+    Each frame is written to <output_root>/<stem>/, so e.g. a.png and a.tif,
+    or day1/x.png and day2/x.png from "raw/*/*.png", would overwrite each other.
+
+    Args:
+        paths: Image files to process.
+
+    Raises:
+        ValueError: If several paths share a file stem.
+    """
+    by_stem = {}
+    for path in paths:
+        by_stem.setdefault(Path(path).stem, []).append(path)
+
+    duplicates = {stem: group for stem, group in by_stem.items() if len(group) > 1}
+    if duplicates:
+        lines = [f"  {stem}: {', '.join(group)}" for stem, group in sorted(duplicates.items())]
+        raise ValueError(
+            "Images with the same file name would share an output directory:\n"
+            + "\n".join(lines)
+        )
+
+
+def read_tile_size(path: str) -> Tuple[int, int]:
+    """
+    Tile size of a 3x5 tiled image, read from its header only.
+
+    Args:
+        path: Image file path.
+
+    Returns:
+        Tile size as (height, width), as split_image would report it.
+    """
+    with Image.open(path) as image:
+        width, height = image.size
+    return height // GRID_ROWS, width // GRID_COLS
+
+
+def process_frame(
+    path: str,
+    channels: list,
+    output_root: str,
+    ref_index: int = 7,
+    calibration: Optional[List[Tuple[float, float]]] = None,
+    verify_index: Optional[int] = None,
+) -> str:
+    """
+    Register and export one split mosaic.
+
+    Args:
+        path: Source image path (its stem names the output directory).
+        channels: The 15 split channels of the image.
+        output_root: Root output directory.
+        ref_index: Index of the reference channel.
+        calibration: Known shifts; if given, shift estimation is skipped.
+        verify_index: Channel to check against the calibration for drift.
+
+    Returns:
+        Output directory of the frame.
+
+    Raises:
+        CalibrationDrift: If the verified channel drifted from the calibration.
+    """
+    registered, shifts = register_channels(
+        channels,
+        ref_index=ref_index,
+        shifts=calibration,
+        verify_index=verify_index,
+        verbose=False,
+    )
+
+    output_dir = os.path.join(output_root, Path(path).stem)
+    export_registered_channels(
+        channels, shifts, output_dir, registered=registered, verbose=False
+    )
+    return output_dir
+
+
+def run_batch(
+    paths: List[str],
+    output_root: str,
+    workers: int = 2,
+    queue_size: int = 4,
+    ref_index: int = 7,
+    calibration: Optional[List[Tuple[float, float]]] = None,
+    verify_index: Optional[int] = None,
+    tile_size: Optional[Tuple[int, int]] = None,
+) -> int:
+    """
+    Process many mosaics with a loader thread and a pool of frame workers.
+
+    The loader splits frames into a bounded queue, so at most queue_size
+    decoded frames wait in memory while workers register and export.
+
+    Args:
+        paths: Image files to process.
+        output_root: Root output directory (one subdirectory per frame).
+        workers: Number of frames processed concurrently.
+        queue_size: Maximum number of split frames waiting in memory.
+        ref_index: Index of the reference channel.
+        calibration: Known shifts; if given, shift estimation is skipped.
+        verify_index: Channel to check against the calibration for drift.
+            Frames that drifted count as failed.
+        tile_size: If given, frames with other tile sizes fail instead of
+            being registered (e.g. the size the calibration was checked for).
+
+    Returns:
+        Number of frames that failed.
+
+    Raises:
+        ValueError: If two paths share a file stem (see check_unique_stems).
+    """
+    check_unique_stems(paths)
+
+    frames = queue.Queue(maxsize=queue_size)
+    lock = threading.Lock()
+    state = {"done": 0, "failed": 0}
+    total = len(paths)
+
+    def report(path: str, message: str, failed: bool = False):
+        with lock:
+            state["done"] += 1
+            if failed:
+                state["failed"] += 1
+            print(f"  [{state['done']}/{total}] {Path(path).name}: {message}", flush=True)
+
+    def load():
+        for path in paths:
+            try:
+                channels, size = split_image(path)
+            except Exception as e:
+                report(path, f"failed to load ({e})", failed=True)
+                continue
+            if tile_size is not None and tuple(size) != tuple(tile_size):
+                report(path, f"failed (tiles {size}, expected {tile_size})", failed=True)
+                continue
+            frames.put((path, channels))
+        for _ in range(workers):
+            frames.put(_DONE)
+
+    def work():
+        while True:
+            item = frames.get()
+            if item is _DONE:
+                return
+            path, channels = item
+            try:
+                output_dir = process_frame(
+                    path, channels, output_root,
+                    ref_index=ref_index,
+                    calibration=calibration,
+                    verify_index=verify_index,
+                )
+            except Exception as e:
+                report(path, f"failed ({e})", failed=True)
+            else:
+                report(path, f"saved to {output_dir}")
+
+    threads = [threading.Thread(target=load, daemon=True)]
+    threads += [threading.Thread(target=work, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return state["failed"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Split, register and export 3x5 tiled images without the GUI"
+    )
+    parser.add_argument(
+        "input",
+        help="Directory of 3x5 tiled images, or a glob pattern (quote it)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        "-o",
+        default="output",
+        help="Output root; each frame is written to <output-dir>/<stem>/ (default: output)",
+    )
+    parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=2,
+        help="Number of frames processed concurrently (default: 2)",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=4,
+        help="Maximum number of split frames waiting in memory (default: 4)",
+    )
+    parser.add_argument(
+        "--executor",
+        choices=["process", "thread"],
+        default="process",
+        help="Registration worker pool type (default: process)",
+    )
+    parser.add_argument(
+        "--pool-workers",
+        type=int,
+        default=None,
+        help="Registration worker pool size (default: CPU count)",
+    )
+    parser.add_argument(
+        "--calibration",
+        default=None,
+        help="Shift calibration JSON; skips shift estimation and only applies shifts",
+    )
+    parser.add_argument(
+        "--verify-index",
+        type=int,
+        default=None,
+        help="With --calibration, re-estimate this channel to detect drift "
+             "(default: a corner channel other than the reference)",
+    )
+
+    args = parser.parse_args()
+
+    paths = find_mosaics(args.input)
+    if not paths:
+        print(f"No images found for: {args.input}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        check_unique_stems(paths)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    calibration = None
+    ref_index = 7
+    tile_size = None
+    verify_index = None
+    if args.calibration:
+        # All frames must match the calibration; later frames are checked
+        # against the first one's tile size
+        try:
+            tile_size = read_tile_size(paths[0])
+            calibration, ref_index = load_shift_calibration(
+                args.calibration, GRID_ROWS * GRID_COLS, tile_size
+            )
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Invalid calibration {args.calibration}: {e}", file=sys.stderr)
+            sys.exit(1)
+        verify_index = args.verify_index
+        if verify_index is None:
+            verify_index = default_verify_index(ref_index, len(calibration))
+
+    print(f"Input: {args.input} ({len(paths)} images)")
+    print(f"Output directory: {args.output_dir}")
+    if calibration:
+        print(f"Mode: apply calibration (drift check on channel {verify_index})")
+    else:
+        print("Mode: register")
+    print("=" * 50)
+
+    configure_registration_service(args.executor, args.pool_workers).start()
+    start = time.perf_counter()
+    try:
+        failed = run_batch(
+            paths,
+            args.output_dir,
+            workers=max(1, args.workers),
+            queue_size=max(1, args.queue_size),
+            ref_index=ref_index,
+            calibration=calibration,
+            verify_index=verify_index,
+            tile_size=tile_size,
+        )
+    finally:
+        shutdown_registration_service()
+    elapsed = time.perf_counter() - start
+
+    print("=" * 50)
+    print(f"Processed {len(paths) - failed}/{len(paths)} images in {elapsed:.1f}s")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""Channel Splitter - split and registration benchmarks.
+
+Builds synthetic 3x5 mosaics whose channels are shifted copies of one scene
+with known (dx, dy) offsets, then times split_image, compute_shift,
+apply_shift, register_channels (cold, including worker pool startup, and
+warm) and export_registered_channels at several tile sizes. The shifts
+estimated by register_channels are checked against the true ones.
+
+Results are written as JSON. Shifts off the true ones by more than
+--max-error exit with status 1, as does, with --baseline, a slowdown or
+an accuracy loss against a stored run.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+from scipy.ndimage import gaussian_filter
+
+from src.image_splitter import GRID_COLS, GRID_ROWS, split_image
+from src.image_registration import (
+    compute_shift, apply_shift, register_channels, export_registered_channels,
+    configure_registration_service, shutdown_registration_service
+)
+
+STAGES = [
+    "split",
+    "compute_shift",
+    "apply_shift",
+    "register_cold",
+    "register_warm",
+    "export",
+]
+
+DEFAULT_TILE_SIZES = [64, 128, 256]
+
+# Runs shorter than this are repeated and the best time is kept
+REPEAT_BELOW_SECONDS = 1.0
+
+# Timings below this are too noisy to flag as regressions
+MIN_COMPARE_SECONDS = 0.005
+
+# Default allowed per-axis error of estimated shifts vs. the true ones
+DEFAULT_MAX_ERROR_PX = 0.5
+
+
+def make_mosaic(
+    tile_size: int,
+    ref_index: int = 7,
+    max_shift: Optional[int] = None,
+    seed: int = 0,
+) -> Tuple[np.ndarray, List[Tuple[float, float]]]:
+    """
+    Create a 3x5 mosaic of shifted copies of a random textured scene.
+
+    Channel i shows the scene moved by shifts[i] relative to the reference
+    channel, so register_channels should estimate exactly these shifts.
+
+    Args:
+        tile_size: Height and width of each tile in pixels.
+        ref_index: Index of the unshifted reference channel.
+        max_shift: Largest shift in pixels (default: tile_size // 8, well
+            inside compute_shift's search margin).
+        seed: Random seed.
+
+    Returns:
+        Tuple of (mosaic (3 * tile_size, 5 * tile_size) uint8, true (dx, dy)
+        shift per channel).
+    """
+    if max_shift is None:
+        max_shift = max(1, tile_size // 8)
+    rng = np.random.default_rng(seed)
+    n_channels = GRID_ROWS * GRID_COLS
+
+    pad = max_shift
+    scene = gaussian_filter(rng.random((tile_size + 2 * pad, tile_size + 2 * pad)), 1.5)
+    scene = (scene - scene.min()) / np.ptp(scene) * 255
+
+    shifts = [tuple(float(v) for v in rng.integers(-max_shift, max_shift + 1, 2))
+              for _ in range(n_channels)]
+    shifts[ref_index] = (0.0, 0.0)
+
+    mosaic = np.empty((GRID_ROWS * tile_size, GRID_COLS * tile_size), dtype=np.uint8)
+    for i, (dx, dy) in enumerate(shifts):
+        # channel[y, x] = reference[y - dy, x - dx]: content moved by (dx, dy)
+        y0, x0 = pad - int(dy), pad - int(dx)
+        row, col = divmod(i, GRID_COLS)
+        mosaic[row * tile_size:(row + 1) * tile_size, col * tile_size:(col + 1) * tile_size] = (
+            scene[y0:y0 + tile_size, x0:x0 + tile_size]
+        )
+    return mosaic, shifts
+
+
+def shift_accuracy(
+    estimated: List[Tuple[float, float]], true: List[Tuple[float, float]]
+) -> dict:
+    """
+    Compare estimated shifts against the true ones.
+
+    Returns:
+        dict: max_error_px (largest per-axis error), bias ([mean dx error,
+        mean dy error]) and mismatches (channels off by more than 0.5 px).
+    """
+    errors = np.asarray(estimated, dtype=np.float64) - np.asarray(true, dtype=np.float64)
+    return {
+        "max_error_px": float(np.abs(errors).max()) if errors.size else 0.0,
+        "bias": [float(v) for v in errors.mean(axis=0)],
+        "mismatches": int(np.count_nonzero(np.abs(errors).max(axis=1) > 0.5)),
+    }
+
+
+def measure(func: Callable[[], object], repeat: int = 3) -> Tuple[float, int]:
+    """
+    Time a callable, repeating fast ones and keeping the best run.
+
+    Returns:
+        Tuple of (best time in seconds, number of runs).
+    """
+    times = []
+    while True:
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+        if len(times) >= repeat or times[0] >= REPEAT_BELOW_SECONDS:
+            break
+    return min(times), len(times)
+
+
+def run_benchmarks(
+    tile_sizes: List[int],
+    stages: List[str] = STAGES,
+    executor: str = "process",
+    pool_workers: Optional[int] = None,
+    repeat: int = 3,
+    ref_index: int = 7,
+    seed: int = 0,
+    verbose: bool = True,
+) -> dict:
+    """
+    Benchmark the split/register/export stages at several tile sizes.
+
+    Every register_cold run configures a fresh registration service, so its
+    time includes starting (and, for processes, spawning) the worker pool.
+    Shift accuracy is recorded on the register stages.
+
+    Returns:
+        dict: {"meta": ..., "results": [...]} ready to be saved as JSON.
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            for tile_size in sorted(tile_sizes):
+                mosaic, true_shifts = make_mosaic(tile_size, ref_index=ref_index, seed=seed)
+                mosaic_path = os.path.join(tmpdir, f"mosaic_{tile_size}.png")
+                Image.fromarray(mosaic).save(mosaic_path)
+                channels, _ = split_image(mosaic_path)
+                target = 0 if ref_index != 0 else 1
+                export_dir = os.path.join(tmpdir, f"export_{tile_size}")
+
+                # Registered output and shifts of the latest register run
+                state = {}
+
+                def register_cold():
+                    configure_registration_service(executor, pool_workers)
+                    state["registered"], state["shifts"] = register_channels(
+                        channels, ref_index=ref_index, verbose=False
+                    )
+
+                def register_warm():
+                    state["registered"], state["shifts"] = register_channels(
+                        channels, ref_index=ref_index, verbose=False
+                    )
+
+                def export():
+                    if "registered" not in state:
+                        register_warm()
+                    return export_registered_channels(
+                        channels, state["shifts"], export_dir,
+                        registered=state["registered"], verbose=False
+                    )
+
+                funcs = {
+                    "split": lambda: split_image(mosaic_path),
+                    "compute_shift": lambda: compute_shift(channels[ref_index], channels[target]),
+                    "apply_shift": lambda: apply_shift(channels[target], *true_shifts[target]),
+                    "register_cold": register_cold,
+                    "register_warm": register_warm,
+                    "export": export,
+                }
+
+                for stage in stages:
+                    if stage == "register_warm" and "register_cold" not in stages:
+                        # Start the pool outside the timed runs
+                        configure_registration_service(executor, pool_workers).start()
+                    seconds, runs = measure(funcs[stage], repeat=repeat)
+
+                    # Megapixels processed per call
+                    if stage == "split":
+                        megapixels = mosaic.size / 1e6
+                    elif stage in ("compute_shift", "apply_shift"):
+                        megapixels = tile_size * tile_size / 1e6
+                    else:
+                        megapixels = len(channels) * tile_size * tile_size / 1e6
+
+                    record = {
+                        "stage": stage,
+                        "tile_size": tile_size,
+                        "seconds": seconds,
+                        "runs": runs,
+                        "mp_per_s": megapixels / seconds if seconds > 0 else None,
+                    }
+                    if stage.startswith("register_"):
+                        record["accuracy"] = shift_accuracy(state["shifts"], true_shifts)
+                    results.append(record)
+                    if verbose:
+                        print(f"  {_format_row(record)}", flush=True)
+        finally:
+            shutdown_registration_service()
+
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "executor": executor,
+            "pool_workers": pool_workers,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def check_accuracy(results: dict, max_error: float = DEFAULT_MAX_ERROR_PX) -> List[str]:
+    """
+    Check estimated shifts against the true ones, independent of a baseline.
+
+    A register stage fails when any channel's shift is off by more than
+    max_error pixels along either axis. The message includes the mean
+    error (bias), which shows a systematic offset of the estimator.
+
+    Returns:
+        List of human-readable failure messages (empty if none).
+    """
+    failures = []
+    for record in results["results"]:
+        accuracy = record.get("accuracy")
+        if not accuracy or accuracy["max_error_px"] <= max_error:
+            continue
+        dx, dy = accuracy["bias"]
+        failures.append(
+            f"{record['stage']} @ {record['tile_size']}px: shift error "
+            f"{accuracy['max_error_px']:.1f}px > {max_error:g}px, "
+            f"bias ({dx:+.2f}, {dy:+.2f})px, {accuracy['mismatches']} channel(s) off by >0.5px"
+        )
+    return failures
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.2) -> List[str]:
+    """
+    Compare results against a baseline.
+
+    A stage/tile size regresses when its time exceeds the baseline by more
+    than threshold (0.2 = 20%), or when its shift accuracy is worse (larger
+    max error or more mismatched channels), or when it ran in the baseline
+    but is missing now, so run with the baseline's stages and tile sizes.
+    Entries the baseline did not run and times under MIN_COMPARE_SECONDS
+    are not compared.
+
+    Returns:
+        List of human-readable regression messages (empty if none).
+    """
+    current = {(r["stage"], r["tile_size"]): r for r in results["results"]}
+    regressions = []
+    for reference in baseline["results"]:
+        key = (reference["stage"], reference["tile_size"])
+        label = f"{reference['stage']} @ {reference['tile_size']}px"
+        record = current.get(key)
+        if record is None:
+            regressions.append(f"{label}: missing (ran in baseline)")
+            continue
+
+        ratio = record["seconds"] / reference["seconds"]
+        if ratio > 1 + threshold and record["seconds"] >= MIN_COMPARE_SECONDS:
+            regressions.append(
+                f"{label}: {record['seconds']:.3f}s vs {reference['seconds']:.3f}s "
+                f"({(ratio - 1) * 100:+.0f}%)"
+            )
+
+        accuracy, reference_accuracy = record.get("accuracy"), reference.get("accuracy")
+        if accuracy and reference_accuracy:
+            if (accuracy["max_error_px"] > reference_accuracy["max_error_px"]
+                    or accuracy["mismatches"] > reference_accuracy["mismatches"]):
+                regressions.append(
+                    f"{label}: shift error {accuracy['max_error_px']:.1f}px "
+                    f"({accuracy['mismatches']} mismatched) vs "
+                    f"{reference_accuracy['max_error_px']:.1f}px "
+                    f"({reference_accuracy['mismatches']} mismatched)"
+                )
+    return regressions
+
+
+def _format_row(record: dict) -> str:
+    mp_per_s = f"{record['mp_per_s']:9.2f}" if record.get("mp_per_s") else "        -"
+    row = (
+        f"{record['stage']:<14} {record['tile_size']:>5}px {record['seconds'] * 1e3:10.1f}ms "
+        f"{mp_per_s} MP/s"
+    )
+    accuracy = record.get("accuracy")
+    if accuracy:
+        dx, dy = accuracy["bias"]
+        row += (
+            f"  max error {accuracy['max_error_px']:.1f}px, "
+            f"bias ({dx:+.2f}, {dy:+.2f}), {accuracy['mismatches']} mismatched"
+        )
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark splitting, registration and export on synthetic mosaics"
+    )
+    parser.add_argument(
+        "--tile-sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_TILE_SIZES,
+        help="Tile sizes in pixels (default: 64 128 256)",
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGES,
+        default=STAGES,
+        help="Stages to run (default: all)",
+    )
+    parser.add_argument(
+        "--executor",
+        choices=["process", "thread"],
+        default="process",
+        help="Registration worker pool type (default: process)",
+    )
+    parser.add_argument(
+        "--pool-workers",
+        type=int,
+        default=None,
+        help="Registration worker pool size (default: CPU count)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help=f"Timed runs for stages under {REPEAT_BELOW_SECONDS:.0f}s; best is kept (default: 3)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic mosaics")
+    parser.add_argument(
+        "--output",
+        "-o",
+        default="output/benchmark.json",
+        help="Results JSON (default: output/benchmark.json)",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="Baseline results JSON to compare against",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown vs. baseline, as a fraction (default: 0.2)",
+    )
+    parser.add_argument(
+        "--max-error",
+        type=float,
+        default=DEFAULT_MAX_ERROR_PX,
+        help="Allowed error of estimated vs. true shifts in pixels, per axis "
+             f"(default: {DEFAULT_MAX_ERROR_PX})",
+    )
+
+    args = parser.parse_args()
+
+    print(f"Stages: {', '.join(args.stages)}")
+    print(f"Tile sizes: {', '.join(f'{s}px' for s in sorted(args.tile_sizes))}")
+    print(f"Executor: {args.executor} ({args.pool_workers or os.cpu_count()} workers)")
+    print("=" * 50)
+    results = run_benchmarks(
+        args.tile_sizes,
+        args.stages,
+        executor=args.executor,
+        pool_workers=args.pool_workers,
+        repeat=max(1, args.repeat),
+        seed=args.seed,
+    )
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print("=" * 50)
+    print(f"Saved: {output}")
+
+    failed = False
+    failures = check_accuracy(results, args.max_error)
+    if failures:
+        print(f"\n{len(failures)} shift accuracy failure(s) over {args.max_error:g}px:")
+        for message in failures:
+            print(f"  {message}")
+        failed = True
+
+    if args.baseline is not None:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            for message in regressions:
+                print(f"  {message}")
+            failed = True
+        else:
+            print(f"\nNo regressions vs {args.baseline}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,82 +1,415 @@
 """Channel view widget for displaying individual channel images."""
 
+import math
+from typing import Dict, List, Tuple
+
 import numpy as np
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PyQt6.QtGui import QImage, QPixmap
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QLabel
+from PyQt6.QtGui import QImage, QPixmap, QPainter, QColor
+from PyQt6.QtCore import Qt, QPointF, QRectF, QTimer
+
+# Edge length of a pyramid tile in pixels
+TILE_SIZE = 256
+
+# Zoom step per wheel notch and zoom limits (screen pixels per image pixel)
+ZOOM_STEP = 1.25
+MAX_ZOOM = 32.0
+
+# Delay before repainting with smooth filtering after zoom/pan/resize (ms)
+SMOOTH_DELAY_MS = 120
+
+
+def to_display_dtype(image: np.ndarray) -> np.ndarray:
+    """
+    Convert an image to a dtype numpy_to_pixmap can show without wrapping.
+
+    uint8 images and uint16 grayscale (shown as Grayscale16) are kept.
+    uint16 color images are reduced to their high byte, and other dtypes
+    are clipped to 0..255, so values are never taken modulo 256.
+
+    Args:
+        image: Grayscale (H, W) or RGB/RGBA (H, W, 3|4) image.
+
+    Returns:
+        Contiguous uint8 image, or uint16 for 16-bit grayscale.
+    """
+    image = np.ascontiguousarray(image)
+    if image.dtype == np.uint8:
+        return image
+    if image.dtype == np.uint16:
+        if image.ndim == 2:
+            return image
+        return (image >> 8).astype(np.uint8)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def numpy_to_pixmap(array: np.ndarray) -> QPixmap:
+    """
+    Convert numpy array to QPixmap.
+
+    The QImage wraps the array buffer directly (no tobytes() copy), so the
+    only copy is the one QPixmap.fromImage makes. Contiguous arrays, such
+    as planes of a channel cube, are used as they are.
+
+    Args:
+        array: Grayscale (H, W) uint8/uint16, or RGB/RGBA (H, W, 3|4) uint8.
+
+    Returns:
+        QPixmap of the image.
+    """
+    array = to_display_dtype(array)
+
+    if array.ndim == 2:
+        if array.dtype == np.uint16:
+            fmt = QImage.Format.Format_Grayscale16
+        else:
+            fmt = QImage.Format.Format_Grayscale8
+    elif array.ndim == 3:
+        channels = array.shape[2]
+        if channels == 3:
+            fmt = QImage.Format.Format_RGB888
+        elif channels == 4:
+            fmt = QImage.Format.Format_RGBA8888
+        else:
+            raise ValueError(f"Unsupported number of channels: {channels}")
+    else:
+        raise ValueError(f"Unsupported array dimensions: {array.ndim}")
+
+    height, width = array.shape[:2]
+    qimg = QImage(array.data, width, height, array.strides[0], fmt)
+    return QPixmap.fromImage(qimg)
+
+
+def downsample_2x(image: np.ndarray) -> np.ndarray:
+    """
+    Halve an image by averaging 2x2 blocks.
+
+    An odd trailing row/column is dropped. Sums are accumulated in the
+    next wider unsigned type, so the result keeps the input dtype.
+
+    Args:
+        image: uint8 or uint16 image of shape (H, W) or (H, W, C).
+
+    Returns:
+        Image of shape (H // 2, W // 2[, C]) with the input dtype.
+    """
+    height, width = image.shape[0] // 2, image.shape[1] // 2
+    wide = np.uint16 if image.dtype == np.uint8 else np.uint32
+    blocks = image[:2 * height, :2 * width].astype(wide)
+    summed = blocks[0::2, 0::2] + blocks[0::2, 1::2] + blocks[1::2, 0::2] + blocks[1::2, 1::2]
+    return ((summed + 2) >> 2).astype(image.dtype)
+
+
+class ImagePyramid:
+    """
+    Mip levels of an image, rendered to pixmaps one tile at a time.
+
+    Level 0 is the full-resolution image; each further level halves it
+    until it fits in a single tile. Levels are built once up front, tile
+    pixmaps only when a tile is first drawn.
+    """
+
+    def __init__(self, image: np.ndarray, tile_size: int = TILE_SIZE):
+        """
+        Build the pyramid.
+
+        Args:
+            image: Grayscale (H, W) or RGB/RGBA (H, W, 3|4) image. 16-bit
+                grayscale levels stay 16-bit (see to_display_dtype).
+            tile_size: Tile edge length in pixels.
+        """
+        level = to_display_dtype(image)
+        self.tile_size = tile_size
+        self.levels: List[np.ndarray] = [level]
+        while max(level.shape[:2]) > tile_size and min(level.shape[:2]) >= 2:
+            level = downsample_2x(level)
+            self.levels.append(level)
+        self._tiles: Dict[Tuple[int, int, int], QPixmap] = {}
+
+    @property
+    def width(self) -> int:
+        return self.levels[0].shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.levels[0].shape[0]
+
+    def level_for_scale(self, scale: float) -> int:
+        """Return the coarsest level that still has at least one pixel per screen pixel."""
+        if scale >= 1.0:
+            return 0
+        return min(int(math.floor(math.log2(1.0 / scale))), len(self.levels) - 1)
+
+    def tile_grid(self, level: int) -> Tuple[int, int]:
+        """Return the number of tile rows and columns of a level."""
+        height, width = self.levels[level].shape[:2]
+        return math.ceil(height / self.tile_size), math.ceil(width / self.tile_size)
+
+    def tile(self, level: int, row: int, col: int) -> QPixmap:
+        """Return the pixmap of a tile, rendering it on first use."""
+        key = (level, row, col)
+        pixmap = self._tiles.get(key)
+        if pixmap is None:
+            y = row * self.tile_size
+            x = col * self.tile_size
+            data = self.levels[level][y:y + self.tile_size, x:x + self.tile_size]
+            pixmap = numpy_to_pixmap(data)
+            self._tiles[key] = pixmap
+        return pixmap
+
+
+class PyramidView(QWidget):
+    """
+    Image view that draws only the visible pyramid tiles at the right level.
+
+    Mouse wheel zooms around the cursor, left-drag pans and double-click
+    fits the image to the view again.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pyramid = None
+        self._scale = 1.0
+        self._origin = QPointF(0, 0)  # Screen position of image pixel (0, 0)
+        self._fit = True
+        self._drag_start = None
+        self._smooth = True
+        self.setMinimumSize(200, 200)
+        self.setMouseTracking(False)
+
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.setInterval(SMOOTH_DELAY_MS)
+        self._smooth_timer.timeout.connect(self._end_interaction)
+
+    @property
+    def zoom(self) -> float:
+        """Screen pixels per full-resolution image pixel."""
+        return self._scale
+
+    def set_pyramid(self, pyramid: ImagePyramid):
+        """
+        Show a pyramid.
+
+        Zoom and pan are kept when the new image has the same size, so
+        channels can be compared at the same spot.
+        """
+        same_size = (
+            self.pyramid is not None
+            and (self.pyramid.width, self.pyramid.height) == (pyramid.width, pyramid.height)
+        )
+        self.pyramid = pyramid
+        if not same_size or self._fit:
+            self.fit_to_window()
+        self.update()
+
+    def set_image(self, image: np.ndarray):
+        """Build a pyramid for an image and show it."""
+        self.set_pyramid(ImagePyramid(image))
+
+    def clear(self):
+        self.pyramid = None
+        self.update()
+
+    def fit_to_window(self):
+        """Scale the image to fit the view and center it."""
+        self._fit = True
+        if self.pyramid is None:
+            return
+        width, height = self.pyramid.width, self.pyramid.height
+        self._scale = min(self.width() / width, self.height() / height)
+        self._origin = QPointF(
+            (self.width() - width * self._scale) / 2,
+            (self.height() - height * self._scale) / 2,
+        )
+        self.update()
+
+    def _min_zoom(self) -> float:
+        width, height = self.pyramid.width, self.pyramid.height
+        return min(1.0, self.width() / width, self.height() / height) / 4
+
+    def _interact(self):
+        """Draw with fast filtering until interaction stops."""
+        self._smooth = False
+        self._smooth_timer.start()
+
+    def _end_interaction(self):
+        self._smooth = True
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#f0f0f0"))
+        if self.pyramid is None:
+            return
+        if self._smooth:
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+        pyramid = self.pyramid
+        level = pyramid.level_for_scale(self._scale)
+        level_height, level_width = pyramid.levels[level].shape[:2]
+        # Screen pixels per level pixel; the level spans the full image extent
+        sx = self._scale * pyramid.width / level_width
+        sy = self._scale * pyramid.height / level_height
+
+        tile = pyramid.tile_size
+        rows, cols = pyramid.tile_grid(level)
+        visible = QRectF(event.rect())
+        col0 = max(0, int((visible.left() - self._origin.x()) / (sx * tile)))
+        col1 = min(cols, int(math.ceil((visible.right() - self._origin.x()) / (sx * tile))))
+        row0 = max(0, int((visible.top() - self._origin.y()) / (sy * tile)))
+        row1 = min(rows, int(math.ceil((visible.bottom() - self._origin.y()) / (sy * tile))))
+
+        for row in range(row0, row1):
+            for col in range(col0, col1):
+                pixmap = pyramid.tile(level, row, col)
+                target = QRectF(
+                    self._origin.x() + col * tile * sx,
+                    self._origin.y() + row * tile * sy,
+                    pixmap.width() * sx,
+                    pixmap.height() * sy,
+                )
+                painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._fit:
+            self.fit_to_window()
+        self._interact()
+
+    def wheelEvent(self, event):
+        if self.pyramid is None:
+            return
+        steps = event.angleDelta().y() / 120
+        if steps == 0:
+            return
+        scale = self._scale * ZOOM_STEP ** steps
+        scale = max(self._min_zoom(), min(MAX_ZOOM, scale))
+
+        # Keep the image point under the cursor fixed
+        pos = event.position()
+        ratio = scale / self._scale
+        self._origin = pos - (pos - self._origin) * ratio
+        self._scale = scale
+        self._fit = False
+        self._interact()
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._drag_start = event.position()
+            self.setCursor(Qt.CursorShape.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        if self._drag_start is not None:
+            pos = event.position()
+            self._origin += pos - self._drag_start
+            self._drag_start = pos
+            self._fit = False
+            self._interact()
+            self.update()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._drag_start = None
+            self.unsetCursor()
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit_to_window()
+
 
 
 class ChannelView(QWidget):
     """Widget to display a single channel image with a label."""
 
-    def __init__(self, channel_data: np.ndarray, label_text: str, parent=None):
+    def __init__(self, channel_data: np.ndarray = None, label_text: str = "", parent=None):
         """
         Initialize the channel view.
 
+        The view is meant to be reused: call set_channel() to swap the
+        displayed image instead of building a new view per channel. The
+        image can be zoomed with the mouse wheel and panned by dragging.
+
         Args:
-            channel_data: Numpy array of the channel image.
+            channel_data: Numpy array of the channel image (optional).
             label_text: Text label for the channel.
             parent: Parent widget.
         """
         super().__init__(parent)
-        self._setup_ui(channel_data, label_text)
+        self._setup_ui()
+        if channel_data is not None:
+            self.set_channel(ImagePyramid(channel_data), label_text)
 
-    def _setup_ui(self, channel_data: np.ndarray, label_text: str):
+    def _setup_ui(self):
         """Set up the UI components."""
         layout = QVBoxLayout(self)
         layout.setContentsMargins(5, 5, 5, 5)
 
         # Channel label
-        label = QLabel(label_text)
-        label.setStyleSheet("font-weight: bold; font-size: 12px; color: #333;")
-        layout.addWidget(label)
+        self.label = QLabel()
+        self.label.setStyleSheet("font-weight: bold; font-size: 12px; color: #333;")
+        layout.addWidget(self.label)
 
         # Image display
-        image_label = QLabel()
-        pixmap = self._numpy_to_pixmap(channel_data)
-        image_label.setPixmap(pixmap)
-        image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(image_label)
-
-
-    def _numpy_to_pixmap(self, array: np.ndarray) -> QPixmap:
-        """Convert numpy array to QPixmap."""
-        if array.ndim == 2:
-            # Grayscale
-            height, width = array.shape
-            bytes_per_line = width
-            qimg = QImage(
-                array.tobytes(),
-                width,
-                height,
-                bytes_per_line,
-                QImage.Format.Format_Grayscale8
-            )
-        elif array.ndim == 3:
-            height, width, channels = array.shape
-            if channels == 3:
-                # RGB
-                bytes_per_line = 3 * width
-                qimg = QImage(
-                    array.tobytes(),
-                    width,
-                    height,
-                    bytes_per_line,
-                    QImage.Format.Format_RGB888
-                )
-            elif channels == 4:
-                # RGBA
-                bytes_per_line = 4 * width
-                qimg = QImage(
-                    array.tobytes(),
-                    width,
-                    height,
-                    bytes_per_line,
-                    QImage.Format.Format_RGBA8888
-                )
-            else:
-                raise ValueError(f"Unsupported number of channels: {channels}")
-        else:
-            raise ValueError(f"Unsupported array dimensions: {array.ndim}")
+        self.image_view = PyramidView()
+        layout.addWidget(self.image_view, 1)
+
+    def set_channel(self, pyramid: ImagePyramid, label_text: str):
+        """Show a pre-built channel pyramid with its label."""
+        self.label.setText(label_text)
+        self.image_view.set_pyramid(pyramid)
+
+
+class ChannelGridView(QWidget):
+    """Widget showing all channels as thumbnails in the 3x5 sensor layout."""
+
+    def __init__(self, rows: int = 3, cols: int = 5, parent=None):
+        """
+        Initialize the grid view.
+
+        Args:
+            rows: Number of grid rows.
+            cols: Number of grid columns.
+            parent: Parent widget.
+        """
+        super().__init__(parent)
+        self.rows = rows
+        self.cols = cols
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Set up one caption and image label per grid cell."""
+        layout = QGridLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.setSpacing(8)
 
-        return QPixmap.fromImage(qimg)
+        self.captions = []
+        self.image_labels = []
+        for i in range(self.rows * self.cols):
+            cell = QWidget()
+            cell_layout = QVBoxLayout(cell)
+            cell_layout.setContentsMargins(0, 0, 0, 0)
+            cell_layout.setSpacing(2)
+
+            caption = QLabel()
+            caption.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            caption.setStyleSheet("font-size: 11px; color: #333;")
+            cell_layout.addWidget(caption)
+
+            image_label = QLabel()
+            image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            cell_layout.addWidget(image_label)
+
+            layout.addWidget(cell, i // self.cols, i % self.cols)
+            self.captions.append(caption)
+            self.image_labels.append(image_label)
+
+    def set_thumbnails(self, pixmaps: list, captions: list):
+        """Show pre-rendered thumbnail pixmaps with their captions."""
+        for i, (caption, image_label) in enumerate(zip(self.captions, self.image_labels)):
+            if i < len(pixmaps):
+                caption.setText(captions[i])
+                image_label.setPixmap(pixmaps[i])
+            else:
+                caption.clear()
+                image_label.clear()
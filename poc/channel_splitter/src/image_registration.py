@@ -1,10 +1,26 @@
 """Image registration module using template matching."""
 
+import json
+import os
+import threading
 import numpy as np
-from typing import List, Tuple
-from scipy.ndimage import shift as ndi_shift
+from typing import Callable, List, Optional, Tuple
+from multiprocessing import resource_tracker, shared_memory
 from scipy.signal import correlate2d
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+)
+
+# Called as progress(channel_index, completed_count, (dx, dy)) per finished channel
+ProgressCallback = Callable[[int, int, Tuple[float, float]], None]
+
+
+class RegistrationCancelled(Exception):
+    """Raised when a registration is cancelled before all channels finish."""
+
+
+class CalibrationDrift(Exception):
+    """Raised when a channel's fresh shift estimate drifted from the calibration."""
 
 
 def compute_shift(reference: np.ndarray, target: np.ndarray) -> Tuple[float, float]:
@@ -25,7 +41,8 @@ def compute_shift(reference: np.ndarray, target: np.ndarray) -> Tuple[float, flo
     h, w = ref_gray.shape
     th, tw = h // 3, w // 3
     cy, cx = h // 2, w // 2
-    template = ref_gray[cy - th//2 : cy + th//2, cx - tw//2 : cx + tw//2]
+    ty1, tx1 = cy - th//2, cx - tw//2
+    template = ref_gray[ty1 : cy + th//2, tx1 : cx + tw//2]
 
     # Normalize template
     template = template - template.mean()
@@ -39,18 +56,16 @@ def compute_shift(reference: np.ndarray, target: np.ndarray) -> Tuple[float, flo
     search_region = target_gray[sy1:sy2, sx1:sx2]
     search_region = search_region - search_region.mean()
 
-    # Cross-correlation
-    corr = correlate2d(search_region, template, mode='same')
+    # Cross-correlation over positions where the template fits entirely;
+    # corr[y, x] is the match with the template's top-left at (y, x)
+    corr = correlate2d(search_region, template, mode='valid')
 
     # Find peak
     peak_y, peak_x = np.unravel_index(np.argmax(corr), corr.shape)
 
-    # Calculate shift relative to center of search region
-    expected_y = (sy2 - sy1) // 2
-    expected_x = (sx2 - sx1) // 2
-
-    dy = peak_y - expected_y
-    dx = peak_x - expected_x
+    # Shift of the template from its position in the reference
+    dy = sy1 + peak_y - ty1
+    dx = sx1 + peak_x - tx1
 
     return (float(dx), float(dy))
 
@@ -68,23 +83,19 @@ def apply_shift(image: np.ndarray, dx: float, dy: float, highlight_empty: bool =
     Returns:
         Shifted RGB image.
     """
-    # Convert grayscale to RGB first
-    if image.ndim == 2:
-        rgb_image = np.stack([image, image, image], axis=-1)
-    else:
-        rgb_image = image.copy()
-
-    height, width = rgb_image.shape[:2]
+    height, width = image.shape[:2]
+    n_colors = 3 if image.ndim == 2 else image.shape[2]
 
     # Calculate empty regions based on shift
     shift_y, shift_x = int(round(-dy)), int(round(-dx))
 
-    # Apply shift to each channel
-    shifted = np.zeros_like(rgb_image)
-    for c in range(3):
-        shifted[:, :, c] = ndi_shift(
-            rgb_image[:, :, c], shift=(shift_y, shift_x), mode='constant', cval=0
-        )
+    # Integer translation is a single slice copy; grayscale is broadcast to RGB
+    shifted = np.zeros((height, width, n_colors), dtype=image.dtype)
+    src, dst = _overlap_slices(height, width, shift_y, shift_x)
+    if image.ndim == 2:
+        shifted[dst] = image[src][..., np.newaxis]
+    else:
+        shifted[dst] = image[src]
 
     # Fill empty areas with red if highlighting
     if highlight_empty:
@@ -107,75 +118,504 @@ def apply_shift(image: np.ndarray, dx: float, dy: float, highlight_empty: bool =
     return shifted
 
 
-def _process_channel(args) -> Tuple[int, np.ndarray, Tuple[float, float]]:
-    """Process a single channel for registration (for parallel execution)."""
-    i, channel, reference, is_ref = args
+def _overlap_slices(height: int, width: int, shift_y: int, shift_x: int):
+    """
+    Source and destination slices for an integer translation.
 
-    if is_ref:
-        # Reference channel - convert to RGB
-        if channel.ndim == 2:
-            rgb = np.stack([channel, channel, channel], axis=-1)
-        else:
-            rgb = channel.copy()
-        return (i, rgb, (0.0, 0.0))
-    else:
-        # Compute and apply shift
-        dx, dy = compute_shift(reference, channel)
-        shifted = apply_shift(channel, dx, dy)
-        shifted = np.clip(shifted, 0, 255).astype(np.uint8)
-        return (i, shifted, (dx, dy))
+    Content moves by (shift_y, shift_x); the uncovered border stays empty.
+    """
+    shift_y = max(-height, min(height, shift_y))
+    shift_x = max(-width, min(width, shift_x))
+    src = (
+        slice(max(0, -shift_y), height - max(0, shift_y)),
+        slice(max(0, -shift_x), width - max(0, shift_x)),
+    )
+    dst = (
+        slice(max(0, shift_y), height - max(0, -shift_y)),
+        slice(max(0, shift_x), width - max(0, -shift_x)),
+    )
+    return src, dst
+
+
+def _create_shared_array(shape: Tuple[int, ...], dtype) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Allocate a numpy array backed by a new shared memory block."""
+    dtype = np.dtype(dtype)
+    size = max(1, int(np.prod(shape)) * dtype.itemsize)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _attach_shared_array(spec) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Attach to a shared array described by (name, shape, dtype)."""
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _registered_shape(channel_shape: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Shape of a registered channel (grayscale input becomes RGB)."""
+    if len(channel_shape) == 2:
+        return (*channel_shape, 3)
+    return tuple(channel_shape)
+
+
+def _register_into(src: np.ndarray, dst: np.ndarray, i: int, ref_index: int) -> Tuple[float, float]:
+    """Register channel i of src against the reference and write it to dst[i]."""
+    channel = src[i]
+
+    if i == ref_index:
+        # Reference channel - convert to RGB, saturating like shifted channels
+        clipped = np.clip(channel, 0, 255)
+        dst[i] = clipped[..., np.newaxis] if clipped.ndim == 2 else clipped
+        return (0.0, 0.0)
+
+    # Compute and apply shift
+    dx, dy = compute_shift(src[ref_index], channel)
+    shifted = apply_shift(channel, dx, dy)
+    dst[i] = np.clip(shifted, 0, 255)
+    return (dx, dy)
+
+
+def _process_channel(args) -> Tuple[float, float]:
+    """
+    Process a single channel for registration (for parallel execution).
+
+    Only indices and shared memory descriptors are passed in; the channel
+    stack is read from and the registered image is written to shared memory.
+    """
+    i, ref_index, src_spec, dst_spec = args
+
+    src_shm, src = _attach_shared_array(src_spec)
+    dst_shm, dst = _attach_shared_array(dst_spec)
+    try:
+        shift = _register_into(src, dst, i, ref_index)
+    finally:
+        # Drop the views before closing so the buffers can be released
+        del src, dst
+        src_shm.close()
+        dst_shm.close()
+
+    return shift
+
+
+def _start_resource_tracker() -> None:
+    """
+    Start this process's shared memory resource tracker before spawning workers.
+
+    Workers inherit the tracker only if it is already running when the pool
+    starts. A pool warmed up before the first shared block was created gave
+    each worker its own tracker, which then unlinked the blocks it had
+    attached when the worker exited, while the parent still used them.
+    """
+    if os.name == "posix":
+        resource_tracker.ensure_running()
+
+
+def _warm_up_worker() -> None:
+    """No-op task that forces a pool worker to start and import its modules."""
+    return None
+
+
+class RegistrationService:
+    """
+    Channel registration backed by a persistent worker pool.
+
+    The pool is created on first use and kept alive between registrations,
+    so repeated calls do not pay process spawn and numpy/scipy import cost.
+    Call shutdown() when the owning window or session ends.
+    """
+
+    EXECUTORS = ("process", "thread")
+
+    def __init__(self, executor: str = "process", max_workers: Optional[int] = None):
+        """
+        Initialize the registration service.
+
+        Args:
+            executor: Worker pool type - "process" or "thread".
+            max_workers: Number of workers (default: executor's own default).
+        """
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor}")
+
+        self.executor = executor
+        self.max_workers = max_workers
+        self._pool = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker pool is currently alive."""
+        return self._pool is not None
+
+    def _get_pool(self):
+        """Return the worker pool, creating it if needed."""
+        if self._pool is None:
+            if self.executor == "process":
+                _start_resource_tracker()
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def start(self):
+        """
+        Start the pool and warm up its workers without blocking.
+
+        Registration submitted afterwards starts on already running workers.
+        """
+        pool = self._get_pool()
+        if self.executor == "process":
+            for _ in range(self.max_workers or os.cpu_count() or 1):
+                pool.submit(_warm_up_worker)
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the worker pool. The service restarts it on next use."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    def register(
+        self,
+        channels: List[np.ndarray],
+        ref_index: int = 7,
+        verbose: bool = True,
+        progress: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Tuple[List[np.ndarray], List[Tuple[float, float]]]:
+        """
+        Register all channels to a reference channel on the worker pool.
+
+        Args:
+            channels: List of 15 channel images (numpy arrays).
+            ref_index: Index of the reference channel (default: 7).
+            verbose: Print per-channel progress.
+            progress: Called as progress(index, completed, (dx, dy)) whenever
+                a channel finishes.
+            cancel_event: When set, pending channels are cancelled and
+                RegistrationCancelled is raised.
+
+        Returns:
+            Tuple of (list of registered channel images, list of (dx, dy) shifts).
+        """
+        if len(channels) == 0:
+            return [], []
+
+        monitor = (verbose, progress, cancel_event)
+        if self.executor == "process":
+            return self._register_shared(channels, ref_index, monitor)
+        return self._register_threaded(channels, ref_index, monitor)
+
+    def _register_threaded(
+        self, channels: List[np.ndarray], ref_index: int, monitor: tuple
+    ) -> Tuple[List[np.ndarray], List[Tuple[float, float]]]:
+        """Register on the thread pool, writing directly into the output stack."""
+        total = len(channels)
+        dst = np.empty((total, *_registered_shape(channels[0].shape)), dtype=np.uint8)
+
+        pool = self._get_pool()
+        futures = {
+            pool.submit(_register_into, channels, dst, i, ref_index): i
+            for i in range(total)
+        }
+        shifts = self._collect(futures, ref_index, total, *monitor)
+        return list(dst), shifts
+
+    def _register_shared(
+        self, channels: List[np.ndarray], ref_index: int, monitor: tuple
+    ) -> Tuple[List[np.ndarray], List[Tuple[float, float]]]:
+        """Register on the process pool using shared memory buffers."""
+        total = len(channels)
+        channel_shape = channels[0].shape
+        out_shape = (total, *_registered_shape(channel_shape))
+
+        src_shm, src = _create_shared_array((total, *channel_shape), channels[0].dtype)
+        try:
+            dst_shm, dst = _create_shared_array(out_shape, np.uint8)
+        except Exception:
+            del src
+            src_shm.close()
+            src_shm.unlink()
+            raise
+
+        try:
+            if isinstance(channels, np.ndarray):
+                src[...] = channels
+            else:
+                for i, channel in enumerate(channels):
+                    src[i] = channel
+
+            src_spec = (src_shm.name, src.shape, src.dtype.str)
+            dst_spec = (dst_shm.name, dst.shape, dst.dtype.str)
+
+            pool = self._get_pool()
+            futures = {
+                pool.submit(_process_channel, (i, ref_index, src_spec, dst_spec)): i
+                for i in range(total)
+            }
+            shifts = self._collect(futures, ref_index, total, *monitor)
+
+            # Copy out of shared memory before releasing it
+            registered_stack = dst.copy()
+        finally:
+            del src, dst
+            src_shm.close()
+            src_shm.unlink()
+            dst_shm.close()
+            dst_shm.unlink()
+
+        return list(registered_stack), shifts
+
+    def _collect(
+        self,
+        futures: dict,
+        ref_index: int,
+        total: int,
+        verbose: bool,
+        progress: Optional[ProgressCallback],
+        cancel_event: Optional[threading.Event],
+    ) -> List[Tuple[float, float]]:
+        """Wait for per-channel futures and gather their shifts in order."""
+        if verbose:
+            print(f"Registering {total} channels in parallel...", flush=True)
+        shifts = [None] * total
+        completed = 0
+
+        # Poll periodically when cancellable so a cancel is noticed promptly
+        timeout = 0.1 if cancel_event is not None else None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if cancel_event is not None and cancel_event.is_set():
+                for future in pending:
+                    future.cancel()
+                # Running tasks still write to the output buffers; let them finish
+                wait(pending)
+                raise RegistrationCancelled("Registration cancelled")
+
+            for future in done:
+                idx = futures[future]
+                shift = future.result()
+                shifts[idx] = shift
+                completed += 1
+                if progress is not None:
+                    progress(idx, completed, shift)
+                if not verbose:
+                    continue
+                dx, dy = shift
+                if idx == ref_index:
+                    print(f"  Channel {idx+1}/{total}: (reference)", flush=True)
+                else:
+                    print(f"  Channel {idx+1}/{total}: dx={dx:+.1f}, dy={dy:+.1f}", flush=True)
+
+        if verbose:
+            print("Registration complete!", flush=True)
+        return shifts
+
+
+# Module-level service shared by the GUI and CLI for the life of the session
+_service: Optional[RegistrationService] = None
+
+
+def get_registration_service() -> RegistrationService:
+    """Return the shared registration service, creating it if needed."""
+    global _service
+    if _service is None:
+        _service = RegistrationService()
+    return _service
+
+
+def configure_registration_service(executor: str = "process", max_workers: Optional[int] = None) -> RegistrationService:
+    """
+    Replace the shared registration service with a newly configured one.
+
+    Any running pool of the previous service is shut down first.
+    """
+    global _service
+    if _service is not None:
+        _service.shutdown()
+    _service = RegistrationService(executor=executor, max_workers=max_workers)
+    return _service
+
+
+def shutdown_registration_service(wait: bool = True):
+    """Shut down the shared registration service's worker pool."""
+    if _service is not None:
+        _service.shutdown(wait=wait)
 
 
 def register_channels(
-    channels: List[np.ndarray], ref_index: int = 7
+    channels: List[np.ndarray],
+    ref_index: int = 7,
+    shifts: Optional[List[Tuple[float, float]]] = None,
+    verify_index: Optional[int] = None,
+    drift_tolerance: float = 1.0,
+    verbose: bool = True,
+    progress: Optional[ProgressCallback] = None,
+    cancel_event: Optional[threading.Event] = None,
 ) -> Tuple[List[np.ndarray], List[Tuple[float, float]]]:
     """
     Register all channels to a reference channel using template matching.
-    Uses parallel processing for speed.
+    Uses the shared warm worker pool for speed.
+
+    The channel stack and the output buffer live in shared memory, so each
+    worker task only receives indices and writes its result in place.
+
+    If shifts are given (e.g. from a saved calibration), shift estimation is
+    skipped and the shifts are only applied.
 
     Args:
-        channels: List of 15 channel images (numpy arrays).
+        channels: List of 15 channel images (numpy arrays), or a channel
+            cube of shape (15, H, W) from split_mosaic.
         ref_index: Index of the reference channel (default: 7, center of 3x5 grid).
+        shifts: Known (dx, dy) shifts per channel. Enables apply-only mode.
+        verify_index: In apply-only mode, re-estimate this channel's shift
+            and raise CalibrationDrift if it drifted from the calibration
+            (see default_verify_index). Must differ from ref_index.
+        drift_tolerance: Maximum allowed drift in pixels for verification.
+        verbose: Print per-channel progress.
+        progress: Called as progress(index, completed, (dx, dy)) whenever a
+            channel finishes.
+        cancel_event: When set, registration stops and RegistrationCancelled
+            is raised.
 
     Returns:
         Tuple of:
             - List of registered channel images
             - List of (dx, dy) shift values for each channel
     """
-    if not channels:
-        return [], []
+    if shifts is None:
+        return get_registration_service().register(
+            channels, ref_index, verbose, progress, cancel_event
+        )
 
-    reference = channels[ref_index]
-    total = len(channels)
+    if len(shifts) != len(channels):
+        raise ValueError(
+            f"Expected {len(channels)} shifts, got {len(shifts)}"
+        )
 
-    # Prepare arguments for parallel processing
-    args_list = [
-        (i, channels[i], reference, i == ref_index)
-        for i in range(total)
-    ]
+    if verify_index is not None:
+        if verify_index == ref_index:
+            raise ValueError(
+                f"verify_index must differ from the reference channel {ref_index}"
+            )
+        drift_x, drift_y = _calibration_drift(channels, shifts, verify_index, ref_index)
+        if abs(drift_x) > drift_tolerance or abs(drift_y) > drift_tolerance:
+            raise CalibrationDrift(
+                f"Calibration drift on channel {verify_index}: "
+                f"dx={drift_x:+.1f}, dy={drift_y:+.1f} (tolerance {drift_tolerance:g} px)"
+            )
+
+    registered = []
+    for i, (channel, (dx, dy)) in enumerate(zip(channels, shifts)):
+        if cancel_event is not None and cancel_event.is_set():
+            raise RegistrationCancelled("Registration cancelled")
+        registered.append(np.clip(apply_shift(channel, dx, dy), 0, 255).astype(np.uint8))
+        if progress is not None:
+            progress(i, i + 1, (dx, dy))
+    return registered, list(shifts)
 
-    # Process in parallel
-    print(f"Registering {total} channels in parallel...", flush=True)
-    results = [None] * total
 
-    with ProcessPoolExecutor() as executor:
-        futures = {executor.submit(_process_channel, args): args[0] for args in args_list}
+def default_verify_index(ref_index: int = 7, channel_count: int = 15) -> int:
+    """
+    Pick the channel to verify a calibration on.
 
-        for future in as_completed(futures):
-            idx, shifted, shift = future.result()
-            results[idx] = (shifted, shift)
-            dx, dy = shift
-            if idx == ref_index:
-                print(f"  Channel {idx+1}/{total}: (reference)", flush=True)
-            else:
-                print(f"  Channel {idx+1}/{total}: dx={dx:+.1f}, dy={dy:+.1f}", flush=True)
+    The first channel (a grid corner) has the largest shift from the center
+    reference, so it shows drift best; if it is the reference itself, the
+    last channel is used instead.
+
+    Args:
+        ref_index: Index of the reference channel.
+        channel_count: Number of channels.
 
-    registered = [r[0] for r in results]
-    shifts = [r[1] for r in results]
+    Returns:
+        Channel index that differs from ref_index.
+    """
+    return 0 if ref_index != 0 else channel_count - 1
 
-    print("Registration complete!", flush=True)
 
-    return registered, shifts
+def _calibration_drift(
+    channels: List[np.ndarray],
+    shifts: List[Tuple[float, float]],
+    index: int,
+    ref_index: int,
+) -> Tuple[float, float]:
+    """Difference (dx, dy) between a fresh shift estimate and the calibration."""
+    dx, dy = compute_shift(channels[ref_index], channels[index])
+    cal_dx, cal_dy = shifts[index]
+    return dx - cal_dx, dy - cal_dy
+
+
+def save_shift_calibration(
+    shifts: List[Tuple[float, float]],
+    path: str,
+    ref_index: int = 7,
+    tile_size: Optional[Tuple[int, int]] = None,
+) -> str:
+    """
+    Save per-channel shifts as a JSON calibration file.
+
+    Args:
+        shifts: List of (dx, dy) shift values for each channel.
+        path: Output file path.
+        ref_index: Reference channel the shifts were computed against.
+        tile_size: Tile size as (height, width), stored for sanity checks.
+
+    Returns:
+        The saved file path.
+    """
+    data = {
+        "ref_index": ref_index,
+        "tile_size": list(tile_size) if tile_size is not None else None,
+        "shifts": [[float(dx), float(dy)] for dx, dy in shifts],
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return path
+
+
+def load_shift_calibration(
+    path: str,
+    channel_count: Optional[int] = None,
+    tile_size: Optional[Tuple[int, int]] = None,
+) -> Tuple[List[Tuple[float, float]], int]:
+    """
+    Load per-channel shifts from a JSON calibration file.
+
+    Args:
+        path: Calibration file path.
+        channel_count: If given, the number of channels the shifts must cover.
+        tile_size: If given, the (height, width) of the tiles the calibration
+            will be applied to. Files saved without a tile size are accepted.
+
+    Returns:
+        Tuple of (list of (dx, dy) shift values, reference channel index).
+
+    Raises:
+        ValueError: If the calibration does not match channel_count or tile_size.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    shifts = [(float(dx), float(dy)) for dx, dy in data["shifts"]]
+    ref_index = int(data.get("ref_index", 7))
+
+    if not 0 <= ref_index < len(shifts):
+        raise ValueError(f"Reference channel {ref_index} out of range for {len(shifts)} shifts")
+    if channel_count is not None and len(shifts) != channel_count:
+        raise ValueError(
+            f"Calibration has {len(shifts)} channels, expected {channel_count}"
+        )
+    stored_size = data.get("tile_size")
+    if tile_size is not None and stored_size is not None:
+        if tuple(stored_size) != tuple(tile_size):
+            raise ValueError(
+                f"Calibration tile size {tuple(stored_size)} does not match "
+                f"{tuple(tile_size)}"
+            )
+    return shifts, ref_index
 
 
 def _to_grayscale(image: np.ndarray) -> np.ndarray:
@@ -193,51 +633,137 @@ def _to_grayscale(image: np.ndarray) -> np.ndarray:
 WAVELENGTHS = [410, 430, 450, 470, 490, 510, 530, 550, 570, 590, 610, 630, 650, 670, 690]
 
 
-def export_registered_channels(
-    channels: List[np.ndarray],
-    shifts: List[Tuple[float, float]],
-    output_dir: str
+def _channel_filename(index: int) -> str:
+    """Export filename for a channel index, e.g. '410nm.png'."""
+    wavelength = WAVELENGTHS[index] if index < len(WAVELENGTHS) else (410 + index * 20)
+    return f"{wavelength}nm.png"
+
+
+def registered_to_gray(registered: np.ndarray) -> np.ndarray:
+    """
+    Get the black-filled grayscale plane of a registered grayscale channel.
+
+    Registered images of grayscale channels carry the gray value in every
+    color plane, and the highlighted empty area is pure red (255, 0, 0), so
+    the green plane is exactly the grayscale image with black fill.
+
+    Args:
+        registered: Registered RGB image from register_channels.
+
+    Returns:
+        Grayscale view (H, W), uint8.
+    """
+    return registered[..., 1]
+
+
+def registered_channel_cube(registered: List[np.ndarray]) -> np.ndarray:
+    """
+    Stack registered grayscale channels into a contiguous (N, H, W) cube.
+
+    The cube can be handed to ppi_upscale's run_cube_pipeline in memory
+    instead of exporting PNGs and loading them again.
+
+    Args:
+        registered: Registered images from register_channels.
+
+    Returns:
+        Channel cube (N, H, W), uint8.
+    """
+    return np.stack([registered_to_gray(image) for image in registered])
+
+
+def export_channel_planes(
+    planes: List[np.ndarray],
+    output_dir: str,
+    max_workers: Optional[int] = None,
+    verbose: bool = True
 ) -> List[str]:
     """
-    Export registered channels as grayscale PNG files with black fill.
+    Export grayscale planes as {wavelength}nm.png files.
+
+    PNG encoding runs on a thread pool (Pillow releases the GIL while
+    compressing), so the channels are encoded in parallel.
 
     Args:
-        channels: List of original channel images.
-        shifts: List of (dx, dy) shift values for each channel.
+        planes: List of grayscale uint8 images, in channel order.
         output_dir: Directory to save the PNG files.
+        max_workers: Number of encoder threads (default: executor's default).
+        verbose: Print per-file progress.
 
     Returns:
-        List of saved file paths.
+        List of saved file paths, in channel order.
     """
-    import os
     from PIL import Image
 
     os.makedirs(output_dir, exist_ok=True)
 
-    saved_files = []
-    total = len(channels)
+    total = len(planes)
+    saved_files = [None] * total
 
-    print(f"Exporting {total} channels to {output_dir}...", flush=True)
+    if verbose:
+        print(f"Exporting {total} channels to {output_dir}...", flush=True)
 
-    for i, (channel, (dx, dy)) in enumerate(zip(channels, shifts)):
-        # Apply shift with black fill (no highlight)
-        shifted = apply_shift(channel, dx, dy, highlight_empty=False)
-        shifted = np.clip(shifted, 0, 255).astype(np.uint8)
-
-        # Convert to grayscale for export
-        if shifted.ndim == 3:
-            gray = np.dot(shifted[..., :3], [0.2989, 0.5870, 0.1140]).astype(np.uint8)
-        else:
-            gray = shifted
-
-        # Save as PNG
-        wavelength = WAVELENGTHS[i] if i < len(WAVELENGTHS) else (410 + i * 20)
-        filename = f"{wavelength}nm.png"
-        filepath = os.path.join(output_dir, filename)
-
-        Image.fromarray(gray).save(filepath)
-        saved_files.append(filepath)
-        print(f"  Saved {filename}", flush=True)
-
-    print("Export complete!", flush=True)
+    def save(i: int) -> str:
+        filepath = os.path.join(output_dir, _channel_filename(i))
+        Image.fromarray(np.ascontiguousarray(planes[i])).save(filepath)
+        return filepath
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(save, i): i for i in range(total)}
+        for future in as_completed(futures):
+            i = futures[future]
+            saved_files[i] = future.result()
+            if verbose:
+                print(f"  Saved {_channel_filename(i)}", flush=True)
+
+    if verbose:
+        print("Export complete!", flush=True)
     return saved_files
+
+
+def export_registered_channels(
+    channels: List[np.ndarray],
+    shifts: List[Tuple[float, float]],
+    output_dir: str,
+    registered: Optional[List[np.ndarray]] = None,
+    max_workers: Optional[int] = None,
+    verbose: bool = True
+) -> List[str]:
+    """
+    Export registered channels as grayscale PNG files with black fill.
+
+    When the registered images from register_channels are passed for
+    grayscale channels, their planes are exported directly without
+    shifting or converting again.
+
+    Args:
+        channels: List of original channel images.
+        shifts: List of (dx, dy) shift values for each channel.
+        output_dir: Directory to save the PNG files.
+        registered: Registered images from register_channels (optional).
+        max_workers: Number of PNG encoder threads.
+        verbose: Print per-file progress.
+
+    Returns:
+        List of saved file paths.
+    """
+    if registered is not None and len(channels) > 0 and channels[0].ndim == 2:
+        planes = [registered_to_gray(image) for image in registered]
+    else:
+        planes = []
+        for channel, (dx, dy) in zip(channels, shifts):
+            # Apply shift with black fill (no highlight)
+            shifted = apply_shift(channel, dx, dy, highlight_empty=False)
+            shifted = np.clip(shifted, 0, 255).astype(np.uint8)
+
+            if channel.ndim == 2:
+                planes.append(shifted[..., 0])
+            else:
+                # Convert color channels to grayscale for export
+                planes.append(
+                    np.dot(shifted[..., :3], [0.2989, 0.5870, 0.1140]).astype(np.uint8)
+                )
+
+    return export_channel_planes(
+        planes, output_dir, max_workers=max_workers, verbose=verbose
+    )
@@ -5,6 +5,100 @@ from PIL import Image
 from typing import List, Tuple
 
 
+GRID_ROWS = 3
+GRID_COLS = 5
+
+
+def split_mosaic_batch(mosaics: np.ndarray) -> np.ndarray:
+    """
+    Split a batch of 3x5 tiled frames into a contiguous channel cube.
+
+    The split is a single reshape/transpose, so all tiles are copied in one
+    pass instead of being sliced out one by one. Trailing rows/columns that
+    do not fill a whole tile are dropped, as in split_image.
+
+    Args:
+        mosaics: Frames of shape (F, H, W) or (F, H, W, C).
+
+    Returns:
+        Contiguous array of shape (F, 15, h, w) or (F, 15, h, w, C).
+        Channels are ordered row-by-row (0-4: row 0, 5-9: row 1, 10-14: row 2).
+    """
+    if mosaics.ndim not in (3, 4):
+        raise ValueError(f"Unsupported mosaic batch dimensions: {mosaics.ndim}")
+
+    n_frames, height, width = mosaics.shape[:3]
+    color = mosaics.shape[3:]
+    tile_height = height // GRID_ROWS
+    tile_width = width // GRID_COLS
+
+    cropped = mosaics[:, :GRID_ROWS * tile_height, :GRID_COLS * tile_width]
+    tiles = cropped.reshape(
+        n_frames, GRID_ROWS, tile_height, GRID_COLS, tile_width, *color
+    ).swapaxes(2, 3)
+    return np.ascontiguousarray(tiles).reshape(
+        n_frames, GRID_ROWS * GRID_COLS, tile_height, tile_width, *color
+    )
+
+
+def split_mosaic(mosaic: np.ndarray) -> np.ndarray:
+    """
+    Split a single 3x5 tiled frame into a contiguous channel cube.
+
+    Args:
+        mosaic: Frame of shape (H, W) or (H, W, C).
+
+    Returns:
+        Contiguous array of shape (15, h, w) or (15, h, w, C).
+    """
+    return split_mosaic_batch(mosaic[np.newaxis])[0]
+
+
+def load_channel_cube(image_path: str) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Load a 3x5 tiled image file as a contiguous channel cube.
+
+    Args:
+        image_path: Path to the input image file.
+
+    Returns:
+        Tuple of (array of shape (15, h, w), tile size as (height, width)).
+    """
+    img_array = np.array(Image.open(image_path))
+    cube = split_mosaic(img_array)
+    return cube, cube.shape[1:3]
+
+
+def load_channel_cube_batch(image_paths: List[str]) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Load many 3x5 tiled image files into a single (F, 15, h, w) cube.
+
+    All frames must have the same size.
+
+    Args:
+        image_paths: Paths to the input image files.
+
+    Returns:
+        Tuple of (array of shape (F, 15, h, w), tile size as (height, width)).
+    """
+    if not image_paths:
+        raise ValueError("No image paths given")
+
+    first, tile_size = load_channel_cube(image_paths[0])
+    batch = np.empty((len(image_paths), *first.shape), dtype=first.dtype)
+    batch[0] = first
+
+    for i, path in enumerate(image_paths[1:], start=1):
+        cube, size = load_channel_cube(path)
+        if cube.shape != first.shape:
+            raise ValueError(
+                f"Frame size mismatch: {path} has tiles {size}, expected {tile_size}"
+            )
+        batch[i] = cube
+
+    return batch, tile_size
+
+
 def split_image(image_path: str) -> Tuple[List[np.ndarray], Tuple[int, int]]:
     """
     Split a 3x5 tiled image into 15 individual channel images.
@@ -15,26 +109,48 @@ def split_image(image_path: str) -> Tuple[List[np.ndarray], Tuple[int, int]]:
     Returns:
         Tuple of (list of 15 numpy arrays, tile size as (height, width)).
         Channels are ordered row-by-row (0-4: row 0, 5-9: row 1, 10-14: row 2).
+        The arrays are contiguous planes of a single channel cube.
+    """
+    cube, tile_size = load_channel_cube(image_path)
+    return list(cube), tile_size
+
+
+def make_thumbnails(cube: np.ndarray, max_size: int = 160) -> np.ndarray:
     """
-    img = Image.open(image_path)
-    img_array = np.array(img)
+    Downsample every channel of a cube at once by block averaging.
+
+    The cube is reshaped so each output pixel's block gets its own axes,
+    and all channels are averaged in one vectorized pass. Integer cubes
+    are scaled to 0..255: 16-bit cubes from their dtype's range (0..65535),
+    32-bit cubes from their maximum. Float cubes are assumed to be in 0..255.
 
-    height, width = img_array.shape[:2]
-    tile_height = height // 3
-    tile_width = width // 5
+    Args:
+        cube: Channel cube (N, H, W) or (N, H, W, C), e.g. from split_mosaic.
+        max_size: Maximum thumbnail width/height in pixels.
 
-    channels = []
-    for row in range(3):
-        for col in range(5):
-            y_start = row * tile_height
-            y_end = (row + 1) * tile_height
-            x_start = col * tile_width
-            x_end = (col + 1) * tile_width
+    Returns:
+        Contiguous uint8 thumbnails (N, h, w) or (N, h, w, C).
+    """
+    cube = np.asarray(cube)
+    n_channels, height, width = cube.shape[:3]
+    color = cube.shape[3:]
 
-            tile = img_array[y_start:y_end, x_start:x_end]
-            channels.append(tile)
+    factor = max(1, -(-max(height, width) // max_size))
+    th, tw = height // factor, width // factor
 
-    return channels, (tile_height, tile_width)
+    blocks = cube[:, :th * factor, :tw * factor].reshape(
+        n_channels, th, factor, tw, factor, *color
+    )
+    # Sum block rows first (contiguous runs), then block columns
+    sums = blocks.sum(axis=2, dtype=np.float32).sum(axis=3)
+    scale = 1.0
+    if cube.dtype.kind in "ui" and cube.dtype.itemsize == 2:
+        scale = 255.0 / np.iinfo(cube.dtype).max
+    elif cube.dtype.kind in "ui" and cube.dtype.itemsize > 2:
+        # 32-bit integer images rarely use their full range
+        scale = 255.0 / max(255, int(cube.max()))
+    thumbs = sums * (scale / (factor * factor)) + 0.5
+    return np.clip(thumbs, 0, 255).astype(np.uint8)
 
 
 def get_channel_label(index: int) -> str:
@@ -1,16 +1,22 @@
 """Main window with drag and drop support for channel splitting."""
 
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
+    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QFileDialog
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QDragEnterEvent, QDropEvent
+from PyQt6.QtCore import Qt, QThread
+from PyQt6.QtGui import QCloseEvent, QDragEnterEvent, QDropEvent
 
 import os
 
-from .image_splitter import split_image, get_channel_label
-from .image_registration import register_channels, export_registered_channels
-from .channel_view import ChannelView
+from .image_splitter import split_image, get_channel_label, make_thumbnails
+from .image_registration import (
+    export_registered_channels,
+    get_registration_service, shutdown_registration_service,
+    save_shift_calibration, load_shift_calibration, default_verify_index
+)
+from .channel_view import ChannelView, ChannelGridView, ImagePyramid, numpy_to_pixmap
+from .registration_worker import RegistrationWorker
 
 # Output directory for exported images
 EXPORT_DIR = os.path.join(os.path.dirname(__file__), "../../..", "ppi_upscale/data")
@@ -24,11 +30,26 @@ class MainWindow(QMainWindow):
         self.channels = []
         self.registered_channels = []
         self.shifts = []
+        # Reference channel the shifts were computed or calibrated against
+        self.shifts_ref_index = 7
         self.is_registered = False
         self.current_index = 0
+        self.tile_size = None
+        self.calibration_path = None
+        self._reg_thread = None
+        self._reg_worker = None
+        # Image pyramids keyed by (variant, channel index), variant being
+        # "original" or "registered"; built on first display of a channel
+        self._pyramid_cache = {}
+        # Thumbnail pixmaps for the overview grid, keyed by variant
+        self._thumbnail_cache = {}
+        self.overview_mode = False
         self._setup_ui()
         self.setAcceptDrops(True)
 
+        # Warm up the registration pool while the user picks an image
+        get_registration_service().start()
+
     def _setup_ui(self):
         """Set up the main window UI."""
         self.setWindowTitle("Channel Splitter - 3x5 Tile Viewer")
@@ -45,6 +66,14 @@ class MainWindow(QMainWindow):
         self.display_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         main_layout.addWidget(self.display_area, 1)
 
+        # Single channel view reused for every channel; only its pixmap changes
+        self.channel_view = ChannelView(parent=self.display_area)
+        self.channel_view.hide()
+
+        # Overview grid showing all channels as thumbnails
+        self.grid_view = ChannelGridView(parent=self.display_area)
+        self.grid_view.hide()
+
         # Navigation buttons
         nav_layout = QHBoxLayout()
         nav_layout.setSpacing(20)
@@ -67,6 +96,14 @@ class MainWindow(QMainWindow):
         self.next_btn.setEnabled(False)
         nav_layout.addWidget(self.next_btn)
 
+        # Overview toggle
+        self.overview_btn = QPushButton("Overview")
+        self.overview_btn.setFixedSize(100, 40)
+        self.overview_btn.setCheckable(True)
+        self.overview_btn.toggled.connect(self._toggle_overview)
+        self.overview_btn.setEnabled(False)
+        nav_layout.addWidget(self.overview_btn)
+
         # Register button
         self.register_btn = QPushButton("Register")
         self.register_btn.setFixedSize(100, 40)
@@ -81,6 +118,18 @@ class MainWindow(QMainWindow):
         self.export_btn.setEnabled(False)
         nav_layout.addWidget(self.export_btn)
 
+        # Calibration buttons
+        self.save_calib_btn = QPushButton("Save Calib")
+        self.save_calib_btn.setFixedSize(100, 40)
+        self.save_calib_btn.clicked.connect(self._save_calibration)
+        self.save_calib_btn.setEnabled(False)
+        nav_layout.addWidget(self.save_calib_btn)
+
+        self.load_calib_btn = QPushButton("Load Calib")
+        self.load_calib_btn.setFixedSize(100, 40)
+        self.load_calib_btn.clicked.connect(self._load_calibration)
+        nav_layout.addWidget(self.load_calib_btn)
+
         nav_container = QWidget()
         nav_container.setLayout(nav_layout)
         main_layout.addWidget(nav_container, 0, Qt.AlignmentFlag.AlignCenter)
@@ -109,16 +158,46 @@ class MainWindow(QMainWindow):
         self.display_layout.addWidget(placeholder)
 
     def _clear_display(self):
-        """Remove all widgets from the display area."""
+        """Remove all widgets from the display area, keeping the reusable views."""
         while self.display_layout.count():
             item = self.display_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+            widget = item.widget()
+            if widget is self.channel_view or widget is self.grid_view:
+                widget.hide()
+            elif widget:
+                widget.deleteLater()
+
+    def _show_display_widget(self, widget: QWidget):
+        """Make a reusable view the only widget in the display area."""
+        if self.display_layout.indexOf(widget) < 0:
+            self._clear_display()
+            self.display_layout.addWidget(widget)
+            widget.show()
+
+    def _get_thumbnails(self, variant: str) -> list:
+        """Return cached thumbnail pixmaps for all channels of a variant."""
+        if variant not in self._thumbnail_cache:
+            images = self.registered_channels if variant == "registered" else self.channels
+            thumbs = make_thumbnails(images)
+            self._thumbnail_cache[variant] = [numpy_to_pixmap(thumb) for thumb in thumbs]
+        return self._thumbnail_cache[variant]
+
+    def _get_pyramid(self, variant: str, index: int) -> ImagePyramid:
+        """Return the cached pyramid for a channel, building it if needed."""
+        key = (variant, index)
+        if key not in self._pyramid_cache:
+            images = self.registered_channels if variant == "registered" else self.channels
+            self._pyramid_cache[key] = ImagePyramid(images[index])
+        return self._pyramid_cache[key]
 
     def _load_image(self, file_path: str):
         """Load and split an image file."""
+        self._stop_registration()
         try:
             self.channels, tile_size = split_image(file_path)
+            self.tile_size = tile_size
+            self._pyramid_cache = {}
+            self._thumbnail_cache = {}
             self.registered_channels = []
             self.shifts = []
             self.is_registered = False
@@ -126,6 +205,7 @@ class MainWindow(QMainWindow):
             self.register_btn.setEnabled(True)
             self.export_btn.setText("Export")
             self.export_btn.setEnabled(False)
+            self.save_calib_btn.setEnabled(False)
             self.current_index = 0
             self._show_current_channel()
             self._update_nav_buttons()
@@ -141,16 +221,22 @@ class MainWindow(QMainWindow):
 
     def _show_current_channel(self):
         """Display the current channel."""
-        self._clear_display()
-
         if not self.channels:
+            self._clear_display()
             return
 
         # Choose registered or original channels
         if self.is_registered and self.registered_channels:
-            channel_data = self.registered_channels[self.current_index]
+            variant = "registered"
         else:
-            channel_data = self.channels[self.current_index]
+            variant = "original"
+
+        if self.overview_mode:
+            self._show_overview(variant)
+            return
+
+        # Reuse the channel view; only swap in place of placeholder/error
+        self._show_display_widget(self.channel_view)
 
         # Build label with shift info
         label = get_channel_label(self.current_index)
@@ -158,41 +244,195 @@ class MainWindow(QMainWindow):
             dx, dy = self.shifts[self.current_index]
             label += f"  |  dx: {dx:+.1f}, dy: {dy:+.1f}"
 
-        channel_view = ChannelView(channel_data, label)
-        self.display_layout.addWidget(channel_view)
+        self.channel_view.set_channel(self._get_pyramid(variant, self.current_index), label)
 
         self.channel_label.setText(f"{self.current_index + 1} / {len(self.channels)}")
 
+    def _show_overview(self, variant: str):
+        """Display all channels as thumbnails in the overview grid."""
+        captions = []
+        for i in range(len(self.channels)):
+            caption = f"Ch {i}"
+            if variant == "registered" and self.shifts:
+                dx, dy = self.shifts[i]
+                caption += f"  ({dx:+.0f}, {dy:+.0f})"
+            captions.append(caption)
+
+        self._show_display_widget(self.grid_view)
+        self.grid_view.set_thumbnails(self._get_thumbnails(variant), captions)
+        self.channel_label.setText(f"All {len(self.channels)}")
+
+    def _toggle_overview(self, checked: bool):
+        """Switch between single-channel view and the overview grid."""
+        self.overview_mode = checked
+        self._show_current_channel()
+        self._update_nav_buttons()
+
     def _update_nav_buttons(self):
         """Update navigation button states."""
         has_channels = len(self.channels) > 0
-        self.prev_btn.setEnabled(has_channels and self.current_index > 0)
-        self.next_btn.setEnabled(has_channels and self.current_index < len(self.channels) - 1)
+        single = has_channels and not self.overview_mode
+        self.prev_btn.setEnabled(single and self.current_index > 0)
+        self.next_btn.setEnabled(single and self.current_index < len(self.channels) - 1)
+        self.overview_btn.setEnabled(has_channels)
 
     def _toggle_registration(self):
-        """Apply registration to all channels."""
+        """Start registration in the background, or cancel a running one."""
+        if self._reg_worker is not None:
+            self._reg_worker.cancel()
+            self.register_btn.setEnabled(False)
+            self.statusBar().showMessage("Cancelling registration...")
+            return
+
         if not self.channels:
             return
 
-        # Compute registration if not done yet
-        if not self.registered_channels:
-            self.registered_channels, self.shifts = register_channels(self.channels)
+        # With a loaded calibration only apply the stored shifts and
+        # verify one channel for drift
+        if self.calibration_path is not None:
+            try:
+                shifts, ref_index = load_shift_calibration(
+                    self.calibration_path, len(self.channels), self.tile_size
+                )
+            except (OSError, ValueError, KeyError) as e:
+                self.statusBar().showMessage(f"Calibration does not match this image: {e}")
+                return
+            worker = RegistrationWorker(
+                self.channels,
+                ref_index=ref_index,
+                shifts=shifts,
+                verify_index=default_verify_index(ref_index, len(self.channels)),
+            )
+        else:
+            worker = RegistrationWorker(self.channels)
+
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._on_registration_progress)
+        worker.finished.connect(self._on_registration_finished)
+        worker.cancelled.connect(self._on_registration_cancelled)
+        worker.failed.connect(self._on_registration_failed)
+        for signal in (worker.finished, worker.cancelled, worker.failed):
+            signal.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+
+        self._reg_thread = thread
+        self._reg_worker = worker
+        self.register_btn.setText("Cancel")
+        self.statusBar().showMessage(f"Registering 0/{len(self.channels)}...")
+        thread.start()
+
+    def _stop_registration(self, wait: bool = False):
+        """Cancel a running registration and ignore its results."""
+        worker, thread = self._reg_worker, self._reg_thread
+        if worker is None:
+            return
 
+        worker.progress.disconnect(self._on_registration_progress)
+        worker.finished.disconnect(self._on_registration_finished)
+        worker.cancelled.disconnect(self._on_registration_cancelled)
+        worker.failed.disconnect(self._on_registration_failed)
+        worker.cancel()
+        if wait:
+            thread.wait()
+
+        self._reg_worker = None
+        self._reg_thread = None
+        self.statusBar().clearMessage()
+
+    def _on_registration_progress(self, index: int, completed: int, total: int, dx: float, dy: float):
+        """Show per-channel registration progress."""
+        self.statusBar().showMessage(
+            f"Registering {completed}/{total}...  "
+            f"Channel {index}: dx={dx:+.1f}, dy={dy:+.1f}"
+        )
+
+    def _on_registration_finished(self, registered: list, shifts: list):
+        """Install registration results on the GUI thread."""
+        self.shifts_ref_index = self._reg_worker.ref_index
+        self._reg_worker = None
+        self._reg_thread = None
+
+        self.registered_channels = registered
+        self.shifts = shifts
+        # Pyramids of the new results are built as channels are shown
+        self._pyramid_cache = {
+            key: pyramid for key, pyramid in self._pyramid_cache.items()
+            if key[0] != "registered"
+        }
+        self._thumbnail_cache.pop("registered", None)
         self.is_registered = True
         self.register_btn.setEnabled(False)
         self.register_btn.setText("Registered")
         self.export_btn.setEnabled(True)
+        self.save_calib_btn.setEnabled(True)
+        self.statusBar().showMessage("Registration complete", 3000)
         self._show_current_channel()
 
+    def _on_registration_cancelled(self):
+        """Restore the Register button after a cancelled registration."""
+        self._reg_worker = None
+        self._reg_thread = None
+        self.register_btn.setText("Register")
+        self.register_btn.setEnabled(True)
+        self.statusBar().showMessage("Registration cancelled", 3000)
+
+    def _on_registration_failed(self, message: str):
+        """Report a failed registration and allow retrying."""
+        self._reg_worker = None
+        self._reg_thread = None
+        self.register_btn.setText("Register")
+        self.register_btn.setEnabled(True)
+        self.statusBar().showMessage(f"Registration failed: {message}")
+
     def _export_channels(self):
         """Export registered channels to PNG files."""
         if not self.channels or not self.shifts:
             return
 
         output_dir = os.path.normpath(EXPORT_DIR)
-        export_registered_channels(self.channels, self.shifts, output_dir)
+        export_registered_channels(
+            self.channels, self.shifts, output_dir,
+            registered=self.registered_channels
+        )
         print(f"Files exported to: {output_dir}")
 
+    def _save_calibration(self):
+        """Save the current channel shifts as a calibration file."""
+        if not self.shifts:
+            return
+
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Shift Calibration", "shift_calibration.json", "JSON Files (*.json)"
+        )
+        if path:
+            save_shift_calibration(
+                self.shifts, path, ref_index=self.shifts_ref_index, tile_size=self.tile_size
+            )
+            print(f"Calibration saved to: {path}")
+
+    def _load_calibration(self):
+        """Load a calibration file to register by applying stored shifts."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Load Shift Calibration", "", "JSON Files (*.json)"
+        )
+        if not path:
+            return
+
+        try:
+            if self.channels:
+                load_shift_calibration(path, len(self.channels), self.tile_size)
+            else:
+                load_shift_calibration(path)
+        except (OSError, ValueError, KeyError) as e:
+            self.statusBar().showMessage(f"Invalid calibration file: {e}")
+            return
+        self.calibration_path = path
+        self.load_calib_btn.setText("Calib Loaded")
+        print(f"Calibration loaded from: {path}")
+
     def _prev_channel(self):
         """Show previous channel."""
         if self.current_index > 0:
@@ -209,15 +449,19 @@ class MainWindow(QMainWindow):
 
     def _show_error(self, message: str):
         """Show an error message."""
+        self._stop_registration()
         self._clear_display()
         self.channels = []
         self.registered_channels = []
         self.shifts = []
+        self._pyramid_cache = {}
+        self._thumbnail_cache = {}
         self.is_registered = False
         self.register_btn.setText("Register")
         self.register_btn.setEnabled(False)
         self.export_btn.setText("Export")
         self.export_btn.setEnabled(False)
+        self.save_calib_btn.setEnabled(False)
         self._update_nav_buttons()
 
         error_label = QLabel(f"Error: {message}\n\nPlease try another image.")
@@ -225,6 +469,12 @@ class MainWindow(QMainWindow):
         error_label.setStyleSheet("font-size: 14px; color: #c00; padding: 30px;")
         self.display_layout.addWidget(error_label)
 
+    def closeEvent(self, event: QCloseEvent):
+        """Stop registration and shut down the registration pool with the window."""
+        self._stop_registration(wait=True)
+        shutdown_registration_service(wait=False)
+        super().closeEvent(event)
+
     def dragEnterEvent(self, event: QDragEnterEvent):
         """Handle drag enter event."""
         if event.mimeData().hasUrls():
@@ -0,0 +1,79 @@
+"""Background worker that runs channel registration off the GUI thread."""
+
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from .image_registration import register_channels, RegistrationCancelled
+
+
+class RegistrationWorker(QObject):
+    """
+    Runs register_channels in a QThread and reports through signals.
+
+    Move the worker to a QThread and connect the thread's started signal
+    to run(). Signals are delivered to the GUI thread, where the results
+    can be installed safely.
+    """
+
+    # (channel index, completed count, total, dx, dy)
+    progress = pyqtSignal(int, int, int, float, float)
+    # (registered channel images, (dx, dy) shifts)
+    finished = pyqtSignal(list, list)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(
+        self,
+        channels: List[np.ndarray],
+        ref_index: int = 7,
+        shifts: Optional[List[Tuple[float, float]]] = None,
+        verify_index: Optional[int] = None,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            channels: List of channel images to register.
+            ref_index: Index of the reference channel.
+            shifts: Known shifts; if given, shift estimation is skipped.
+            verify_index: Channel to check against the known shifts for drift;
+                drift is reported through the failed signal.
+        """
+        super().__init__()
+        self.channels = channels
+        self.ref_index = ref_index
+        self.shifts = shifts
+        self.verify_index = verify_index
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Request cancellation. Safe to call from any thread."""
+        self._cancel_event.set()
+
+    @pyqtSlot()
+    def run(self):
+        """Register the channels and emit exactly one terminal signal."""
+        total = len(self.channels)
+
+        def on_progress(index: int, completed: int, shift: Tuple[float, float]):
+            dx, dy = shift
+            self.progress.emit(index, completed, total, float(dx), float(dy))
+
+        try:
+            registered, shifts = register_channels(
+                self.channels,
+                ref_index=self.ref_index,
+                shifts=self.shifts,
+                verify_index=self.verify_index,
+                progress=on_progress,
+                cancel_event=self._cancel_event,
+            )
+        except RegistrationCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.finished.emit(registered, shifts)
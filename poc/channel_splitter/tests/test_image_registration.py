@@ -0,0 +1,75 @@
+"""Tests for channel registration and export."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from benchmark import make_mosaic
+from src.image_registration import (
+    RegistrationService, compute_shift, export_registered_channels, register_channels
+)
+from src.image_splitter import split_mosaic
+
+
+@pytest.fixture
+def uint16_channels():
+    """15 uint16 channels, all above the uint8 range, with texture."""
+    rng = np.random.default_rng(0)
+    scene = rng.integers(0, 200, (32, 32)).astype(np.uint16) + 1000
+    return [scene.copy() for _ in range(15)]
+
+
+class TestComputeShift:
+    @pytest.mark.parametrize("tile_size", [64, 65, 96])
+    def test_recovers_known_shifts(self, tile_size):
+        mosaic, true_shifts = make_mosaic(tile_size, ref_index=7, seed=1)
+        channels = split_mosaic(mosaic)
+
+        estimated = [compute_shift(channels[7], channel) for channel in channels]
+
+        assert estimated == true_shifts
+
+    def test_identical_images(self):
+        image = np.random.default_rng(0).integers(0, 255, (48, 48)).astype(np.uint8)
+
+        assert compute_shift(image, image) == (0.0, 0.0)
+
+
+class TestRegisterUint16:
+    @pytest.mark.parametrize("executor", RegistrationService.EXECUTORS)
+    def test_reference_channel_saturates(self, uint16_channels, executor):
+        service = RegistrationService(executor=executor, max_workers=2)
+        try:
+            registered, shifts = service.register(uint16_channels, ref_index=7, verbose=False)
+        finally:
+            service.shutdown()
+
+        assert shifts[7] == (0.0, 0.0)
+        # Every channel, the reference included, saturates instead of wrapping;
+        # only the empty area left by a shift may be 0
+        for image in registered:
+            assert image.dtype == np.uint8
+            assert set(np.unique(image[..., 1])) <= {0, 255}
+        np.testing.assert_array_equal(registered[7][..., 1], 255)
+
+    def test_apply_only_matches(self, uint16_channels):
+        registered, _ = register_channels(
+            uint16_channels, ref_index=7, shifts=[(0.0, 0.0)] * 15, verbose=False
+        )
+
+        np.testing.assert_array_equal(registered[7][..., 1], 255)
+
+    def test_export(self, uint16_channels, tmp_path):
+        service = RegistrationService(executor="thread", max_workers=2)
+        try:
+            registered, shifts = service.register(uint16_channels, ref_index=7, verbose=False)
+        finally:
+            service.shutdown()
+
+        paths = export_registered_channels(
+            uint16_channels, shifts, str(tmp_path), registered=registered, verbose=False
+        )
+
+        assert len(paths) == 15
+        reference = np.asarray(Image.open(tmp_path / "550nm.png"))
+        np.testing.assert_array_equal(reference, 255)
@@ -1,48 +1,236 @@
 """이미지 표시 위젯"""
-from PyQt6.QtWidgets import QLabel
-from PyQt6.QtGui import QImage, QPixmap
-from PyQt6.QtCore import Qt
+import math
+from collections import OrderedDict
+
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QImage, QPixmap, QPainter, QColor
+from PyQt6.QtCore import Qt, QPointF, QRectF, QTimer
 import numpy as np
 
+from .mat_loader import normalize_to_uint8
+
+# 확대/이동/창 크기 조절이 멈춘 뒤 smooth 렌더링까지 대기 시간 (ms)
+RESCALE_DELAY_MS = 120
+# pyramid 타일 크기 (px)
+TILE_SIZE = 256
+# wheel 한 칸당 배율, 최대 배율 (화면 px / 원본 px)
+ZOOM_STEP = 1.25
+MAX_ZOOM = 32.0
+
+
+class ImagePyramid:
+    """uint8 이미지의 mip level (2x2 block 평균) + 타일 pixmap 캐시
+
+    level 0 = 원본, 이후 level은 한 타일에 들어갈 때까지 절반씩 축소.
+    level은 생성 시 한 번 만들고, 타일 pixmap은 처음 그릴 때 변환.
+    """
+
+    def __init__(self, arr_uint8: np.ndarray, tile_size: int = TILE_SIZE):
+        level = np.ascontiguousarray(arr_uint8)
+        self.tile_size = tile_size
+        self.levels = [level]
+        while max(level.shape) > tile_size and min(level.shape) >= 2:
+            h, w = level.shape[0] // 2, level.shape[1] // 2
+            blocks = level[:2 * h, :2 * w].astype(np.uint16)
+            summed = blocks[0::2, 0::2] + blocks[0::2, 1::2] + blocks[1::2, 0::2] + blocks[1::2, 1::2]
+            level = ((summed + 2) >> 2).astype(np.uint8)
+            self.levels.append(level)
+        self._tiles = {}  # (level, row, col) → QPixmap
+
+    @property
+    def shape(self) -> tuple:
+        """원본 (H, W)"""
+        return self.levels[0].shape
+
+    def level_for_scale(self, scale: float) -> int:
+        """화면 1px당 1px 이상 남는 가장 거친 level"""
+        if scale >= 1.0:
+            return 0
+        return min(int(math.floor(math.log2(1.0 / scale))), len(self.levels) - 1)
 
-class ImageView(QLabel):
-    def __init__(self):
+    def tile(self, level: int, row: int, col: int) -> QPixmap:
+        """타일 pixmap (처음 요청 시 변환)"""
+        key = (level, row, col)
+        pixmap = self._tiles.get(key)
+        if pixmap is None:
+            y, x = row * self.tile_size, col * self.tile_size
+            data = np.ascontiguousarray(self.levels[level][y:y + self.tile_size, x:x + self.tile_size])
+            h, w = data.shape
+            qimg = QImage(data.data, w, h, data.strides[0], QImage.Format.Format_Grayscale8)
+            pixmap = QPixmap.fromImage(qimg)
+            self._tiles[key] = pixmap
+        return pixmap
+
+
+class ImageView(QWidget):
+    """pyramid 기반 채널 뷰 - 보이는 타일만 적절한 level로 그림
+
+    wheel: 커서 위치 기준 확대/축소, 왼쪽 drag: 이동, double click: 창에 맞춤
+    """
+
+    def __init__(self, cache_size: int = 16):
+        """
+        Args:
+            cache_size: 채널별 pyramid 캐시 크기
+        """
         super().__init__()
-        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setMinimumSize(400, 400)
-        self._arr_uint8 = None  # Keep reference to prevent garbage collection
+        self._pyramid = None
+        self._scale = 1.0
+        self._origin = QPointF(0, 0)  # 원본 (0, 0) 픽셀의 화면 위치
+        self._fit = True
+        self._drag_start = None
+        self._smooth = True
+        self._cache_size = cache_size
+        self._cache = OrderedDict()  # key → ImagePyramid
+
+        # 조작 중에는 fast 렌더링, 멈추면 smooth 렌더링 한 번
+        self._rescale_timer = QTimer(self)
+        self._rescale_timer.setSingleShot(True)
+        self._rescale_timer.setInterval(RESCALE_DELAY_MS)
+        self._rescale_timer.timeout.connect(self._smooth_rescale)
+
+    @property
+    def zoom(self) -> float:
+        """화면 px / 원본 px"""
+        return self._scale
+
+    def set_image(self, arr: np.ndarray, key=None, value_range: tuple | None = None):
+        """numpy array를 표시
 
-    def set_image(self, arr: np.ndarray):
-        """numpy array를 QPixmap으로 변환하여 표시"""
-        # 0~1 → 0~255 정규화
-        arr_norm = (arr - arr.min()) / (arr.max() - arr.min() + 1e-8)
-        self._arr_uint8 = (arr_norm * 255).astype(np.uint8)
+        Args:
+            arr: (H, W) 채널
+            key: 캐시 키 (예: 채널 인덱스) - 같은 키는 정규화/pyramid 생성 생략
+            value_range: (min, max) 정규화 범위 (없으면 arr에서 계산)
+        """
+        if key is not None and key in self._cache:
+            self._show_cached(key)
+            return
+        self.set_normalized(normalize_to_uint8(arr, value_range), key)
 
-        # Ensure contiguous array for QImage
-        self._arr_uint8 = np.ascontiguousarray(self._arr_uint8)
+    def set_normalized(self, arr_uint8: np.ndarray, key=None):
+        """이미 정규화된 uint8 plane 표시 (key가 있으면 캐시)"""
+        pyramid = ImagePyramid(arr_uint8)
+        if key is not None and self._cache_size > 0:
+            self._cache[key] = pyramid
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        self._display(pyramid)
 
-        h, w = self._arr_uint8.shape
-        qimg = QImage(self._arr_uint8.data, w, h, w, QImage.Format.Format_Grayscale8)
-        pixmap = QPixmap.fromImage(qimg)
+    def has_cached(self, key) -> bool:
+        """key에 해당하는 pyramid가 캐시에 있는지"""
+        return key in self._cache
 
-        # 위젯 크기에 맞게 스케일
-        scaled = pixmap.scaled(
-            self.size(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        self.setPixmap(scaled)
+    def clear_cache(self):
+        """캐시 비우기 (다른 파일을 열 때)"""
+        self._cache.clear()
+
+    def _show_cached(self, key):
+        self._cache.move_to_end(key)
+        self._display(self._cache[key])
+
+    def _display(self, pyramid: ImagePyramid):
+        # 같은 크기의 채널로 바뀌면 확대/이동 상태 유지 (채널 간 비교)
+        same_size = self._pyramid is not None and self._pyramid.shape == pyramid.shape
+        self._pyramid = pyramid
+        if self._fit or not same_size:
+            self.fit_to_window()
+        self.update()
+
+    def fit_to_window(self):
+        """이미지를 위젯 크기에 맞추고 가운데 정렬"""
+        self._fit = True
+        if self._pyramid is None:
+            return
+        h, w = self._pyramid.shape
+        self._scale = min(self.width() / w, self.height() / h)
+        self._origin = QPointF((self.width() - w * self._scale) / 2,
+                               (self.height() - h * self._scale) / 2)
+        self.update()
+
+    def _interact(self):
+        self._smooth = False
+        self._rescale_timer.start()
+
+    def _smooth_rescale(self):
+        self._smooth = True
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(self.palette().window().color()))
+        if self._pyramid is None:
+            return
+        if self._smooth:
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+        pyramid = self._pyramid
+        level = pyramid.level_for_scale(self._scale)
+        lh, lw = pyramid.levels[level].shape
+        h, w = pyramid.shape
+        # level 픽셀 하나의 화면 크기 (level이 원본 전체 영역을 덮도록)
+        sx = self._scale * w / lw
+        sy = self._scale * h / lh
+
+        t = pyramid.tile_size
+        view = QRectF(event.rect())
+        col0 = max(0, int((view.left() - self._origin.x()) / (sx * t)))
+        col1 = min(math.ceil(lw / t), math.ceil((view.right() - self._origin.x()) / (sx * t)))
+        row0 = max(0, int((view.top() - self._origin.y()) / (sy * t)))
+        row1 = min(math.ceil(lh / t), math.ceil((view.bottom() - self._origin.y()) / (sy * t)))
+
+        for row in range(row0, row1):
+            for col in range(col0, col1):
+                pixmap = pyramid.tile(level, row, col)
+                target = QRectF(self._origin.x() + col * t * sx,
+                                self._origin.y() + row * t * sy,
+                                pixmap.width() * sx, pixmap.height() * sy)
+                painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
 
     def resizeEvent(self, event):
-        """창 크기 변경 시 이미지 다시 스케일"""
+        """창 크기 변경 중에는 fast 렌더링, 멈춘 뒤 smooth 렌더링"""
         super().resizeEvent(event)
-        if self._arr_uint8 is not None:
-            h, w = self._arr_uint8.shape
-            qimg = QImage(self._arr_uint8.data, w, h, w, QImage.Format.Format_Grayscale8)
-            pixmap = QPixmap.fromImage(qimg)
-            scaled = pixmap.scaled(
-                self.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.setPixmap(scaled)
+        if self._fit:
+            self.fit_to_window()
+        if self._pyramid is not None:
+            self._interact()
+
+    def wheelEvent(self, event):
+        if self._pyramid is None:
+            return
+        steps = event.angleDelta().y() / 120
+        if steps == 0:
+            return
+        h, w = self._pyramid.shape
+        min_zoom = min(1.0, self.width() / w, self.height() / h) / 4
+        scale = max(min_zoom, min(MAX_ZOOM, self._scale * ZOOM_STEP ** steps))
+
+        # 커서 아래 픽셀이 고정되도록 원점 이동
+        pos = event.position()
+        self._origin = pos - (pos - self._origin) * (scale / self._scale)
+        self._scale = scale
+        self._fit = False
+        self._interact()
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._drag_start = event.position()
+            self.setCursor(Qt.CursorShape.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        if self._drag_start is not None:
+            pos = event.position()
+            self._origin += pos - self._drag_start
+            self._drag_start = pos
+            self._fit = False
+            self._interact()
+            self.update()
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._drag_start = None
+            self.unsetCursor()
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit_to_window()
@@ -1,19 +1,59 @@
 """메인 윈도우"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QSlider, QSpinBox, QLabel, QPushButton, QFileDialog, QMessageBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, QObject, pyqtSignal
 from .image_view import ImageView
 from .mat_loader import MatLoader
 
+# 현재 채널 앞뒤로 미리 정규화해 둘 채널 수
+PREFETCH_RADIUS = 2
+# slider 이벤트를 모아 최신 값만 그리는 간격 (ms)
+CHANNEL_UPDATE_MS = 15
+# Export All PNG 압축 레벨 (0~9, 낮을수록 빠르고 파일이 큼)
+EXPORT_COMPRESS_LEVEL = 1
+
+
+class ExportSignals(QObject):
+    """export 스레드 → GUI 스레드 알림 (queued connection)"""
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(list, str)
+    failed = pyqtSignal(str)
+
+
+class StatsSignals(QObject):
+    """통계 스레드 → GUI 스레드 알림 (queued connection)"""
+    finished = pyqtSignal(object)  # 계산을 끝낸 MatLoader
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.loader = None
+        self._pending_channel = None
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=2)
+        self._prefetch = {}  # idx → Future (uint8 plane)
+        self._export_thread = None
+        self.export_signals = ExportSignals()
+        self.export_signals.progress.connect(self._on_export_progress)
+        self.export_signals.finished.connect(self._on_export_finished)
+        self.export_signals.failed.connect(self._on_export_failed)
+        self._stats_thread = None
+        self._stats_cancel = threading.Event()
+        self.stats_signals = StatsSignals()
+        self.stats_signals.finished.connect(self._on_stats_ready)
         self.setup_ui()
 
+        # slider drag 중 쌓인 valueChanged를 하나로 합쳐 최신 채널만 표시
+        self._channel_timer = QTimer(self)
+        self._channel_timer.setSingleShot(True)
+        self._channel_timer.setInterval(CHANNEL_UPDATE_MS)
+        self._channel_timer.timeout.connect(self._apply_pending_channel)
+
     def setup_ui(self):
         self.setWindowTitle("MAT Viewer")
         self.setMinimumSize(800, 700)
@@ -44,7 +84,7 @@ class MainWindow(QMainWindow):
 
         self.channel_slider = QSlider(Qt.Orientation.Horizontal)
         self.channel_slider.setEnabled(False)
-        self.channel_slider.valueChanged.connect(self.on_channel_changed)
+        self.channel_slider.valueChanged.connect(self._queue_channel)
         bottom_layout.addWidget(self.channel_slider, 1)
 
         self.channel_spin = QSpinBox()
@@ -68,8 +108,17 @@ class MainWindow(QMainWindow):
             self.load_mat(path)
 
     def load_mat(self, path: str):
+        self._cancel_prefetch()
+        self._stop_stats()
+        if self.loader is not None:
+            self.loader.close()
+        # 메타데이터만 읽고 채널은 표시할 때 읽음 (v7.3 HDF5)
         self.loader = MatLoader(path)
-        self.loader.load()
+        self.image_view.clear_cache()
+        self.loader.open()
+        # 채널별 통계/histogram은 백그라운드에서 한 번에 계산
+        # (끝나기 전에는 표시 중인 채널에서 범위/통계를 계산)
+        self._start_stats(self.loader)
 
         n = self.loader.n_channels
         self.channel_slider.setRange(0, n - 1)
@@ -81,8 +130,51 @@ class MainWindow(QMainWindow):
         self.export_btn.setEnabled(True)
         self.channel_slider.setValue(0)
         # Force update even if already at 0
+        self._channel_timer.stop()
         self.on_channel_changed(0)
 
+    def _start_stats(self, loader: MatLoader):
+        self._stats_cancel = threading.Event()
+        self._stats_thread = threading.Thread(
+            target=self._run_stats, args=(loader, self._stats_cancel), daemon=True
+        )
+        self._stats_thread.start()
+
+    def _run_stats(self, loader: MatLoader, cancel: threading.Event):
+        """통계 스레드 - 완료되면 signal로 GUI 스레드에 알림"""
+        try:
+            stats = loader.compute_stats(cancel=cancel)
+        except Exception as e:
+            if not cancel.is_set():
+                print(f"Failed to compute channel statistics: {e}")
+            return
+        if stats is not None:
+            self.stats_signals.finished.emit(loader)
+
+    def _stop_stats(self):
+        """진행 중인 통계 계산 취소 (현재 chunk가 끝날 때까지 대기)"""
+        if self._stats_thread is not None:
+            self._stats_cancel.set()
+            self._stats_thread.join()
+            self._stats_thread = None
+
+    def _on_stats_ready(self, loader: MatLoader):
+        if loader is not self.loader:
+            return
+        self._stats_thread = None
+        self._update_stats_label(self.channel_slider.value())
+
+    def _queue_channel(self, idx: int):
+        """slider 값 변경 - 최신 값만 기억하고 잠시 뒤 한 번 그림"""
+        self._pending_channel = idx
+        if not self._channel_timer.isActive():
+            self._channel_timer.start()
+
+    def _apply_pending_channel(self):
+        if self._pending_channel is not None:
+            idx, self._pending_channel = self._pending_channel, None
+            self.on_channel_changed(idx)
+
     def on_channel_changed(self, idx: int):
         if self.loader is None:
             return
@@ -90,26 +182,108 @@ class MainWindow(QMainWindow):
         self.channel_spin.setValue(idx)
         self.channel_spin.blockSignals(False)
 
-        ch = self.loader.get_channel(idx)
-        self.image_view.set_image(ch)
+        if self.image_view.has_cached(idx):
+            self.image_view.set_image(None, key=idx)
+        else:
+            future = self._prefetch.pop(idx, None)
+            if future is not None and not future.cancelled():
+                # 이미 계산 중이면 결과를 기다리는 편이 다시 계산보다 빠름
+                self.image_view.set_normalized(future.result(), key=idx)
+            else:
+                ch = self.loader.get_channel(idx)
+                self.image_view.set_image(ch, key=idx, value_range=self.loader.get_channel_range(idx))
+        self._prefetch_neighbors(idx)
+        self._update_stats_label(idx)
 
+    def _update_stats_label(self, idx: int):
         stats = self.loader.get_channel_stats(idx)
         self.stats_label.setText(
             f"Channel {idx}: min={stats['min']:.4f}, max={stats['max']:.4f}, "
             f"mean={stats['mean']:.4f}, std={stats['std']:.4f}"
         )
 
+    def _prefetch_neighbors(self, idx: int):
+        """앞뒤 채널의 정규화 plane을 백그라운드에서 미리 계산"""
+        n = self.loader.n_channels
+        wanted = set()
+        for offset in range(1, PREFETCH_RADIUS + 1):
+            for i in (idx + offset, idx - offset):
+                if 0 <= i < n and not self.image_view.has_cached(i):
+                    wanted.add(i)
+
+        # 멀어진 채널의 대기 중인 작업은 취소
+        for i in list(self._prefetch):
+            if i not in wanted:
+                self._prefetch.pop(i).cancel()
+        for i in wanted:
+            if i not in self._prefetch:
+                self._prefetch[i] = self._prefetch_pool.submit(self.loader.get_channel_uint8, i)
+
+    def _cancel_prefetch(self):
+        for future in self._prefetch.values():
+            future.cancel()
+        self._prefetch.clear()
+
+    def closeEvent(self, event):
+        self._channel_timer.stop()
+        self._cancel_prefetch()
+        self._prefetch_pool.shutdown(wait=True)
+        self._stop_stats()
+        if self._export_thread is not None:
+            self._export_thread.join()
+        if self.loader is not None:
+            self.loader.close()
+        super().closeEvent(event)
+
     def export_all(self):
-        """모든 채널을 PNG로 export"""
-        if self.loader is None:
+        """모든 채널을 PNG로 export (백그라운드 스레드에서 병렬 인코딩)"""
+        if self.loader is None or self._export_thread is not None:
             return
 
         dir_path = QFileDialog.getExistingDirectory(
             self, "Select Output Directory"
         )
         if dir_path:
-            paths = self.loader.export_all_channels(dir_path)
-            QMessageBox.information(
-                self, "Export Complete",
-                f"Exported {len(paths)} channels to:\n{dir_path}"
+            self.export_btn.setEnabled(False)
+            self.open_btn.setEnabled(False)
+            self.statusBar().showMessage(f"Exporting to {dir_path}...")
+            self._export_thread = threading.Thread(
+                target=self._run_export, args=(self.loader, dir_path), daemon=True
             )
+            self._export_thread.start()
+
+    def _run_export(self, loader: MatLoader, dir_path: str):
+        """export 스레드 - 결과는 signal로 GUI 스레드에 전달"""
+        try:
+            paths = loader.export_all_channels(
+                dir_path,
+                compress_level=EXPORT_COMPRESS_LEVEL,
+                progress=self.export_signals.progress.emit,
+            )
+        except Exception as e:
+            self.export_signals.failed.emit(str(e))
+        else:
+            self.export_signals.finished.emit(paths, dir_path)
+
+    def _on_export_progress(self, done: int, total: int):
+        self.statusBar().showMessage(f"Exporting... {done}/{total}")
+
+    def _export_done(self):
+        if self._export_thread is not None:
+            self._export_thread.join()
+            self._export_thread = None
+        self.export_btn.setEnabled(True)
+        self.open_btn.setEnabled(True)
+
+    def _on_export_finished(self, paths: list, dir_path: str):
+        self._export_done()
+        self.statusBar().showMessage(f"Exported {len(paths)} channels", 5000)
+        QMessageBox.information(
+            self, "Export Complete",
+            f"Exported {len(paths)} channels to:\n{dir_path}"
+        )
+
+    def _on_export_failed(self, message: str):
+        self._export_done()
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Export Failed", message)
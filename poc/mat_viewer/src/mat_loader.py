@@ -1,60 +1,409 @@
 """MAT 파일 로딩 유틸리티"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+
 import numpy as np
 import scipy.io as sio
 from pathlib import Path
 
+# MATLAB v7.3 파일은 512 byte 헤더 뒤에 HDF5 signature가 옴
+_HDF5_SIGNATURE = b'\x89HDF\r\n\x1a\n'
+_HDF5_OFFSET = 512
+
+# export_all_channels 지원 형식 → 확장자
+EXPORT_FORMATS = {'png': '.png', 'tiff': '.tif', 'npy': '.npy'}
+
+
+def normalize_to_uint8(arr: np.ndarray, value_range: tuple | None = None) -> np.ndarray:
+    """min-max 정규화 후 contiguous uint8 plane 반환
+
+    (arr - min) / (max - min + 1e-8) * 255 를 입력 dtype의 정밀도
+    (float64 cube는 float64)로 계산해 기존 표시/export 값과 동일한 결과를 냄.
+    중간 배열 하나만 할당하고 나머지 연산은 in-place.
+
+    Args:
+        arr: (H, W) 채널
+        value_range: (min, max) - 미리 계산된 범위 (없으면 arr에서 계산)
+    """
+    if value_range is None:
+        vmin, vmax = float(arr.min()), float(arr.max())
+    else:
+        vmin, vmax = value_range
+    out = np.subtract(arr, vmin)
+    out /= (vmax - vmin + 1e-8)
+    out *= 255
+    np.clip(out, 0, 255, out=out)
+    return np.ascontiguousarray(out.astype(np.uint8))
+
+
+def is_hdf5_mat(path: Path | str) -> bool:
+    """MATLAB v7.3 (HDF5) 형식 여부 확인"""
+    with open(path, 'rb') as f:
+        f.seek(_HDF5_OFFSET)
+        return f.read(len(_HDF5_SIGNATURE)) == _HDF5_SIGNATURE
+
 
 class MatLoader:
-    def __init__(self, path: Path | str):
+    def __init__(self, path: Path | str, cache_size: int = 8):
+        """
+        Args:
+            path: MAT 파일 경로
+            cache_size: contiguous 채널 plane LRU 캐시 크기
+        """
         self.path = Path(path)
         self.data = None
         self.img = None
+        self._file = None      # h5py.File (v7.3)
+        self._dataset = None   # h5py.Dataset, MATLAB column-major → (C, W, H)
+        self._cube = None      # channel-major (C, H, W) contiguous 사본
+        self._cache_size = cache_size
+        self._channel_cache = OrderedDict()  # idx → contiguous (H, W)
+        self._cache_lock = threading.Lock()  # prefetch 스레드와 캐시 공유
+        self._stats_lock = threading.Lock()  # compute_stats 중복 실행 방지
+        self.stats = None      # compute_stats() 결과 (채널별 통계 + histogram)
 
     def load(self) -> np.ndarray:
-        """MAT 파일 로드, img 키 반환"""
+        """MAT 파일 로드, img 키 반환 (전체를 메모리에 읽음)"""
+        self._clear_cache()
+        if is_hdf5_mat(self.path):
+            self.open()
+            self.img = self._dataset[()].transpose(2, 1, 0)  # (H, W, C)
+            return self.img
+
         self.data = sio.loadmat(str(self.path))
         self.img = self.data['img']  # (H, W, C)
         return self.img
 
+    def open(self) -> tuple:
+        """MAT 파일 열기 (lazy), img shape (H, W, C) 반환
+
+        v7.3 (HDF5) 파일은 메타데이터만 읽고, 채널/타일은 요청 시
+        chunk 단위로 읽음. v5 이하 파일은 img 변수만 로드.
+        """
+        if self._dataset is not None or self.img is not None:
+            return self.shape
+
+        if is_hdf5_mat(self.path):
+            try:
+                import h5py
+            except ImportError as e:
+                raise ImportError(
+                    "MATLAB v7.3 (HDF5) 파일을 열려면 h5py가 필요합니다"
+                ) from e
+            self._file = h5py.File(self.path, 'r')
+            self._dataset = self._file['img']
+        else:
+            self.data = sio.loadmat(str(self.path), variable_names=['img'])
+            self.img = self.data['img']  # (H, W, C)
+        return self.shape
+
+    def close(self):
+        """열린 HDF5 파일 닫기"""
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._dataset = None
+        self._clear_cache()
+
+    def _clear_cache(self):
+        self._cube = None
+        with self._cache_lock:
+            self._channel_cache.clear()
+        self.stats = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def is_lazy(self) -> bool:
+        """채널을 파일에서 요청 시 읽는지 여부"""
+        return self.img is None and self._dataset is not None
+
+    @property
+    def shape(self) -> tuple:
+        """img shape (H, W, C)"""
+        if self.img is not None:
+            return self.img.shape
+        if self._dataset is not None:
+            c, w, h = self._dataset.shape
+            return (h, w, c)
+        return (0, 0, 0)
+
     @property
     def n_channels(self) -> int:
-        return self.img.shape[2] if self.img is not None else 0
+        return self.shape[2]
 
     def get_channel(self, idx: int) -> np.ndarray:
-        """특정 채널 반환 (H, W)"""
+        """특정 채널 반환 (H, W), C-contiguous (read-only)
+
+        (H, W, C) 원본에서 채널을 자르면 stride가 C인 view가 되므로,
+        contiguous plane으로 한 번 복사해 LRU 캐시에 보관.
+        여러 스레드에서 호출 가능. 단, v7.3 (HDF5) 파일의 읽기는 h5py의
+        프로세스 전역 lock으로 직렬화되므로 (파일 handle을 여러 개 열어도 동일)
+        스레드를 늘려도 I/O는 병렬로 진행되지 않음.
+        """
+        if self._cube is not None:
+            return self._cube[idx]
+
+        with self._cache_lock:
+            plane = self._channel_cache.get(idx)
+            if plane is not None:
+                self._channel_cache.move_to_end(idx)
+                return plane
+
+        plane = np.ascontiguousarray(self._read_channel(idx))
+        plane.flags.writeable = False
+        if self._cache_size > 0:
+            with self._cache_lock:
+                self._channel_cache[idx] = plane
+                while len(self._channel_cache) > self._cache_size:
+                    self._channel_cache.popitem(last=False)
+        return plane
+
+    def _read_channel(self, idx: int) -> np.ndarray:
+        """원본 layout에서 채널 읽기 (strided view일 수 있음)"""
+        if self.is_lazy:
+            return self._dataset[idx].T
         return self.img[:, :, idx]
 
+    def build_channel_major(self) -> np.ndarray:
+        """전체 cube를 channel-major (C, H, W) contiguous 배열로 한 번 변환
+
+        이후 get_channel은 이 배열의 plane을 복사 없이 반환.
+        Lazy 모드에서는 전체 채널을 읽음.
+        """
+        if self._cube is None:
+            if self.is_lazy:
+                h, w, c = self.shape
+                cube = np.empty((c, h, w), dtype=self._dataset.dtype)
+                for i in range(c):
+                    cube[i] = self._dataset[i].T
+            else:
+                cube = np.ascontiguousarray(np.moveaxis(self.img, 2, 0))
+            cube.flags.writeable = False
+            self._cube = cube
+            with self._cache_lock:
+                self._channel_cache.clear()
+        return self._cube
+
+    def get_tile(self, idx: int, rows: slice, cols: slice) -> np.ndarray:
+        """특정 채널의 일부 영역 반환 (h, w) - lazy 모드에서는 해당 chunk만 읽음"""
+        if self.is_lazy:
+            return self._dataset[idx, cols, rows].T
+        return self.img[rows, cols, idx]
+
+    def _iter_chunks(self, max_elements: int = 1 << 22):
+        """cube를 (채널 slice, (k, N) 배열) chunk로 나눠 반환
+
+        메모리에 있는 cube는 행 단위 stripe (모든 채널)로 읽음.
+        Lazy (HDF5) 파일은 채널 단위로 읽음 - dataset이 (C, W, H)라 채널 하나가
+        연속 영역이고, 행 stripe는 모든 채널의 chunk를 가로질러 매우 느림.
+        """
+        h, w, c = self.shape
+        if self._cube is None and self.is_lazy:
+            for i in range(c):
+                yield slice(i, i + 1), self._dataset[i].reshape(1, -1)
+            return
+
+        rows = max(1, max_elements // max(1, w * c))
+        for r0 in range(0, h, rows):
+            r1 = min(h, r0 + rows)
+            if self._cube is not None:
+                yield slice(None), self._cube[:, r0:r1].reshape(c, -1)
+            else:
+                yield slice(None), self.img[r0:r1].reshape(-1, c).T
+
+    @staticmethod
+    def _histogram(chunk: np.ndarray, lo: np.ndarray, hi: np.ndarray, bins: int) -> np.ndarray:
+        """(k, N) chunk의 채널별 [lo, hi] 범위 고정 bin histogram (k, bins)
+
+        채널 offset을 더해 bincount 한 번으로 계산.
+        """
+        k = chunk.shape[0]
+        span = hi - lo
+        scale = np.where(span > 0, bins / np.where(span > 0, span, 1.0), 0.0)
+        idx = ((chunk - lo[:, np.newaxis]) * scale[:, np.newaxis]).astype(np.int64)
+        np.clip(idx, 0, bins - 1, out=idx)
+        offsets = (np.arange(k) * bins)[:, np.newaxis]
+        return np.bincount((idx + offsets).ravel(), minlength=k * bins).reshape(k, bins)
+
+    def compute_stats(self, bins: int = 256, cancel: threading.Event | None = None) -> dict | None:
+        """모든 채널의 통계와 histogram을 한 번에 계산
+
+        chunk 단위로 전체 cube를 벡터 연산으로 읽어 채널별 min/max/mean/std를
+        구하고, 채널별 [min, max] 범위의 고정 bin histogram을 계산.
+        큰 파일도 chunk 크기만큼의 메모리만 사용. Lazy 파일은 채널 단위로
+        한 번만 읽음 (통계와 histogram을 같은 read에서 계산).
+
+        worker 스레드에서 호출 가능. 동시에 호출되면 먼저 시작한 계산 결과를
+        공유함.
+
+        Args:
+            bins: histogram bin 수
+            cancel: set되면 다음 chunk 전에 중단하고 None 반환
+
+        Returns:
+            dict: 'min', 'max', 'mean', 'std' (C,), 'hist' (C, bins),
+                  'bin_edges' (C, bins + 1) - 취소되면 None
+        """
+        with self._stats_lock:
+            if self.stats is not None and self.stats['hist'].shape[1] == bins:
+                return self.stats
+
+            h, w, c = self.shape
+            n = h * w
+            per_channel = self._cube is None and self.is_lazy
+
+            # Pass 1: min / max / sum / sum of squares (채널 단위 chunk면 histogram까지)
+            ch_min = np.full(c, np.inf)
+            ch_max = np.full(c, -np.inf)
+            ch_sum = np.zeros(c)
+            ch_sumsq = np.zeros(c)
+            counts = np.zeros((c, bins), dtype=np.int64)
+            for sl, chunk in self._iter_chunks():
+                if cancel is not None and cancel.is_set():
+                    return None
+                chunk = chunk.astype(np.float64, copy=False)
+                ch_min[sl] = np.minimum(ch_min[sl], chunk.min(axis=1))
+                ch_max[sl] = np.maximum(ch_max[sl], chunk.max(axis=1))
+                ch_sum[sl] += chunk.sum(axis=1)
+                ch_sumsq[sl] += np.einsum('ij,ij->i', chunk, chunk)
+                if per_channel:
+                    counts[sl] = self._histogram(chunk, ch_min[sl], ch_max[sl], bins)
+
+            # Pass 2: 행 stripe는 범위가 다 모인 뒤 histogram 계산
+            if not per_channel:
+                for sl, chunk in self._iter_chunks():
+                    if cancel is not None and cancel.is_set():
+                        return None
+                    counts += self._histogram(chunk, ch_min, ch_max, bins)
+
+            mean = ch_sum / n
+            std = np.sqrt(np.maximum(ch_sumsq / n - mean * mean, 0.0))
+
+            self.stats = {
+                'min': ch_min,
+                'max': ch_max,
+                'mean': mean,
+                'std': std,
+                'hist': counts,
+                'bin_edges': np.linspace(ch_min, ch_max, bins + 1, axis=1),
+            }
+            return self.stats
+
     def get_channel_stats(self, idx: int) -> dict:
-        """채널 통계"""
-        ch = self.get_channel(idx)
+        """채널 통계 - compute_stats 결과가 있으면 읽고, 없으면 해당 채널만 계산"""
+        stats = self.stats
+        if stats is None:
+            ch = self.get_channel(idx)
+            return {
+                'min': float(ch.min()),
+                'max': float(ch.max()),
+                'mean': float(ch.mean(dtype=np.float64)),
+                'std': float(ch.std(dtype=np.float64)),
+            }
         return {
-            'min': ch.min(),
-            'max': ch.max(),
-            'mean': ch.mean(),
-            'std': ch.std()
+            'min': float(stats['min'][idx]),
+            'max': float(stats['max'][idx]),
+            'mean': float(stats['mean'][idx]),
+            'std': float(stats['std'][idx]),
         }
 
-    def export_channel(self, idx: int, path: Path) -> Path:
-        """채널을 grayscale PNG로 저장"""
-        ch = self.get_channel(idx)
-        # 정규화: min-max → 0-255
-        ch_norm = (ch - ch.min()) / (ch.max() - ch.min() + 1e-8)
-        ch_uint8 = (ch_norm * 255).astype(np.uint8)
+    def get_channel_range(self, idx: int) -> tuple[float, float]:
+        """채널 (min, max) - 정규화용 (compute_stats 전에는 해당 채널에서 계산)"""
+        stats = self.stats
+        if stats is None:
+            ch = self.get_channel(idx)
+            return float(ch.min()), float(ch.max())
+        return float(stats['min'][idx]), float(stats['max'][idx])
+
+    def get_channel_uint8(self, idx: int) -> np.ndarray:
+        """채널을 저장된 (min, max) 범위로 정규화한 contiguous uint8 plane"""
+        return normalize_to_uint8(self.get_channel(idx), self.get_channel_range(idx))
+
+    def export_channel(self, idx: int, path: Path, compress_level: int = 6) -> Path:
+        """채널을 grayscale 이미지로 저장 (확장자로 형식 결정: .png / .tif / .npy)
+
+        Args:
+            idx: 채널 인덱스
+            path: 저장 경로
+            compress_level: PNG zlib 압축 레벨 (0=무압축 ~ 9)
+        """
+        path = Path(path)
+        ch_uint8 = self.get_channel_uint8(idx)
+
+        if path.suffix.lower() == '.npy':
+            np.save(path, ch_uint8)
+            return path
 
         from PIL import Image
         img = Image.fromarray(ch_uint8, mode='L')
-        img.save(path)
+        if path.suffix.lower() == '.png':
+            img.save(path, compress_level=compress_level)
+        else:
+            img.save(path)  # TIFF 기본값은 무압축
         return path
 
-    def export_all_channels(self, output_dir: Path, start_wavelength: int = 400, step: int = 10) -> list[Path]:
-        """모든 채널을 {wavelength}nm.png 형식으로 저장"""
+    def export_all_channels(
+        self,
+        output_dir: Path,
+        start_wavelength: int = 400,
+        step: int = 10,
+        fmt: str = 'png',
+        compress_level: int = 6,
+        max_workers: int | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> list[Path]:
+        """모든 채널을 {wavelength}nm.{ext} 형식으로 병렬 저장
+
+        정규화는 compute_stats의 채널별 범위를 사용하고, 인코딩은 thread pool에서
+        실행 (Pillow/zlib은 인코딩 중 GIL을 놓음).
+
+        v7.3 (HDF5) 파일은 채널 읽기가 h5py 전역 lock으로 직렬화되므로
+        병렬로 진행되는 것은 정규화/인코딩 단계뿐이고, 파일 읽기는 한 번에
+        한 채널씩 진행됨. v5 파일은 전체가 메모리에 있어 읽기도 병렬.
+
+        Args:
+            output_dir: 출력 디렉토리
+            start_wavelength: 첫 채널 파장 (nm)
+            step: 채널 간 파장 간격 (nm)
+            fmt: 'png', 'tiff' (무압축), 'npy' (uint8 배열)
+            compress_level: PNG 압축 레벨 (0~9, 낮을수록 빠름)
+            max_workers: worker 수 (기본: CPU 수) - v7.3 파일은 인코딩만 병렬화
+            progress: progress(done, total) 콜백 - worker 스레드에서 호출됨
+
+        Returns:
+            채널 순서대로 저장된 파일 경로 리스트
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"fmt must be one of {sorted(EXPORT_FORMATS)}, got {fmt!r}")
+        if not 0 <= compress_level <= 9:
+            raise ValueError(f"compress_level must be in 0..9, got {compress_level}")
+
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
+        if self.stats is None:
+            self.compute_stats()
+
+        n = self.n_channels
+        ext = EXPORT_FORMATS[fmt]
+        paths = [output_dir / f"{start_wavelength + i * step}nm{ext}" for i in range(n)]
+        workers = max_workers or os.cpu_count() or 1
 
-        paths = []
-        for i in range(self.n_channels):
-            wavelength = start_wavelength + i * step
-            path = output_dir / f"{wavelength}nm.png"
-            self.export_channel(i, path)
-            paths.append(path)
+        with ThreadPoolExecutor(max_workers=min(workers, max(1, n))) as pool:
+            futures = [
+                pool.submit(self.export_channel, i, paths[i], compress_level)
+                for i in range(n)
+            ]
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                if progress is not None:
+                    progress(done, n)
         return paths
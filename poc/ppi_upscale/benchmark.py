@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Stage-level benchmarks for the PPI pipeline at production sizes.
+
+Runs every pipeline stage on synthetic 15-band cubes, records wall time,
+throughput (input megapixels per second) and tracemalloc peak, writes the
+results as JSON and optionally compares them against a stored baseline.
+
+    python benchmark.py                                  # 256..2048, all stages
+    python benchmark.py --sizes 256 512 -o output/bench.json
+    python benchmark.py --baseline benchmarks/baseline.json --threshold 0.2
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from src import PPISimple, PPIPPID, PPIIGFPPI, GuidedUpsampler, SpectralUpsampler
+
+STAGES = [
+    "load",
+    "ppi_simple",
+    "ppi_ppid",
+    "ppi_igfppi",
+    "guide",
+    "upscale_guided",
+    "upscale_bicubic",
+    "upscale_lanczos",
+    "spectral_upsample",
+]
+
+DEFAULT_SIZES = [256, 512, 1024, 2048]
+
+# Runs shorter than this are repeated and the best time is kept
+REPEAT_BELOW_SECONDS = 1.0
+
+# Timings below this are too noisy to flag as regressions
+MIN_COMPARE_SECONDS = 0.005
+
+
+def make_cube(size: int, bands: int = 15, seed: int = 0) -> np.ndarray:
+    """Create a synthetic channel cube with edges, gradients and noise.
+
+    Args:
+        size: Height and width in pixels
+        bands: Number of channels
+        seed: Random seed
+
+    Returns:
+        np.ndarray: Shape (bands, size, size), float32 values in [0, 255]
+    """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size] / size
+    structure = 0.5 + 0.3 * np.sin(12 * x) * np.cos(9 * y)
+    structure += 0.2 * ((x > 0.5) ^ (y > 0.3))  # Hard edges
+    gains = np.linspace(0.6, 1.0, bands)[:, None, None]
+    cube = 200 * gains * structure + rng.normal(0, 4, (bands, size, size))
+    return np.clip(cube, 0, 255).astype(np.float32)
+
+
+class StageContext:
+    """Inputs for the stages of one size, computed on first use (untimed)."""
+
+    def __init__(self, cube: np.ndarray, workdir: Path):
+        self.cube = cube
+        self.workdir = workdir
+        self._cache: Dict[str, object] = {}
+
+    def _get(self, key: str, factory: Callable[[], object]):
+        if key not in self._cache:
+            self._cache[key] = factory()
+        return self._cache[key]
+
+    @property
+    def png_dir(self) -> Path:
+        def write():
+            directory = self.workdir / f"channels_{self.cube.shape[1]}"
+            directory.mkdir(parents=True, exist_ok=True)
+            for i, channel in enumerate(self.cube.astype(np.uint8)):
+                Image.fromarray(channel, mode="L").save(directory / f"{410 + i * 20}nm.png")
+            return directory
+
+        return self._get("png_dir", write)
+
+    @property
+    def ppi(self) -> np.ndarray:
+        return self._get("ppi", lambda: PPIIGFPPI.from_channels(self.cube).generate_ppi())
+
+    @property
+    def guide(self) -> np.ndarray:
+        return self._get("guide", lambda: GuidedUpsampler()._compute_msfa_guide(self.cube))
+
+    @property
+    def ppi_2x(self) -> np.ndarray:
+        # The spectral stage's cost does not depend on which upscaler made ppi_2x
+        return self._get(
+            "ppi_2x", lambda: GuidedUpsampler(method="bicubic").upscale(self.ppi)
+        )
+
+
+def build_stage(stage: str, ctx: StageContext) -> Callable[[], object]:
+    """Return a zero-argument callable running one stage on the context's inputs."""
+    cube = ctx.cube
+    if stage == "load":
+        png_dir = ctx.png_dir
+        return lambda: PPISimple(png_dir).load_channels()
+    if stage == "ppi_simple":
+        return lambda: PPISimple.from_channels(cube).generate_ppi()
+    if stage == "ppi_ppid":
+        return lambda: PPIPPID.from_channels(cube).generate_ppi()
+    if stage == "ppi_igfppi":
+        return lambda: PPIIGFPPI.from_channels(cube).generate_ppi()
+    if stage == "guide":
+        upscaler = GuidedUpsampler()
+        return lambda: upscaler._compute_msfa_guide(cube)
+    if stage.startswith("upscale_"):
+        upscaler = GuidedUpsampler(method=stage[len("upscale_"):])
+        ppi, guide = ctx.ppi, ctx.guide
+        return lambda: upscaler.upscale(ppi, channels=cube, guide=guide)
+    if stage == "spectral_upsample":
+        upsampler = SpectralUpsampler()
+        ppi, ppi_2x = ctx.ppi, ctx.ppi_2x
+        return lambda: upsampler.upsample_all_channels(cube, ppi, ppi_2x)
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+def measure(func: Callable[[], object], repeat: int = 3, memory: bool = True) -> dict:
+    """Time a callable and measure its peak traced allocation.
+
+    The timed runs are done without tracemalloc, which slows allocation-heavy
+    loops; the memory peak comes from one extra traced run.
+
+    Args:
+        func: Stage to run
+        repeat: Maximum number of timed runs for fast stages
+        memory: Also measure the tracemalloc peak
+
+    Returns:
+        dict: seconds (best run), runs, peak_bytes (or None)
+    """
+    times = []
+    while True:
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+        if len(times) >= repeat or times[0] >= REPEAT_BELOW_SECONDS:
+            break
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {"seconds": min(times), "runs": len(times), "peak_bytes": peak}
+
+
+def run_benchmarks(
+    sizes: List[int],
+    stages: List[str],
+    bands: int = 15,
+    repeat: int = 3,
+    memory: bool = True,
+    time_budget: Optional[float] = 60.0,
+    seed: int = 0,
+    verbose: bool = True,
+) -> dict:
+    """Benchmark stages over sizes.
+
+    Once a stage takes longer than time_budget at some size, it is skipped
+    at the larger sizes (recorded with status "skipped").
+
+    Returns:
+        dict: {"meta": ..., "results": [...]} ready to be saved as JSON
+    """
+    results = []
+    over_budget = set()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in sorted(sizes):
+            ctx = StageContext(make_cube(size, bands, seed), Path(tmpdir))
+            megapixels = size * size / 1e6
+            for stage in stages:
+                record = {"stage": stage, "size": size, "bands": bands}
+                if stage in over_budget:
+                    record["status"] = "skipped"
+                    results.append(record)
+                    if verbose:
+                        print(f"  {stage:<18} {size:>5}²  skipped (over time budget)")
+                    continue
+
+                stats = measure(build_stage(stage, ctx), repeat=repeat, memory=memory)
+                record.update(
+                    status="ok",
+                    seconds=stats["seconds"],
+                    runs=stats["runs"],
+                    mp_per_s=megapixels / stats["seconds"] if stats["seconds"] > 0 else None,
+                    peak_mb=stats["peak_bytes"] / 2**20 if stats["peak_bytes"] is not None else None,
+                )
+                results.append(record)
+                if verbose:
+                    print(f"  {_format_row(record)}", flush=True)
+
+                if time_budget is not None and stats["seconds"] > time_budget:
+                    over_budget.add(stage)
+
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "bands": bands,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.2) -> List[str]:
+    """Compare results against a baseline.
+
+    A stage/size regresses when its time or tracemalloc peak exceeds the
+    baseline by more than threshold (0.2 = 20%), or when it ran ("ok") in
+    the baseline but is now skipped or missing, so run with the baseline's
+    stages and sizes. Entries the baseline did not run are not compared;
+    neither are times that stay under MIN_COMPARE_SECONDS.
+
+    Returns:
+        List of human-readable regression messages (empty if none)
+    """
+    current = {(r["stage"], r["size"], r["bands"]): r for r in results["results"]}
+    regressions = []
+    for reference in baseline["results"]:
+        if reference.get("status") != "ok":
+            continue
+        key = (reference["stage"], reference["size"], reference["bands"])
+        label = f"{reference['stage']} @ {reference['size']}²"
+        record = current.get(key)
+        if record is None:
+            regressions.append(f"{label}: missing (ran in baseline)")
+            continue
+        if record.get("status") != "ok":
+            regressions.append(f"{label}: {record.get('status')} (ran in baseline)")
+            continue
+
+        ratio = record["seconds"] / reference["seconds"]
+        if ratio > 1 + threshold and record["seconds"] >= MIN_COMPARE_SECONDS:
+            regressions.append(
+                f"{label}: {record['seconds']:.3f}s vs {reference['seconds']:.3f}s "
+                f"({(ratio - 1) * 100:+.0f}%)"
+            )
+        if record.get("peak_mb") and reference.get("peak_mb"):
+            ratio = record["peak_mb"] / reference["peak_mb"]
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{label}: peak {record['peak_mb']:.1f}MB vs {reference['peak_mb']:.1f}MB "
+                    f"({(ratio - 1) * 100:+.0f}%)"
+                )
+    return regressions
+
+
+def _format_row(record: dict) -> str:
+    peak = f"{record['peak_mb']:9.1f}MB" if record.get("peak_mb") is not None else "          -"
+    mp_per_s = f"{record['mp_per_s']:9.3f}" if record.get("mp_per_s") else "        -"
+    return (
+        f"{record['stage']:<18} {record['size']:>5}²  {record['seconds'] * 1e3:10.1f}ms "
+        f"{mp_per_s} MP/s {peak}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PPI pipeline stages")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Square input sizes in pixels (default: 256 512 1024 2048)",
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGES,
+        default=STAGES,
+        help="Stages to run (default: all)",
+    )
+    parser.add_argument("--bands", type=int, default=15, help="Number of channels (default: 15)")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help=f"Timed runs for stages under {REPEAT_BELOW_SECONDS:.0f}s; best is kept (default: 3)",
+    )
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=60.0,
+        help="Skip larger sizes of a stage once it exceeds this many seconds (default: 60)",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=Path("output/benchmark.json"),
+        help="Results JSON (default: output/benchmark.json)",
+    )
+    parser.add_argument("--baseline", type=Path, default=None, help="Baseline results JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown / memory growth vs. baseline, as a fraction (default: 0.2)",
+    )
+
+    args = parser.parse_args()
+
+    print(f"Stages: {', '.join(args.stages)}")
+    print(f"Sizes: {', '.join(f'{s}²' for s in sorted(args.sizes))} x {args.bands} bands")
+    print("=" * 60)
+    results = run_benchmarks(
+        args.sizes,
+        args.stages,
+        bands=args.bands,
+        repeat=max(1, args.repeat),
+        memory=not args.no_memory,
+        time_budget=args.time_budget,
+    )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+    print("=" * 60)
+    print(f"Saved: {args.output}")
+
+    if args.baseline is not None:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"\nNo regressions over {args.threshold:.0%} vs {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,9 @@ from pathlib import Path
 import numpy as np
 from PIL import Image
 
-from src import PPISimple, PPIPPID, PPIIGFPPI, GuidedUpsampler, SpectralUpsampler
-
-
-METHODS = {
-    "simple": PPISimple,
-    "ppid": PPIPPID,
-    "igfppi": PPIIGFPPI,
-}
-
-UPSCALE_METHODS = ["guided", "bicubic", "lanczos"]
+from src import GuidedUpsampler, SpectralUpsampler, open_channel_source
+from src.pipeline import METHODS, UPSCALE_METHODS
+from src.profiling import Profiler, span
 
 
 def save_image(arr: np.ndarray, path: Path) -> Path:
@@ -47,7 +40,7 @@ def run_pipeline(args):
     output_dir = args.output_dir
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    print(f"Input directory: {args.input}")
+    print(f"Input: {args.input}")
     print(f"Output directory: {output_dir}")
     print(f"PPI method: {args.method}")
     print(f"Upscale: {args.upscale}x ({args.upscale_method})")
@@ -56,39 +49,48 @@ def run_pipeline(args):
     # Step 1: Load channels
     print("\n[Step 1] Loading MSFA channels...")
     generator_cls = METHODS[args.method]
-    generator = generator_cls(args.input)
-    channels = generator.load_channels()
+    with span("load_channels", input=str(args.input)):
+        source = open_channel_source(args.input, scale=args.scale)
+        generator = generator_cls.from_source(source)
+        channels = generator.load_channels()
     print(f"  Loaded {len(channels)} channels, shape: {channels.shape[1:]} each")
 
     # Step 2: Generate PPI
     print(f"\n[Step 2] Generating PPI ({args.method})...")
-    ppi = generator.generate_ppi()
+    with span("generate_ppi", method=args.method):
+        ppi = generator.generate_ppi()
     ppi_path = output_dir / f"1_ppi_{args.method}.png"
-    save_image(ppi, ppi_path)
+    with span("save_image"):
+        save_image(ppi, ppi_path)
     print(f"  Shape: {ppi.shape}")
     print(f"  Saved: {ppi_path}")
 
     # Step 3: Compute guide from MSFA
     print("\n[Step 3] Computing guide from MSFA channels...")
     upscaler = GuidedUpsampler(scale_factor=args.upscale, method=args.upscale_method)
-    guide = upscaler._compute_msfa_guide(channels)
+    with span("msfa_guide"):
+        guide = upscaler._compute_msfa_guide(channels)
     guide_path = output_dir / "2_guide_msfa.png"
-    save_normalized_image(guide, guide_path)
+    with span("save_image"):
+        save_normalized_image(guide, guide_path)
     print(f"  Shape: {guide.shape}")
     print(f"  Saved: {guide_path}")
 
     # Step 4: Upscale PPI
     print(f"\n[Step 4] Upscaling PPI {args.upscale}x ({args.upscale_method})...")
-    ppi_upscaled = upscaler.upscale(ppi, channels=channels)
+    with span("upscale_ppi", method=args.upscale_method, factor=args.upscale):
+        ppi_upscaled = upscaler.upscale(ppi, channels=channels, guide=guide)
     upscaled_path = output_dir / f"3_ppi_{args.method}_{args.upscale}x_{args.upscale_method}.png"
-    save_image(ppi_upscaled, upscaled_path)
+    with span("save_image"):
+        save_image(ppi_upscaled, upscaled_path)
     print(f"  Shape: {ppi_upscaled.shape}")
     print(f"  Saved: {upscaled_path}")
 
     # Step 5: Upsample all channels
     print(f"\n[Step 5] Upsampling all channels...")
     spectral_upsampler = SpectralUpsampler()
-    channels_2x = spectral_upsampler.upsample_all_channels(channels, ppi, ppi_upscaled)
+    with span("spectral_upsample"):
+        channels_2x = spectral_upsampler.upsample_all_channels(channels, ppi, ppi_upscaled)
     print(f"  Original: {channels.shape}")
     print(f"  Upscaled: {channels_2x.shape}")
 
@@ -96,7 +98,8 @@ def run_pipeline(args):
     channel_paths = []
     for i in [0, 7, 14]:  # 첫번째, 중간, 마지막 채널
         ch_path = output_dir / f"4_channel_{i}_2x.png"
-        save_image(channels_2x[i], ch_path)
+        with span("save_image"):
+            save_image(channels_2x[i], ch_path)
         channel_paths.append(ch_path)
         print(f"  Saved: {ch_path}")
 
@@ -128,7 +131,13 @@ def main():
         "-i",
         type=Path,
         default=Path("data"),
-        help="Input directory containing *nm.png files (default: data)",
+        help="Input: directory of *nm.png files, .mat/.npy cube or 3x5 mosaic image (default: data)",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply input values, e.g. 255 for .mat/.npy cubes in [0, 1] (default: 1.0)",
     )
     parser.add_argument(
         "--output-dir",
@@ -156,9 +165,32 @@ def main():
         default="guided",
         help="Upscaling method (default: guided)",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record per-stage wall/CPU time and peak RSS; writes <output-dir>/profile_trace.json",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="With --profile, also record bytes allocated per stage (tracemalloc; much slower)",
+    )
 
     args = parser.parse_args()
-    run_pipeline(args)
+    if not (args.profile or args.profile_memory):
+        run_pipeline(args)
+        return
+
+    profiler = Profiler(trace_memory=args.profile_memory)
+    with profiler.activate():
+        with span("run_pipeline"):
+            run_pipeline(args)
+
+    trace_path = profiler.write_chrome_trace(args.output_dir / "profile_trace.json")
+    print("\n" + "-" * 50)
+    print("Profile:")
+    print(profiler.format_summary())
+    print(f"\nTrace: {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
 
 
 if __name__ == "__main__":
@@ -1,15 +1,42 @@
 from .base import PPIGeneratorBase
+from .channel_source import (
+    ChannelSource,
+    ArraySource,
+    PNGDirectorySource,
+    NpySource,
+    MatSource,
+    MosaicSource,
+    open_channel_source,
+)
 from .ppi_simple import PPISimple
 from .ppi_ppid import PPIPPID
 from .ppi_igfppi import PPIIGFPPI
 from .guided_upsample import GuidedUpsampler
 from .spectral_upsampler import SpectralUpsampler
+from .pipeline import run_cube_pipeline
+from .spectral_cube import SpectralCube
+from .rgb_composite import render_rgb
+from .line_profile import line_profile, polyline_profile
+from .profiling import Profiler
 
 __all__ = [
     "PPIGeneratorBase",
+    "ChannelSource",
+    "ArraySource",
+    "PNGDirectorySource",
+    "NpySource",
+    "MatSource",
+    "MosaicSource",
+    "open_channel_source",
     "PPISimple",
     "PPIPPID",
     "PPIIGFPPI",
     "GuidedUpsampler",
     "SpectralUpsampler",
+    "run_cube_pipeline",
+    "SpectralCube",
+    "render_rgb",
+    "line_profile",
+    "polyline_profile",
+    "Profiler",
 ]
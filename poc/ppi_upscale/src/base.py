@@ -7,20 +7,61 @@ from typing import Optional
 import numpy as np
 from PIL import Image
 
+from .channel_source import ChannelSource, open_channel_source
+
 
 class PPIGeneratorBase(ABC):
     """Base class for Pseudo-Panchromatic Image generators."""
 
-    def __init__(self, input_dir: Path):
+    def __init__(self, input_dir: Optional[Path]):
         """Initialize with input directory containing channel images.
 
         Args:
-            input_dir: Directory containing *nm.png files (410nm-690nm)
+            input_dir: Directory containing *nm.png files (410nm-690nm), or
+                any path open_channel_source accepts (.mat, .npy, mosaic).
+                None when channels are supplied via from_channels/from_source
         """
-        self.input_dir = Path(input_dir)
+        self.input_dir = Path(input_dir) if input_dir is not None else None
+        self.source: Optional[ChannelSource] = None
         self.channels: Optional[np.ndarray] = None
         self.ppi: Optional[np.ndarray] = None
 
+    @classmethod
+    def from_channels(cls, channels: np.ndarray, **kwargs) -> "PPIGeneratorBase":
+        """Create a generator from an in-memory channel cube.
+
+        Skips the PNG round-trip, e.g. for registered channels handed over
+        directly from channel_splitter.
+
+        Args:
+            channels: Channel cube (N, H, W), any numeric dtype in [0, 255]
+            **kwargs: Generator-specific parameters
+
+        Returns:
+            PPIGeneratorBase: Generator with channels already loaded
+        """
+        if channels.ndim != 3:
+            raise ValueError(f"Expected channels of shape (N, H, W), got {channels.shape}")
+
+        generator = cls(None, **kwargs)
+        generator.channels = np.asarray(channels, dtype=np.float32)
+        return generator
+
+    @classmethod
+    def from_source(cls, source: ChannelSource, **kwargs) -> "PPIGeneratorBase":
+        """Create a generator reading its channels from a ChannelSource.
+
+        Args:
+            source: Channel source (PNG directory, .mat, .npy, mosaic, ...)
+            **kwargs: Generator-specific parameters
+
+        Returns:
+            PPIGeneratorBase: Generator that loads from the source on demand
+        """
+        generator = cls(None, **kwargs)
+        generator.source = source
+        return generator
+
     @property
     @abstractmethod
     def method_name(self) -> str:
@@ -33,18 +74,14 @@ class PPIGeneratorBase(ABC):
         Returns:
             np.ndarray: Shape (N, H, W) with float32 values [0, 255]
         """
-        channel_files = sorted(self.input_dir.glob("*nm.png"))
-
-        if not channel_files:
-            raise FileNotFoundError(f"No *nm.png files found in {self.input_dir}")
-
-        channels = []
-        for filepath in channel_files:
-            img = Image.open(filepath).convert("L")  # Convert to grayscale
-            arr = np.array(img, dtype=np.float32)
-            channels.append(arr)
-
-        self.channels = np.stack(channels, axis=0)
+        if self.source is None:
+            if self.input_dir is None:
+                if self.channels is None:
+                    raise ValueError("No input directory or in-memory channels given")
+                return self.channels
+            self.source = open_channel_source(self.input_dir)
+
+        self.channels = self.source.read_all()
         return self.channels
 
     @abstractmethod
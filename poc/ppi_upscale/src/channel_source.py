@@ -0,0 +1,307 @@
+"""Channel sources: lazy per-band access to multispectral data.
+
+PPI generators consume a channel cube (N, H, W) of float32 values in
+[0, 255]. A ChannelSource hides where the bands come from, so a directory of
+*nm.png files, a .mat cube, a 3x5 mosaic or a .npy dump can all be read
+without transcoding to PNGs first.
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+# MATLAB v7.3 files are HDF5 containers with a 512 byte user block
+_HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+_HDF5_OFFSET = 512
+
+# Image extensions treated as 3x5 mosaics by open_channel_source
+MOSAIC_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".tif")
+
+
+class ChannelSource(ABC):
+    """Base class for band-addressable multispectral data."""
+
+    def __init__(self, scale: float = 1.0):
+        """Initialize common options.
+
+        Args:
+            scale: Factor applied to every band, e.g. 255 for data in [0, 1]
+        """
+        self.scale = scale
+
+    @property
+    @abstractmethod
+    def shape(self) -> Tuple[int, int, int]:
+        """Return the cube shape as (N, H, W)."""
+        pass
+
+    @abstractmethod
+    def read_band(self, index: int) -> np.ndarray:
+        """Read a single band in its stored dtype and range.
+
+        Args:
+            index: Band index in [0, N)
+
+        Returns:
+            np.ndarray: Shape (H, W)
+        """
+        pass
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def get_band(self, index: int) -> np.ndarray:
+        """Read a single band as float32.
+
+        Args:
+            index: Band index, negative values count from the end
+
+        Returns:
+            np.ndarray: Shape (H, W) with float32 values
+        """
+        n = len(self)
+        if not -n <= index < n:
+            raise IndexError(f"Band index {index} out of range for {n} bands")
+        band = np.asarray(self.read_band(index % n), dtype=np.float32)
+        if self.scale != 1.0:
+            band = band * np.float32(self.scale)
+        return band
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self.get_band(index)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for i in range(len(self)):
+            yield self.get_band(i)
+
+    def read_all(self) -> np.ndarray:
+        """Read every band into a contiguous cube.
+
+        Returns:
+            np.ndarray: Shape (N, H, W) with float32 values
+        """
+        cube = np.empty(self.shape, dtype=np.float32)
+        for i in range(len(self)):
+            cube[i] = self.read_band(i)
+        if self.scale != 1.0:
+            cube *= np.float32(self.scale)
+        return cube
+
+
+class ArraySource(ChannelSource):
+    """Channels held in memory as an (N, H, W) array."""
+
+    def __init__(self, channels: np.ndarray, scale: float = 1.0):
+        """Wrap an in-memory cube.
+
+        Args:
+            channels: Channel cube (N, H, W)
+            scale: Factor applied to every band
+        """
+        super().__init__(scale)
+        if channels.ndim != 3:
+            raise ValueError(f"Expected channels of shape (N, H, W), got {channels.shape}")
+        self.channels = channels
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.channels.shape
+
+    def read_band(self, index: int) -> np.ndarray:
+        return self.channels[index]
+
+
+class PNGDirectorySource(ChannelSource):
+    """Directory of single-band images such as 410nm.png ... 690nm.png."""
+
+    def __init__(self, directory: Path, pattern: str = "*nm.png", scale: float = 1.0):
+        """Index the band files of a directory; images are decoded on access.
+
+        Args:
+            directory: Directory containing the band images
+            pattern: Glob pattern of band files, sorted by name
+            scale: Factor applied to every band
+        """
+        super().__init__(scale)
+        self.directory = Path(directory)
+        self.files = sorted(self.directory.glob(pattern))
+        if not self.files:
+            raise FileNotFoundError(f"No {pattern} files found in {self.directory}")
+        self._shape: Optional[Tuple[int, int, int]] = None
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        if self._shape is None:
+            with Image.open(self.files[0]) as img:
+                width, height = img.size
+            self._shape = (len(self.files), height, width)
+        return self._shape
+
+    def read_band(self, index: int) -> np.ndarray:
+        with Image.open(self.files[index]) as img:
+            return np.array(img.convert("L"))
+
+
+class NpySource(ChannelSource):
+    """Memory-mapped .npy cube; only the requested bands are paged in."""
+
+    LAYOUTS = ("NHW", "HWN")
+
+    def __init__(self, path: Path, layout: str = "NHW", scale: float = 1.0):
+        """Memory-map a .npy cube.
+
+        Args:
+            path: .npy file path
+            layout: "NHW" for band-major or "HWN" for band-last arrays
+            scale: Factor applied to every band, e.g. 255 for data in [0, 1]
+        """
+        super().__init__(scale)
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"layout must be one of {self.LAYOUTS}, got {layout!r}")
+        self.path = Path(path)
+        self.layout = layout
+        self.array = np.load(self.path, mmap_mode="r")
+        if self.array.ndim != 3:
+            raise ValueError(f"Expected a 3D array in {self.path}, got {self.array.shape}")
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        if self.layout == "HWN":
+            height, width, n = self.array.shape
+            return (n, height, width)
+        return self.array.shape
+
+    def read_band(self, index: int) -> np.ndarray:
+        if self.layout == "HWN":
+            return self.array[:, :, index]
+        return self.array[index]
+
+
+class MatSource(ChannelSource):
+    """Hyperspectral .mat cube stored as (H, W, N), as read by mat_viewer.
+
+    MATLAB v7.3 (HDF5) files are read band by band through h5py; older
+    files are loaded once with scipy.io.loadmat.
+    """
+
+    def __init__(self, path: Path, key: str = "img", scale: float = 1.0):
+        """Open a .mat cube.
+
+        Args:
+            path: .mat file path
+            key: Variable name of the cube
+            scale: Factor applied to every band, e.g. 255 for data in [0, 1]
+        """
+        super().__init__(scale)
+        self.path = Path(path)
+        self.key = key
+        self._file = None
+        self._dataset = None  # h5py dataset, column-major → (N, W, H)
+        self._array = None    # (H, W, N)
+
+        with open(self.path, "rb") as f:
+            f.seek(_HDF5_OFFSET)
+            is_hdf5 = f.read(len(_HDF5_SIGNATURE)) == _HDF5_SIGNATURE
+
+        if is_hdf5:
+            try:
+                import h5py
+            except ImportError as e:
+                raise ImportError("h5py is required to read MATLAB v7.3 files") from e
+            self._file = h5py.File(self.path, "r")
+            self._dataset = self._file[key]
+        else:
+            import scipy.io as sio
+
+            data = sio.loadmat(str(self.path), variable_names=[key])
+            if key not in data:
+                raise KeyError(f"Variable {key!r} not found in {self.path}")
+            self._array = data[key]
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        if self._dataset is not None:
+            n, width, height = self._dataset.shape
+            return (n, height, width)
+        height, width, n = self._array.shape
+        return (n, height, width)
+
+    def read_band(self, index: int) -> np.ndarray:
+        if self._dataset is not None:
+            return self._dataset[index].T
+        return self._array[:, :, index]
+
+    def close(self):
+        """Close the underlying HDF5 file, if any."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._dataset = None
+
+
+class MosaicSource(ChannelSource):
+    """3x5 tiled raw frame, split into 15 bands in row-major order.
+
+    Tiles are served as-is; no registration is applied (see channel_splitter).
+    Trailing rows/columns that do not fill a whole tile are dropped.
+    """
+
+    def __init__(self, path: Path, rows: int = 3, cols: int = 5, scale: float = 1.0):
+        """Decode a mosaic image.
+
+        Args:
+            path: Mosaic image path
+            rows: Number of tile rows
+            cols: Number of tile columns
+            scale: Factor applied to every band
+        """
+        super().__init__(scale)
+        self.path = Path(path)
+        self.rows = rows
+        self.cols = cols
+        with Image.open(self.path) as img:
+            self.mosaic = np.array(img.convert("L"))
+        self.tile_height = self.mosaic.shape[0] // rows
+        self.tile_width = self.mosaic.shape[1] // cols
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return (self.rows * self.cols, self.tile_height, self.tile_width)
+
+    def read_band(self, index: int) -> np.ndarray:
+        row, col = divmod(index, self.cols)
+        y = row * self.tile_height
+        x = col * self.tile_width
+        return self.mosaic[y:y + self.tile_height, x:x + self.tile_width]
+
+
+def open_channel_source(path: Path, **kwargs) -> ChannelSource:
+    """Pick a channel source from the path.
+
+    Directories are read as *nm.png band files, .mat and .npy files as
+    cubes, and other image files as 3x5 mosaics.
+
+    Args:
+        path: Directory or file path
+        **kwargs: Source-specific parameters (e.g. scale, layout, key)
+
+    Returns:
+        ChannelSource: Source for the path
+    """
+    path = Path(path)
+    if path.is_dir():
+        return PNGDirectorySource(path, **kwargs)
+
+    suffix = path.suffix.lower()
+    if suffix == ".mat":
+        return MatSource(path, **kwargs)
+    if suffix == ".npy":
+        return NpySource(path, **kwargs)
+    if suffix in MOSAIC_EXTENSIONS:
+        return MosaicSource(path, **kwargs)
+    if not path.exists():
+        raise FileNotFoundError(f"Input not found: {path}")
+    raise ValueError(f"Unsupported channel source: {path}")
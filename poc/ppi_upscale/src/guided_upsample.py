@@ -29,7 +29,7 @@ class GuidedUpsampler:
         self.method = method
 
     def upscale(
-        self, img: np.ndarray, channels: np.ndarray = None
+        self, img: np.ndarray, channels: np.ndarray = None, guide: np.ndarray = None
     ) -> np.ndarray:
         """Upscale image using raw MSFA channels as guide.
 
@@ -37,12 +37,14 @@ class GuidedUpsampler:
             img: Input image (H, W), float32
             channels: Raw MSFA channels (N, H, W) for guided upscaling.
                       If None, falls back to edge-based guide.
+            guide: Precomputed guide (H, W), e.g. from _compute_msfa_guide.
+                   Takes precedence over channels.
 
         Returns:
             Upscaled image (H*scale, W*scale), float32
         """
         if self.method == "guided":
-            return self._guided_upscale(img, channels)
+            return self._guided_upscale(img, channels, guide)
         elif self.method == "bicubic":
             return self._bicubic_upscale(img)
         else:  # lanczos
@@ -57,7 +59,7 @@ class GuidedUpsampler:
         return zoom(img, self.scale_factor, order=5)
 
     def _guided_upscale(
-        self, img: np.ndarray, channels: np.ndarray = None
+        self, img: np.ndarray, channels: np.ndarray = None, guide: np.ndarray = None
     ) -> np.ndarray:
         """Upscale using directional interpolation with MSFA guide (Eq. 17-21).
 
@@ -70,6 +72,7 @@ class GuidedUpsampler:
         Args:
             img: Input PPI image (H, W)
             channels: Raw MSFA channels (N, H, W). If None, uses PPI edge.
+            guide: Precomputed guide (H, W). If given, channels are not used.
 
         Returns:
             Upscaled image with preserved edges (H*scale, W*scale)
@@ -78,10 +81,11 @@ class GuidedUpsampler:
         H2, W2 = H * self.scale_factor, W * self.scale_factor
 
         # Step 1: Compute guide from MSFA channels (for weight calculation)
-        if channels is not None:
-            guide = self._compute_msfa_guide(channels)
-        else:
-            guide = self._compute_edge_guide(img)
+        if guide is None:
+            if channels is not None:
+                guide = self._compute_msfa_guide(channels)
+            else:
+                guide = self._compute_edge_guide(img)
 
         # Step 2: Directional upscale using guide weights
         img_up = self._directional_upscale(img, guide)
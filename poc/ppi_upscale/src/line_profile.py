@@ -0,0 +1,143 @@
+"""Line and polyline intensity profiles across all bands of a channel cube.
+
+Sample coordinates are computed once and every band is sampled with the
+same gather, so a full-cube profile costs a handful of fancy-indexing
+operations instead of one interpolation call per band.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# Point as (row, column), in pixel coordinates
+Point = Tuple[float, float]
+
+ORDERS = (0, 1)  # 0: nearest, 1: bilinear
+
+
+def line_coordinates(start: Point, end: Point, num: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Evenly spaced sample positions along a segment.
+
+    Args:
+        start: (row, column) of the first sample
+        end: (row, column) of the last sample
+        num: Number of samples (default: one per pixel of length, plus one)
+
+    Returns:
+        Tuple of (rows, columns), each of shape (L,), float64
+    """
+    (y0, x0), (y1, x1) = start, end
+    if num is None:
+        num = int(np.ceil(np.hypot(y1 - y0, x1 - x0))) + 1
+    if num < 1:
+        raise ValueError(f"num must be at least 1, got {num}")
+    return np.linspace(y0, y1, num), np.linspace(x0, x1, num)
+
+
+def polyline_coordinates(points: Sequence[Point], spacing: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Sample positions at a fixed arc-length spacing along a polyline.
+
+    Args:
+        points: Vertices as (row, column), at least two
+        spacing: Distance between samples in pixels
+
+    Returns:
+        Tuple of (rows, columns), each of shape (L,), float64
+    """
+    vertices = np.asarray(points, dtype=np.float64)
+    if vertices.ndim != 2 or vertices.shape[1] != 2 or len(vertices) < 2:
+        raise ValueError("points must be a sequence of at least two (row, column) pairs")
+    if spacing <= 0:
+        raise ValueError(f"spacing must be positive, got {spacing}")
+
+    segment_lengths = np.hypot(*np.diff(vertices, axis=0).T)
+    arc = np.concatenate([[0.0], np.cumsum(segment_lengths)])
+    distances = np.arange(0.0, arc[-1] + spacing * 1e-6, spacing)
+    return np.interp(distances, arc, vertices[:, 0]), np.interp(distances, arc, vertices[:, 1])
+
+
+def sample_bands(channels: np.ndarray, rows: np.ndarray, cols: np.ndarray, order: int = 1) -> np.ndarray:
+    """Sample every band of a cube at the same positions.
+
+    Positions outside the image are clamped to the nearest edge pixel.
+
+    Args:
+        channels: Channel cube (N, H, W)
+        rows: Row positions, shape (L,)
+        cols: Column positions, shape (L,)
+        order: 0 for nearest neighbour, 1 for bilinear
+
+    Returns:
+        np.ndarray: Shape (N, L), float32
+    """
+    if channels.ndim != 3:
+        raise ValueError(f"Expected channels of shape (N, H, W), got {channels.shape}")
+    if order not in ORDERS:
+        raise ValueError(f"order must be one of {ORDERS}, got {order}")
+
+    n_bands, height, width = channels.shape
+    rows = np.clip(np.asarray(rows, dtype=np.float64), 0, height - 1)
+    cols = np.clip(np.asarray(cols, dtype=np.float64), 0, width - 1)
+    flat = channels.reshape(n_bands, -1)
+
+    if order == 0:
+        index = np.rint(rows).astype(np.intp) * width + np.rint(cols).astype(np.intp)
+        return np.take(flat, index, axis=1).astype(np.float32, copy=False)
+
+    # Positions are clamped to >= 0, so truncation is floor
+    y0 = rows.astype(np.intp)
+    x0 = cols.astype(np.intp)
+    y1 = np.minimum(y0 + 1, height - 1)
+    x1 = np.minimum(x0 + 1, width - 1)
+    wy = (rows - y0).astype(np.float32)
+    wx = (cols - x0).astype(np.float32)
+
+    # Gather the four neighbours of every sample in all bands at once
+    index = np.concatenate([y0 * width + x0, y0 * width + x1, y1 * width + x0, y1 * width + x1])
+    weights = np.stack([(1 - wy) * (1 - wx), (1 - wy) * wx, wy * (1 - wx), wy * wx])
+    corners = np.take(flat, index, axis=1).reshape(n_bands, 4, -1)
+    return np.einsum("nkl,kl->nl", corners, weights).astype(np.float32, copy=False)
+
+
+def line_profile(
+    channels: np.ndarray,
+    start: Point,
+    end: Point,
+    num: Optional[int] = None,
+    order: int = 1,
+) -> np.ndarray:
+    """Intensity profile of every band along a segment.
+
+    Args:
+        channels: Channel cube (N, H, W)
+        start: (row, column) of the first sample
+        end: (row, column) of the last sample
+        num: Number of samples (default: one per pixel of length, plus one)
+        order: 0 for nearest neighbour, 1 for bilinear
+
+    Returns:
+        np.ndarray: Shape (N, L), float32
+    """
+    rows, cols = line_coordinates(start, end, num)
+    return sample_bands(channels, rows, cols, order)
+
+
+def polyline_profile(
+    channels: np.ndarray,
+    points: Sequence[Point],
+    spacing: float = 1.0,
+    order: int = 1,
+) -> np.ndarray:
+    """Intensity profile of every band along a polyline.
+
+    Args:
+        channels: Channel cube (N, H, W)
+        points: Vertices as (row, column), at least two
+        spacing: Distance between samples in pixels
+        order: 0 for nearest neighbour, 1 for bilinear
+
+    Returns:
+        np.ndarray: Shape (N, L), float32
+    """
+    rows, cols = polyline_coordinates(points, spacing)
+    return sample_bands(channels, rows, cols, order)
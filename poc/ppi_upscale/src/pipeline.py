@@ -0,0 +1,72 @@
+"""In-memory PPI pipeline: channel cube → PPI → upscaled PPI → upscaled channels.
+
+Accepts a registered channel cube directly (e.g. from channel_splitter), so
+no PNG encode/decode round-trip is needed between the two tools.
+"""
+
+import numpy as np
+
+from .ppi_simple import PPISimple
+from .ppi_ppid import PPIPPID
+from .ppi_igfppi import PPIIGFPPI
+from .guided_upsample import GuidedUpsampler
+from .spectral_upsampler import SpectralUpsampler
+from .profiling import span
+
+
+METHODS = {
+    "simple": PPISimple,
+    "ppid": PPIPPID,
+    "igfppi": PPIIGFPPI,
+}
+
+UPSCALE_METHODS = ["guided", "bicubic", "lanczos"]
+
+
+def run_cube_pipeline(
+    channels: np.ndarray,
+    method: str = "igfppi",
+    upscale: int = 2,
+    upscale_method: str = "guided",
+    **generator_kwargs,
+) -> dict:
+    """Run PPI generation and upscaling on an in-memory channel cube.
+
+    Args:
+        channels: Registered channels (N, H, W), values in [0, 255]
+        method: PPI method - "simple", "ppid" or "igfppi"
+        upscale: Upscale factor for the PPI
+        upscale_method: "guided", "bicubic" or "lanczos"
+        **generator_kwargs: Extra parameters for the PPI generator
+
+    Returns:
+        dict: generator, channels (N, H, W) float32, ppi (H, W),
+              guide (H, W), ppi_upscaled (2H, 2W), channels_upscaled (N, 2H, 2W)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+
+    with span("load_channels"):
+        generator = METHODS[method].from_channels(channels, **generator_kwargs)
+        channels = generator.channels
+    with span("generate_ppi", method=method):
+        ppi = generator.generate_ppi()
+
+    upscaler = GuidedUpsampler(scale_factor=upscale, method=upscale_method)
+    with span("msfa_guide"):
+        guide = upscaler._compute_msfa_guide(channels)
+    with span("upscale_ppi", method=upscale_method, factor=upscale):
+        ppi_upscaled = upscaler.upscale(ppi, channels=channels, guide=guide)
+
+    spectral_upsampler = SpectralUpsampler()
+    with span("spectral_upsample"):
+        channels_upscaled = spectral_upsampler.upsample_all_channels(channels, ppi, ppi_upscaled)
+
+    return {
+        "generator": generator,
+        "channels": channels,
+        "ppi": ppi,
+        "guide": guide,
+        "ppi_upscaled": ppi_upscaled,
+        "channels_upscaled": channels_upscaled,
+    }
@@ -8,6 +8,7 @@ import numpy as np
 from scipy.ndimage import convolve, uniform_filter
 
 from .ppi_simple import PPISimple
+from .profiling import span
 
 
 class PPIIGFPPI(PPISimple):
@@ -51,10 +52,12 @@ class PPIIGFPPI(PPISimple):
             np.ndarray: PPI image, shape (H, W), float32 [0, 255]
         """
         # Step 1: Get simple average PPI
-        ppi_simple = super().generate_ppi()
+        with span("igfppi_simple"):
+            ppi_simple = super().generate_ppi()
 
         # Step 2: Gaussian low-pass filtering (Eq.4)
-        ppi_lowpass = self._gaussian_lowpass(ppi_simple)
+        with span("igfppi_lowpass"):
+            ppi_lowpass = self._gaussian_lowpass(ppi_simple)
 
         # Step 3: Iterative guided filtering in horizontal and vertical directions
         ppi_h, D_h = self._iterative_guided_filter(
@@ -65,7 +68,8 @@ class PPIIGFPPI(PPISimple):
         )
 
         # Step 4: Combine horizontal and vertical results (Eq.15-16)
-        self.ppi = self._combine_hv(ppi_h, ppi_v, D_h, D_v)
+        with span("igfppi_combine"):
+            self.ppi = self._combine_hv(ppi_h, ppi_v, D_h, D_v)
         return self.ppi
 
     def _gaussian_lowpass(self, img: np.ndarray) -> np.ndarray:
@@ -114,28 +118,33 @@ class PPIIGFPPI(PPISimple):
         prev = current.copy()
         D = np.ones_like(current) * np.inf  # Initialize D to large values
 
-        for iteration in range(self.max_iterations):
-            # Apply one iteration of guided filter (Eq.6-8)
-            filtered = self._guided_filter_step(guide, current, window_h, window_v)
-
-            # Compute pixel-wise difference (Eq.11-12)
-            delta = np.abs(filtered - current)
-            d = np.abs(filtered - prev)
-            D = d * delta
-
-            # Update for next iteration
-            prev = current.copy()
-            current = filtered
-
-            # Check global stopping criterion (Eq.13-14)
-            delta_mad = np.mean(np.abs(filtered - prev))
-            if delta_mad < self.epsilon_global:
-                break
-
-            # Check pixel-wise stopping criterion
-            converged_ratio = np.mean(D < self.epsilon_pixel)
-            if converged_ratio > 0.99:  # 99% of pixels converged
-                break
+        with span(f"igfppi_{direction}") as info:
+            for iteration in range(self.max_iterations):
+                with span("igfppi_iteration", direction=direction, iteration=iteration) as step:
+                    # Apply one iteration of guided filter (Eq.6-8)
+                    filtered = self._guided_filter_step(guide, current, window_h, window_v)
+
+                    # Compute pixel-wise difference (Eq.11-12)
+                    delta = np.abs(filtered - current)
+                    d = np.abs(filtered - prev)
+                    D = d * delta
+
+                    # Update for next iteration
+                    prev = current.copy()
+                    current = filtered
+
+                    # Check global stopping criterion (Eq.13-14)
+                    delta_mad = np.mean(np.abs(filtered - prev))
+                    step["delta_mad"] = float(delta_mad)
+                    if delta_mad < self.epsilon_global:
+                        break
+
+                    # Check pixel-wise stopping criterion
+                    converged_ratio = np.mean(D < self.epsilon_pixel)
+                    if converged_ratio > 0.99:  # 99% of pixels converged
+                        break
+
+            info["iterations"] = iteration + 1
 
         # Track iterations for statistics
         if direction == "horizontal":
@@ -0,0 +1,230 @@
+"""Lightweight span profiler for the PPI pipeline.
+
+Pipeline code marks its stages with ``span("name")``. Spans cost nothing
+unless a Profiler is active; inside ``Profiler.activate()`` every span
+records wall time, process CPU time, the peak RSS increase and, with
+trace_memory, the bytes allocated (tracemalloc sees numpy buffers). The
+result can be written as a Chrome trace (chrome://tracing, ui.perfetto.dev)
+or printed as a table.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Profiler receiving spans, set by Profiler.activate()
+_active: Optional["Profiler"] = None
+
+
+def _max_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far, or None if unavailable."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def span(name: str, **args):
+    """Context manager timing a block on the active profiler.
+
+    Without an active profiler this is a no-op. The yielded dict holds the
+    span's args; values added to it inside the block (e.g. an iteration
+    count) end up in the trace.
+
+    Args:
+        name: Span name; spans with the same name are aggregated in the summary
+        **args: Extra values recorded with the span
+    """
+    if _active is None:
+        return contextlib.nullcontext(args)
+    return _active.span(name, **args)
+
+
+class Profiler:
+    """Collects spans and exports them as a Chrome trace or a summary table.
+
+    Memory figures come from process-wide counters, so they are only exact
+    for spans that do not overlap with spans on other threads.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """Create a profiler.
+
+        Args:
+            trace_memory: Record allocated bytes with tracemalloc. This makes
+                allocation-heavy Python loops (BTES) many times slower, so
+                their times are not representative while it is on.
+        """
+        self.trace_memory = trace_memory
+        self.records: List[dict] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Route module-level span() calls to this profiler for the block."""
+        global _active
+        previous = _active
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        _active = self
+        try:
+            yield self
+        finally:
+            _active = previous
+            if started_tracing:
+                tracemalloc.stop()
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args):
+        """Record one span (see the module-level span())."""
+        stack = self._stack()
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+
+        frame = {"peak": 0, "start_memory": 0}
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            # Fold the parent's peak so far into it before resetting the counter
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+            frame["start_memory"] = current
+            frame["peak"] = current
+        stack.append(frame)
+
+        rss_start = _max_rss_bytes()
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            end = time.perf_counter()
+            cpu = time.process_time() - cpu_start
+            rss_end = _max_rss_bytes()
+            stack.pop()
+
+            alloc_bytes = net_bytes = None
+            if tracing and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                frame["peak"] = max(frame["peak"], peak)
+                alloc_bytes = frame["peak"] - frame["start_memory"]
+                net_bytes = current - frame["start_memory"]
+                if stack:
+                    stack[-1]["peak"] = max(stack[-1]["peak"], frame["peak"])
+                tracemalloc.reset_peak()
+
+            record = {
+                "name": name,
+                "start": start - self._origin,
+                "wall": end - start,
+                "cpu": cpu,
+                "rss_delta": rss_end - rss_start if rss_start is not None else None,
+                "alloc_bytes": alloc_bytes,
+                "net_bytes": net_bytes,
+                "depth": len(stack),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            with self._lock:
+                self.records.append(record)
+
+    def chrome_trace(self) -> dict:
+        """Spans as Chrome trace "complete" events (timestamps in µs)."""
+        pid = os.getpid()
+        events = []
+        for record in sorted(self.records, key=lambda r: r["start"]):
+            args = {"cpu_ms": round(record["cpu"] * 1e3, 3)}
+            if record["rss_delta"] is not None:
+                args["peak_rss_delta_bytes"] = record["rss_delta"]
+            if record["alloc_bytes"] is not None:
+                args["alloc_bytes"] = record["alloc_bytes"]
+                args["net_bytes"] = record["net_bytes"]
+            args.update({key: _jsonable(value) for key, value in record["args"].items()})
+            events.append({
+                "name": record["name"],
+                "cat": "pipeline",
+                "ph": "X",
+                "ts": round(record["start"] * 1e6, 3),
+                "dur": round(record["wall"] * 1e6, 3),
+                "pid": pid,
+                "tid": record["tid"],
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path) -> Path:
+        """Write the Chrome trace JSON to path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()))
+        return path
+
+    def summary(self) -> List[dict]:
+        """Spans aggregated by name, in order of first start.
+
+        Returns:
+            List of dicts: name, depth, count, wall, cpu (totals in seconds),
+            rss_delta, alloc_bytes (maximum over the spans, or None)
+        """
+        rows: Dict[str, dict] = {}
+        for record in sorted(self.records, key=lambda r: r["start"]):
+            row = rows.setdefault(record["name"], {
+                "name": record["name"],
+                "depth": record["depth"],
+                "count": 0,
+                "wall": 0.0,
+                "cpu": 0.0,
+                "rss_delta": None,
+                "alloc_bytes": None,
+            })
+            row["count"] += 1
+            row["wall"] += record["wall"]
+            row["cpu"] += record["cpu"]
+            for key in ("rss_delta", "alloc_bytes"):
+                if record[key] is not None:
+                    row[key] = max(row[key] or 0, record[key])
+        return list(rows.values())
+
+    def format_summary(self) -> str:
+        """Summary as a text table, nested spans indented under their parents."""
+        lines = [
+            f"{'Span':<36} {'Count':>6} {'Wall (s)':>10} {'CPU (s)':>10} "
+            f"{'RSS +MB':>9} {'Alloc MB':>9}"
+        ]
+        for row in self.summary():
+            rss = f"{row['rss_delta'] / 2**20:9.1f}" if row["rss_delta"] is not None else f"{'-':>9}"
+            alloc = f"{row['alloc_bytes'] / 2**20:9.1f}" if row["alloc_bytes"] is not None else f"{'-':>9}"
+            label = ("  " * row["depth"] + row["name"])[:36]
+            lines.append(
+                f"{label:<36} {row['count']:>6} {row['wall']:>10.3f} {row['cpu']:>10.3f} {rss} {alloc}"
+            )
+        return "\n".join(lines)
+
+
+def _jsonable(value):
+    """Convert numpy scalars and other values for json.dumps."""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
@@ -0,0 +1,525 @@
+"""Reference implementations and equivalence corpus for the loop kernels.
+
+The functions here are frozen copies of the per-pixel loop implementations
+of btes_upsample, GuidedUpsampler._directional_upscale,
+PPIPPID._apply_highfreq_correction and PPIIGFPPI._guided_filter_step,
+including their boundary handling (_fill_boundary, the one-sided
+neighbours on the first/last rows and columns). They are slow on purpose
+and must not be optimized: any faster version of a kernel has to agree
+with its reference on the seeded corpus below (see compare_kernel and
+tests/test_reference.py).
+"""
+
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+from scipy.ndimage import gaussian_filter, uniform_filter
+
+
+def btes_upsample(delta: np.ndarray, ppi_2x: np.ndarray, eps: float = 1e-6) -> np.ndarray:
+    """Reference for btes_upsample: spectral difference를 BTES 방식으로 2× 업샘플.
+
+    Args:
+        delta: spectral difference (H, W)
+        ppi_2x: 업스케일된 PPI (2H, 2W) - 가중치 계산용
+        eps: division by zero 방지
+
+    Returns:
+        delta_2x (2H, 2W)
+    """
+    H, W = delta.shape
+    H2, W2 = H * 2, W * 2
+
+    # Step 0: 초기화 - 원본 delta를 짝수,짝수 위치에 배치
+    delta_2x = np.zeros((H2, W2), dtype=np.float32)
+    delta_2x[0::2, 0::2] = delta
+
+    # Step 1: 대각선 보간 (홀수,홀수 위치)
+    _interpolate_diagonal(delta_2x, ppi_2x, H, W, eps)
+
+    # Step 2a: 십자 보간 (짝수,홀수 위치) - 수평 에지
+    _interpolate_horizontal_edge(delta_2x, ppi_2x, H, W, eps)
+
+    # Step 2b: 십자 보간 (홀수,짝수 위치) - 수직 에지
+    _interpolate_vertical_edge(delta_2x, ppi_2x, H, W, eps)
+
+    # Step 3: 경계 처리 - 마지막 행/열 복사
+    _fill_boundary(delta_2x, H, W)
+
+    return delta_2x
+
+
+def _fill_boundary(delta_2x: np.ndarray, H: int, W: int):
+    """경계 픽셀 처리 - 이웃 값으로 채움."""
+    H2, W2 = H * 2, W * 2
+
+    # 마지막 열 (홀수 열 인덱스 W2-1)이 0인 경우 이웃에서 복사
+    # (짝수,홀수) 위치에서 마지막 열은 j=W-1일 때 x=2*(W-1)+1=2W-1=W2-1
+    # 하지만 horizontal_edge 루프는 j < W-1 까지만 처리하므로 W2-1 열은 미처리
+    # 마지막 열은 짝수 위치(원본)만 있고 홀수 위치가 비어있음
+    for i in range(H2):
+        if i % 2 == 0:
+            # (짝수, W2-1): 홀수 열이므로 좌측에서 복사
+            if W2 - 1 > 0:
+                delta_2x[i, W2 - 1] = delta_2x[i, W2 - 2]
+        else:
+            # (홀수, W2-1): 홀수 열이므로 좌측에서 복사
+            if W2 - 1 > 0:
+                delta_2x[i, W2 - 1] = delta_2x[i, W2 - 2]
+
+    # 마지막 행도 동일하게 처리
+    for j in range(W2):
+        if j % 2 == 0:
+            # (H2-1, 짝수): 홀수 행이므로 상단에서 복사
+            if H2 - 1 > 0:
+                delta_2x[H2 - 1, j] = delta_2x[H2 - 2, j]
+        else:
+            # (H2-1, 홀수): 이미 대각선 또는 이전 단계에서 처리되었을 수 있음
+            if H2 - 1 > 0:
+                delta_2x[H2 - 1, j] = delta_2x[H2 - 2, j]
+
+
+def _interpolate_diagonal(delta_2x: np.ndarray, ppi_2x: np.ndarray,
+                          H: int, W: int, eps: float):
+    """Step 1: 대각선 보간 (홀수,홀수) - Eq. 18-19 응용.
+
+    [NW] .  [NE]
+      .  [X]  .
+    [SW] .  [SE]
+
+    가중치: γ_NW = 1 / (2|ppi_NW - ppi_center| + |ppi_NW - ppi_SE| + ε)
+    """
+    for i in range(H - 1):
+        for j in range(W - 1):
+            y, x = 2*i + 1, 2*j + 1  # target: 홀수,홀수
+
+            # 4개의 대각선 이웃 delta 값 (원본 위치)
+            d_nw = delta_2x[2*i, 2*j]
+            d_ne = delta_2x[2*i, 2*j + 2]
+            d_se = delta_2x[2*i + 2, 2*j + 2]
+            d_sw = delta_2x[2*i + 2, 2*j]
+
+            # PPI 값들
+            p_c = ppi_2x[y, x]  # center
+            p_nw = ppi_2x[2*i, 2*j]
+            p_ne = ppi_2x[2*i, 2*j + 2]
+            p_se = ppi_2x[2*i + 2, 2*j + 2]
+            p_sw = ppi_2x[2*i + 2, 2*j]
+
+            # 논문 Eq.19 스타일 가중치: 1/(2*dist + gradient + eps)
+            g_nw = 1.0 / (2*abs(p_nw - p_c) + abs(p_nw - p_se) + eps)
+            g_ne = 1.0 / (2*abs(p_ne - p_c) + abs(p_ne - p_sw) + eps)
+            g_se = 1.0 / (2*abs(p_se - p_c) + abs(p_se - p_nw) + eps)
+            g_sw = 1.0 / (2*abs(p_sw - p_c) + abs(p_sw - p_ne) + eps)
+
+            total = g_nw + g_ne + g_se + g_sw
+            delta_2x[y, x] = (g_nw*d_nw + g_ne*d_ne + g_se*d_se + g_sw*d_sw) / total
+
+
+def _interpolate_horizontal_edge(delta_2x: np.ndarray, ppi_2x: np.ndarray,
+                                  H: int, W: int, eps: float):
+    """Step 2a: (짝수,홀수) 위치 - 좌우 원본 + 상하 Step1 결과 사용.
+
+    상하로 Step1 결과, 좌우로 원본 delta.
+         [N?]
+    [W] -- X -- [E]
+         [S?]
+    """
+    for i in range(H):
+        for j in range(W - 1):
+            y, x = 2*i, 2*j + 1  # target: 짝수,홀수
+
+            # 좌우 이웃 (원본 delta)
+            d_w = delta_2x[y, 2*j]
+            d_e = delta_2x[y, 2*j + 2]
+
+            p_c = ppi_2x[y, x]
+            p_w = ppi_2x[y, 2*j]
+            p_e = ppi_2x[y, 2*j + 2]
+
+            g_w = 1.0 / (2*abs(p_w - p_c) + abs(p_w - p_e) + eps)
+            g_e = 1.0 / (2*abs(p_e - p_c) + abs(p_e - p_w) + eps)
+
+            weighted_sum = g_w*d_w + g_e*d_e
+            total_g = g_w + g_e
+
+            # 상하 이웃 (Step 1 결과, 경계 체크)
+            if i > 0:
+                d_n = delta_2x[y - 1, x]  # 홀수,홀수 위치 (Step1)
+                p_n = ppi_2x[y - 1, x]
+                p_s_ref = ppi_2x[y + 1, x] if i < H - 1 else p_c
+                g_n = 1.0 / (2*abs(p_n - p_c) + abs(p_n - p_s_ref) + eps)
+                weighted_sum += g_n * d_n
+                total_g += g_n
+
+            if i < H - 1:
+                d_s = delta_2x[y + 1, x]  # 홀수,홀수 위치 (Step1)
+                p_s = ppi_2x[y + 1, x]
+                p_n_ref = ppi_2x[y - 1, x] if i > 0 else p_c
+                g_s = 1.0 / (2*abs(p_s - p_c) + abs(p_s - p_n_ref) + eps)
+                weighted_sum += g_s * d_s
+                total_g += g_s
+
+            delta_2x[y, x] = weighted_sum / total_g
+
+
+def _interpolate_vertical_edge(delta_2x: np.ndarray, ppi_2x: np.ndarray,
+                                H: int, W: int, eps: float):
+    """Step 2b: (홀수,짝수) 위치 - 상하 원본 + 좌우 Step1 결과 사용.
+
+         [N]
+    [W?]--X--[E?]
+         [S]
+    """
+    for i in range(H - 1):
+        for j in range(W):
+            y, x = 2*i + 1, 2*j  # target: 홀수,짝수
+
+            # 상하 이웃 (원본 delta)
+            d_n = delta_2x[2*i, x]
+            d_s = delta_2x[2*i + 2, x]
+
+            p_c = ppi_2x[y, x]
+            p_n = ppi_2x[2*i, x]
+            p_s = ppi_2x[2*i + 2, x]
+
+            g_n = 1.0 / (2*abs(p_n - p_c) + abs(p_n - p_s) + eps)
+            g_s = 1.0 / (2*abs(p_s - p_c) + abs(p_s - p_n) + eps)
+
+            weighted_sum = g_n*d_n + g_s*d_s
+            total_g = g_n + g_s
+
+            # 좌우 이웃 (Step 1 결과, 경계 체크)
+            if j > 0:
+                d_w = delta_2x[y, x - 1]  # 홀수,홀수 위치 (Step1)
+                p_w = ppi_2x[y, x - 1]
+                p_e_ref = ppi_2x[y, x + 1] if j < W - 1 else p_c
+                g_w = 1.0 / (2*abs(p_w - p_c) + abs(p_w - p_e_ref) + eps)
+                weighted_sum += g_w * d_w
+                total_g += g_w
+
+            if j < W - 1:
+                d_e = delta_2x[y, x + 1]  # 홀수,홀수 위치 (Step1)
+                p_e = ppi_2x[y, x + 1]
+                p_w_ref = ppi_2x[y, x - 1] if j > 0 else p_c
+                g_e = 1.0 / (2*abs(p_e - p_c) + abs(p_e - p_w_ref) + eps)
+                weighted_sum += g_e * d_e
+                total_g += g_e
+
+            delta_2x[y, x] = weighted_sum / total_g
+
+
+def directional_upscale(img: np.ndarray, guide: np.ndarray, eps: float = 1e-6) -> np.ndarray:
+    """Reference for GuidedUpsampler._directional_upscale (BTES-style, Eq. 18-21).
+
+    Args:
+        img: Image to upscale (H, W)
+        guide: Guide image for weight calculation (H, W)
+        eps: Small value to prevent division by zero
+
+    Returns:
+        Upscaled image (2H, 2W)
+    """
+    H, W = img.shape
+    H2, W2 = H * 2, W * 2
+
+    # Initialize: place original at even positions
+    img_2x = np.zeros((H2, W2), dtype=np.float32)
+    img_2x[0::2, 0::2] = img
+
+    # Step 1: Diagonal interpolation (odd, odd)
+    for i in range(H - 1):
+        for j in range(W - 1):
+            y, x = 2*i + 1, 2*j + 1
+
+            # 4 diagonal neighbors
+            v_nw, v_ne = img[i, j], img[i, j + 1]
+            v_se, v_sw = img[i + 1, j + 1], img[i + 1, j]
+
+            # Guide values for weights
+            g_nw, g_ne = guide[i, j], guide[i, j + 1]
+            g_se, g_sw = guide[i + 1, j + 1], guide[i + 1, j]
+
+            # Weights: inverse of opposite difference (Eq. 19)
+            w_nw = 1.0 / (abs(g_nw - g_se) + eps)
+            w_ne = 1.0 / (abs(g_ne - g_sw) + eps)
+            w_se = 1.0 / (abs(g_se - g_nw) + eps)
+            w_sw = 1.0 / (abs(g_sw - g_ne) + eps)
+
+            total = w_nw + w_ne + w_se + w_sw
+            img_2x[y, x] = (w_nw*v_nw + w_ne*v_ne + w_se*v_se + w_sw*v_sw) / total
+
+    # Step 2a: Horizontal edge (even, odd)
+    for i in range(H):
+        for j in range(W - 1):
+            y, x = 2*i, 2*j + 1
+
+            v_w, v_e = img_2x[y, 2*j], img_2x[y, 2*j + 2]
+            g_w, g_e = guide[i, j], guide[i, j + 1]
+
+            w_w = 1.0 / (abs(g_w - g_e) + eps)
+            w_e = 1.0 / (abs(g_e - g_w) + eps)
+
+            weighted_sum = w_w*v_w + w_e*v_e
+            total_w = w_w + w_e
+
+            # Add vertical neighbors from Step 1 if available
+            if i > 0:
+                v_n = img_2x[y - 1, x]
+                g_n = img_2x[2*(i-1) + 1, x] if i > 0 else g_w
+                g_s_ref = img_2x[y + 1, x] if i < H - 1 else g_n
+                w_n = 1.0 / (abs(g_n - g_s_ref) + eps)
+                weighted_sum += w_n * v_n
+                total_w += w_n
+
+            if i < H - 1:
+                v_s = img_2x[y + 1, x]
+                g_s = img_2x[2*i + 1, x]
+                g_n_ref = img_2x[y - 1, x] if i > 0 else g_s
+                w_s = 1.0 / (abs(g_s - g_n_ref) + eps)
+                weighted_sum += w_s * v_s
+                total_w += w_s
+
+            img_2x[y, x] = weighted_sum / total_w
+
+    # Step 2b: Vertical edge (odd, even)
+    for i in range(H - 1):
+        for j in range(W):
+            y, x = 2*i + 1, 2*j
+
+            v_n, v_s = img_2x[2*i, x], img_2x[2*i + 2, x]
+            g_n, g_s = guide[i, j], guide[i + 1, j]
+
+            w_n = 1.0 / (abs(g_n - g_s) + eps)
+            w_s = 1.0 / (abs(g_s - g_n) + eps)
+
+            weighted_sum = w_n*v_n + w_s*v_s
+            total_w = w_n + w_s
+
+            # Add horizontal neighbors from Step 1 if available
+            if j > 0:
+                v_w = img_2x[y, x - 1]
+                g_w = img_2x[y, 2*(j-1) + 1] if j > 0 else g_n
+                g_e_ref = img_2x[y, x + 1] if j < W - 1 else g_w
+                w_w = 1.0 / (abs(g_w - g_e_ref) + eps)
+                weighted_sum += w_w * v_w
+                total_w += w_w
+
+            if j < W - 1:
+                v_e = img_2x[y, x + 1]
+                g_e = img_2x[y, 2*j + 1]
+                g_w_ref = img_2x[y, x - 1] if j > 0 else g_e
+                w_e = 1.0 / (abs(g_e - g_w_ref) + eps)
+                weighted_sum += w_e * v_e
+                total_w += w_e
+
+            img_2x[y, x] = weighted_sum / total_w
+
+    # Fill boundary (last row/column)
+    img_2x[-1, :] = img_2x[-2, :]
+    img_2x[:, -1] = img_2x[:, -2]
+
+    return img_2x
+
+
+def highfreq_correction(
+    ppi_simple: np.ndarray,
+    ppi_lowfreq: np.ndarray,
+    window_size: int = 5,
+    epsilon: float = 1e-6,
+) -> np.ndarray:
+    """Reference for PPIPPID._apply_highfreq_correction.
+
+    Î^M_k = I^M_k + Σ γ_q (Ī^M_q - I^M_q) / Σ γ_q
+    where γ_q = 1 / (|I_k - I_q| + ε)
+    """
+    h, w = ppi_simple.shape
+    pad = window_size // 2
+    result = np.copy(ppi_simple)
+
+    # Pad images for boundary handling
+    simple_pad = np.pad(ppi_simple, pad, mode="reflect")
+    lowfreq_pad = np.pad(ppi_lowfreq, pad, mode="reflect")
+
+    # Difference image
+    diff_pad = lowfreq_pad - simple_pad
+
+    for i in range(h):
+        for j in range(w):
+            i_pad, j_pad = i + pad, j + pad
+            center_val = simple_pad[i_pad, j_pad]
+
+            # Local neighborhood
+            neighborhood = simple_pad[
+                i_pad - pad : i_pad + pad + 1, j_pad - pad : j_pad + pad + 1
+            ]
+            diff_neighborhood = diff_pad[
+                i_pad - pad : i_pad + pad + 1, j_pad - pad : j_pad + pad + 1
+            ]
+
+            # Weights: inverse of intensity difference
+            weights = 1.0 / (np.abs(neighborhood - center_val) + epsilon)
+
+            # Weighted average of differences
+            weighted_diff = np.sum(weights * diff_neighborhood) / np.sum(weights)
+
+            result[i, j] = ppi_simple[i, j] + weighted_diff
+
+    return result
+
+
+def guided_filter_step(
+    guide: np.ndarray,
+    input_img: np.ndarray,
+    window_h: int,
+    window_v: int,
+    regularization: float = 1e-6,
+) -> np.ndarray:
+    """Reference for PPIIGFPPI._guided_filter_step (Eq.6-8).
+
+    Linear model: q_i = a_k * I_i + b_k
+
+    Coefficients (Eq.8):
+        a_k = (cov(I,p)) / (var(I) + ε)
+        b_k = mean(p) - a_k * mean(I)
+    """
+    # Window size tuple (height, width) for uniform_filter
+    size = (window_v, window_h)
+
+    # Compute local means
+    mean_I = uniform_filter(guide, size=size, mode="reflect")
+    mean_p = uniform_filter(input_img, size=size, mode="reflect")
+    mean_Ip = uniform_filter(guide * input_img, size=size, mode="reflect")
+    mean_II = uniform_filter(guide * guide, size=size, mode="reflect")
+
+    # Compute covariance and variance
+    cov_Ip = mean_Ip - mean_I * mean_p
+    var_I = mean_II - mean_I * mean_I
+
+    # Linear coefficients (Eq.8)
+    a = cov_Ip / (var_I + regularization)
+    b = mean_p - a * mean_I
+
+    # Compute mean of a and b over local windows
+    mean_a = uniform_filter(a, size=size, mode="reflect")
+    mean_b = uniform_filter(b, size=size, mode="reflect")
+
+    # Output: q = mean_a * I + mean_b (Eq.6)
+    return mean_a * guide + mean_b
+
+
+# Odd, even, mixed and degenerate (single pixel, single row) shapes
+CORPUS_SHAPES = [(1, 1), (1, 6), (2, 2), (3, 5), (8, 8), (17, 16), (31, 33)]
+
+CORPUS_PATTERNS = ("flat", "noise", "edges", "checker", "extremes")
+
+
+def corpus_image(pattern: str, shape: Tuple[int, int], seed: int = 0) -> np.ndarray:
+    """Deterministic test image in [0, 255].
+
+    Args:
+        pattern: "flat" (constant), "noise" (uniform), "edges" (steps and a
+            diagonal plus mild noise), "checker" (one-pixel checkerboard) or
+            "extremes" (random 0/255 pixels)
+        shape: (H, W)
+        seed: Random seed
+
+    Returns:
+        np.ndarray: Shape (H, W), float32, no NaN or inf
+    """
+    rng = np.random.default_rng(seed)
+    h, w = shape
+    y, x = np.mgrid[0:h, 0:w]
+    if pattern == "flat":
+        image = np.full(shape, 100.0)
+    elif pattern == "noise":
+        image = rng.uniform(0, 255, shape)
+    elif pattern == "edges":
+        image = 40.0 + 120.0 * (x >= w // 2) + 60.0 * (y >= h // 3) + 30.0 * (y * w > x * h)
+        image += rng.normal(0, 2, shape)
+    elif pattern == "checker":
+        image = 255.0 * ((x + y) % 2)
+    elif pattern == "extremes":
+        image = rng.choice([0.0, 255.0], size=shape)
+    else:
+        raise ValueError(f"Unknown corpus pattern: {pattern}")
+    return np.clip(image, 0, 255).astype(np.float32)
+
+
+def corpus(seed: int = 0) -> Iterator[Tuple[str, Dict[str, np.ndarray]]]:
+    """Seeded corpus of kernel inputs, one case per pattern and shape.
+
+    Yields:
+        Tuple of (case name, inputs) where inputs holds
+            image (H, W) and lowfreq (H, W) in [0, 255],
+            guide (H, W) in [0, 1],
+            delta (H, W) signed spectral difference in [-255, 255],
+            ppi_2x (2H, 2W) in [0, 255]
+    """
+    for p, pattern in enumerate(CORPUS_PATTERNS):
+        for s, shape in enumerate(CORPUS_SHAPES):
+            case_seed = seed * 1000 + p * 100 + s * 10
+            image = corpus_image(pattern, shape, case_seed)
+            channel = corpus_image(pattern, shape, case_seed + 1)
+            yield f"{pattern}_{shape[0]}x{shape[1]}", {
+                "image": image,
+                "lowfreq": gaussian_filter(image, sigma=1.0),
+                "guide": corpus_image(pattern, shape, case_seed + 2) / np.float32(255),
+                "delta": 2 * channel - image - corpus_image(pattern, shape, case_seed + 3),
+                "ppi_2x": corpus_image(pattern, (2 * shape[0], 2 * shape[1]), case_seed + 4),
+            }
+
+
+# Kernel name → (reference, inputs → positional arguments)
+KERNELS: Dict[str, Tuple[Callable, Callable[[dict], tuple]]] = {
+    "btes_upsample": (btes_upsample, lambda c: (c["delta"], c["ppi_2x"])),
+    "directional_upscale": (directional_upscale, lambda c: (c["image"], c["guide"])),
+    "highfreq_correction": (highfreq_correction, lambda c: (c["image"], c["lowfreq"])),
+    "guided_filter_step_h": (guided_filter_step, lambda c: (c["image"], c["lowfreq"], 7, 3)),
+    "guided_filter_step_v": (guided_filter_step, lambda c: (c["image"], c["lowfreq"], 3, 7)),
+}
+
+
+def compare_kernel(
+    kernel: str,
+    candidate: Callable,
+    seed: int = 0,
+    rtol: float = 1e-5,
+    atol: float = 1e-3,
+) -> List[str]:
+    """Run a candidate implementation against its reference on the corpus.
+
+    Args:
+        kernel: Key of KERNELS
+        candidate: Function taking the same positional arguments as the reference
+        seed: Corpus seed
+        rtol: Relative tolerance
+        atol: Absolute tolerance (values are on a 0-255 scale)
+
+    Returns:
+        List of mismatch messages, one per failing case (empty if all agree)
+    """
+    if kernel not in KERNELS:
+        raise ValueError(f"Unknown kernel: {kernel}")
+    reference, arguments = KERNELS[kernel]
+
+    failures = []
+    for name, inputs in corpus(seed):
+        args = arguments(inputs)
+        expected = reference(*args)
+        actual = np.asarray(candidate(*args))
+        if actual.shape != expected.shape or actual.dtype != expected.dtype:
+            failures.append(
+                f"{name}: got {actual.shape} {actual.dtype}, "
+                f"expected {expected.shape} {expected.dtype}"
+            )
+            continue
+        if not np.allclose(actual, expected, rtol=rtol, atol=atol):
+            error = np.abs(actual.astype(np.float64) - expected)
+            y, x = np.unravel_index(np.argmax(error), error.shape)
+            failures.append(
+                f"{name}: max abs error {error.max():.3g} at ({y}, {x}), "
+                f"{np.count_nonzero(~np.isclose(actual, expected, rtol=rtol, atol=atol))} "
+                f"of {error.size} values out of tolerance"
+            )
+    return failures
@@ -0,0 +1,161 @@
+"""sRGB preview rendering of multispectral cubes.
+
+Each band is weighted by the CIE 1931 color-matching functions at its
+center wavelength and converted to linear sRGB, so the whole projection is
+one (N, 3) matrix applied with a tiled matmul. White balance is folded into
+the matrix and the sRGB transfer curve is applied with a lookup table.
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from .spectral_cube import WAVELENGTHS
+
+# CIE XYZ → linear sRGB (D65)
+XYZ_TO_SRGB = np.array([
+    [3.2406, -1.5372, -0.4986],
+    [-0.9689, 1.8758, 0.0415],
+    [0.0557, -0.2040, 1.0570],
+])
+
+# Resolution of the gamma lookup table over linear [0, 1]
+LUT_SIZE = 4096
+
+# Pixels projected per matmul tile (keeps the tile of all bands in L2 cache)
+TILE_PIXELS = 1 << 14
+
+WHITE_BALANCE_MODES = ("equal_energy", "gray_world")
+
+
+def _lobe(wavelengths: np.ndarray, mu: float, sigma_low: float, sigma_high: float) -> np.ndarray:
+    sigma = np.where(wavelengths < mu, sigma_low, sigma_high)
+    return np.exp(-0.5 * ((wavelengths - mu) / sigma) ** 2)
+
+
+def cie_cmf(wavelengths: Sequence[float]) -> np.ndarray:
+    """CIE 1931 2° color-matching functions.
+
+    Uses the multi-lobe Gaussian fit of Wyman, Sloan and Shirley (2013),
+    which is within a few percent of the tabulated data over 380-780nm.
+
+    Args:
+        wavelengths: Wavelengths in nm, shape (N,)
+
+    Returns:
+        np.ndarray: (x̄, ȳ, z̄) per wavelength, shape (N, 3)
+    """
+    wl = np.asarray(wavelengths, dtype=np.float64)
+    x = (1.056 * _lobe(wl, 599.8, 37.9, 31.0)
+         + 0.362 * _lobe(wl, 442.0, 16.0, 26.7)
+         - 0.065 * _lobe(wl, 501.1, 20.4, 26.2))
+    y = 0.821 * _lobe(wl, 568.8, 46.9, 40.5) + 0.286 * _lobe(wl, 530.9, 16.3, 31.1)
+    z = 1.217 * _lobe(wl, 437.0, 11.8, 36.0) + 0.681 * _lobe(wl, 459.0, 26.0, 13.8)
+    return np.stack([x, y, z], axis=1)
+
+
+def srgb_matrix(wavelengths: Sequence[float] = WAVELENGTHS) -> np.ndarray:
+    """Band → linear sRGB projection, balanced for an equal-energy white.
+
+    A flat spectrum of value 1 in every band maps to RGB (1, 1, 1).
+
+    Args:
+        wavelengths: Band centers in nm, shape (N,)
+
+    Returns:
+        np.ndarray: Shape (N, 3), float32
+    """
+    matrix = cie_cmf(wavelengths) @ XYZ_TO_SRGB.T
+    return (matrix / matrix.sum(axis=0)).astype(np.float32)
+
+
+def srgb_gamma_lut(size: int = LUT_SIZE) -> np.ndarray:
+    """uint8 sRGB transfer curve sampled over linear [0, 1].
+
+    Returns:
+        np.ndarray: Shape (size,), uint8
+    """
+    linear = np.linspace(0.0, 1.0, size)
+    encoded = np.where(
+        linear <= 0.0031308,
+        12.92 * linear,
+        1.055 * np.power(linear, 1 / 2.4) - 0.055,
+    )
+    return np.round(encoded * 255).astype(np.uint8)
+
+
+def render_rgb(
+    channels: np.ndarray,
+    wavelengths: Optional[Sequence[float]] = None,
+    white_balance: Union[str, Sequence[float]] = "equal_energy",
+    max_value: float = 255.0,
+    exposure: float = 1.0,
+) -> np.ndarray:
+    """Render an sRGB composite of a multispectral cube.
+
+    Args:
+        channels: Channel cube (N, H, W)
+        wavelengths: Band centers in nm (default: WAVELENGTHS for 15 bands)
+        white_balance: "equal_energy" (flat spectrum → neutral),
+            "gray_world" (image mean → neutral) or explicit (r, g, b) gains
+        max_value: Band value that maps to full scale (255 for uint8 data)
+        exposure: Extra linear gain before the gamma curve
+
+    Returns:
+        np.ndarray: sRGB image (H, W, 3), uint8
+    """
+    if channels.ndim != 3:
+        raise ValueError(f"Expected channels of shape (N, H, W), got {channels.shape}")
+    n_bands, height, width = channels.shape
+
+    if wavelengths is None:
+        if n_bands != len(WAVELENGTHS):
+            raise ValueError(f"wavelengths are required for a {n_bands}-band cube")
+        wavelengths = WAVELENGTHS
+    if len(wavelengths) != n_bands:
+        raise ValueError(f"Got {len(wavelengths)} wavelengths for {n_bands} bands")
+
+    matrix = srgb_matrix(wavelengths).astype(np.float64)
+    matrix *= _white_balance_gains(channels, matrix, white_balance)[np.newaxis, :]
+    # Scale so the matmul lands directly on LUT indices
+    matrix *= exposure * (LUT_SIZE - 1) / max_value
+    projection = matrix.astype(np.float32)  # (N, 3)
+
+    lut = srgb_gamma_lut()
+    flat = channels.reshape(n_bands, -1)
+    out = np.empty((height * width, 3), dtype=np.uint8)
+    for start in range(0, height * width, TILE_PIXELS):
+        stop = min(start + TILE_PIXELS, height * width)
+        tile = flat[:, start:stop].astype(np.float32, copy=False)
+        # (K, N) @ (N, 3): the transposed tile is handed to BLAS without a copy
+        linear = tile.T @ projection
+        np.clip(linear, 0, LUT_SIZE - 1, out=linear)
+        np.take(lut, linear.astype(np.intp), out=out[start:stop])
+
+    return out.reshape(height, width, 3)
+
+
+def _white_balance_gains(
+    channels: np.ndarray,
+    matrix: np.ndarray,
+    white_balance: Union[str, Sequence[float]],
+) -> np.ndarray:
+    """Per-channel RGB gains on top of the equal-energy balanced matrix."""
+    if isinstance(white_balance, str):
+        if white_balance not in WHITE_BALANCE_MODES:
+            raise ValueError(
+                f"white_balance must be one of {WHITE_BALANCE_MODES} or (r, g, b) gains, "
+                f"got {white_balance!r}"
+            )
+        if white_balance == "equal_energy":
+            return np.ones(3)
+        # Gray world: the image's mean spectrum becomes neutral
+        mean_rgb = channels.reshape(channels.shape[0], -1).mean(axis=1, dtype=np.float64) @ matrix
+        if np.any(mean_rgb <= 0):
+            return np.ones(3)
+        return mean_rgb.mean() / mean_rgb
+
+    gains = np.asarray(white_balance, dtype=np.float64)
+    if gains.shape != (3,):
+        raise ValueError(f"Expected 3 white balance gains, got {gains.shape}")
+    return gains
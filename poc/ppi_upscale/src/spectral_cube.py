@@ -0,0 +1,213 @@
+"""Spectral cube with planar and pixel-interleaved layouts.
+
+Per-band processing (PPI generation, upsampling) wants the planar (N, H, W)
+layout, while per-pixel queries (spectrum under the cursor, ROI statistics)
+want all N values of a pixel next to each other. SpectralCube keeps the
+planar cube and, on request, a pixel-interleaved (H, W, N) copy, and answers
+spectrum queries from whichever layout is cheaper.
+"""
+
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Boolean (H, W) mask, or (row slice, column slice) for a rectangle
+Region = Union[np.ndarray, Tuple[slice, slice]]
+
+# Sensor band centers in nm (15 bands, 410nm-690nm in 20nm steps)
+WAVELENGTHS = [410, 430, 450, 470, 490, 510, 530, 550, 570, 590, 610, 630, 650, 670, 690]
+
+
+class SpectralCube:
+    """Multispectral cube with fast per-pixel and ROI spectrum queries."""
+
+    def __init__(
+        self,
+        planar: np.ndarray,
+        wavelengths: Optional[Sequence[float]] = None,
+        interleaved: bool = False,
+    ):
+        """Wrap a planar cube.
+
+        Args:
+            planar: Channel cube (N, H, W)
+            wavelengths: Band centers in nm, one per band (optional)
+            interleaved: Build the (H, W, N) copy right away
+        """
+        if planar.ndim != 3:
+            raise ValueError(f"Expected a cube of shape (N, H, W), got {planar.shape}")
+        if wavelengths is not None and len(wavelengths) != planar.shape[0]:
+            raise ValueError(
+                f"Got {len(wavelengths)} wavelengths for {planar.shape[0]} bands"
+            )
+
+        self.planar = planar
+        self.wavelengths = np.asarray(wavelengths, dtype=np.float64) if wavelengths is not None else None
+        self._interleaved: Optional[np.ndarray] = None
+        if interleaved:
+            self.build_interleaved()
+
+    @classmethod
+    def from_interleaved(cls, cube: np.ndarray, **kwargs) -> "SpectralCube":
+        """Create a cube from pixel-interleaved (H, W, N) data, e.g. a .mat cube.
+
+        Both layouts are kept, since the interleaved one is already at hand.
+        """
+        if cube.ndim != 3:
+            raise ValueError(f"Expected a cube of shape (H, W, N), got {cube.shape}")
+        spectral_cube = cls(np.ascontiguousarray(cube.transpose(2, 0, 1)), **kwargs)
+        spectral_cube._interleaved = np.ascontiguousarray(cube)
+        return spectral_cube
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """Planar shape (N, H, W)."""
+        return self.planar.shape
+
+    @property
+    def n_bands(self) -> int:
+        return self.planar.shape[0]
+
+    @property
+    def has_interleaved(self) -> bool:
+        return self._interleaved is not None
+
+    @property
+    def interleaved(self) -> np.ndarray:
+        """Pixel-interleaved (H, W, N) copy, built on first access."""
+        return self.build_interleaved()
+
+    def build_interleaved(self) -> np.ndarray:
+        """Build the contiguous (H, W, N) copy if it does not exist yet.
+
+        Returns:
+            np.ndarray: Shape (H, W, N), same dtype as the planar cube
+        """
+        if self._interleaved is None:
+            self._interleaved = np.ascontiguousarray(self.planar.transpose(1, 2, 0))
+        return self._interleaved
+
+    def drop_interleaved(self):
+        """Free the interleaved copy."""
+        self._interleaved = None
+
+    def spectrum(self, y: int, x: int) -> np.ndarray:
+        """Spectrum of one pixel.
+
+        Args:
+            y: Row index
+            x: Column index
+
+        Returns:
+            np.ndarray: Shape (N,)
+        """
+        if self._interleaved is not None:
+            return self._interleaved[y, x].copy()
+        return self.planar[:, y, x].copy()
+
+    def spectra(self, ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+        """Spectra of many pixels in one gather.
+
+        Args:
+            ys: Row indices, shape (K,)
+            xs: Column indices, shape (K,)
+
+        Returns:
+            np.ndarray: Shape (K, N)
+        """
+        ys = np.asarray(ys, dtype=np.intp)
+        xs = np.asarray(xs, dtype=np.intp)
+        if self._interleaved is not None:
+            return self._interleaved[ys, xs]
+        return self.planar[:, ys, xs].T
+
+    def _region_pixels(self, region: Region) -> np.ndarray:
+        """Gather the spectra inside a region as a (K, N) array."""
+        if isinstance(region, tuple):
+            rows, cols = region
+            if self._interleaved is not None:
+                return self._interleaved[rows, cols].reshape(-1, self.n_bands)
+            return self.planar[:, rows, cols].reshape(self.n_bands, -1).T
+
+        mask = np.asarray(region, dtype=bool)
+        if mask.shape != self.planar.shape[1:]:
+            raise ValueError(f"Mask shape {mask.shape} does not match cube {self.planar.shape[1:]}")
+
+        # Restrict to the mask's bounding box before gathering
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        if rows.size == 0:
+            return np.empty((0, self.n_bands), dtype=self.planar.dtype)
+        box = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+        sub_mask = mask[box]
+        if self._interleaved is not None:
+            return self._interleaved[box][sub_mask]
+        return self.planar[(slice(None),) + box][:, sub_mask].T
+
+    def roi_mean(self, region: Region) -> np.ndarray:
+        """Mean spectrum over a region.
+
+        Args:
+            region: Boolean (H, W) mask or (row slice, column slice)
+
+        Returns:
+            np.ndarray: Shape (N,), float64
+        """
+        return self.roi_stats(region)[0]
+
+    def roi_std(self, region: Region) -> np.ndarray:
+        """Standard deviation spectrum over a region.
+
+        Args:
+            region: Boolean (H, W) mask or (row slice, column slice)
+
+        Returns:
+            np.ndarray: Shape (N,), float64
+        """
+        return self.roi_stats(region)[1]
+
+    def roi_stats(self, region: Region) -> Tuple[np.ndarray, np.ndarray]:
+        """Mean and standard deviation spectra over a region in one gather.
+
+        Args:
+            region: Boolean (H, W) mask or (row slice, column slice)
+
+        Returns:
+            Tuple of (mean, std), each of shape (N,), float64
+        """
+        pixels = self._region_pixels(region)
+        if pixels.shape[0] == 0:
+            raise ValueError("Region contains no pixels")
+        mean = pixels.mean(axis=0, dtype=np.float64)
+        std = np.sqrt(np.mean(np.square(pixels - mean), axis=0))
+        return mean, std
+
+    def to_rgb(self, **kwargs) -> np.ndarray:
+        """Render an sRGB preview of the cube (see rgb_composite.render_rgb).
+
+        Returns:
+            np.ndarray: sRGB image (H, W, 3), uint8
+        """
+        from .rgb_composite import render_rgb
+
+        return render_rgb(self.planar, wavelengths=self.wavelengths, **kwargs)
+
+    def line_profile(self, start, end, num: Optional[int] = None, order: int = 1) -> np.ndarray:
+        """Profile of every band along a segment (see line_profile.line_profile).
+
+        Returns:
+            np.ndarray: Shape (N, L), float32
+        """
+        from .line_profile import line_profile
+
+        return line_profile(self.planar, start, end, num=num, order=order)
+
+    def polyline_profile(self, points, spacing: float = 1.0, order: int = 1) -> np.ndarray:
+        """Profile of every band along a polyline (see line_profile.polyline_profile).
+
+        Returns:
+            np.ndarray: Shape (N, L), float32
+        """
+        from .line_profile import polyline_profile
+
+        return polyline_profile(self.planar, points, spacing=spacing, order=order)
@@ -5,6 +5,7 @@ import numpy as np
 from .spectral_difference import compute_spectral_difference, compute_all_spectral_differences
 from .btes_upsample import btes_upsample
 from .spectral_reconstruct import reconstruct_channel, reconstruct_all_channels
+from .profiling import span
 
 
 class SpectralUpsampler:
@@ -60,12 +61,15 @@ class SpectralUpsampler:
         h2, w2 = ppi_2x.shape
 
         # 1. 모든 spectral difference 계산
-        deltas = compute_all_spectral_differences(channels, ppi)
+        with span("spectral_difference"):
+            deltas = compute_all_spectral_differences(channels, ppi)
 
         # 2. 각 delta를 BTES로 업샘플
         deltas_2x = np.zeros((n_channels, h2, w2), dtype=np.float32)
         for i in range(n_channels):
-            deltas_2x[i] = btes_upsample(deltas[i], ppi_2x)
+            with span("btes_upsample", channel=i):
+                deltas_2x[i] = btes_upsample(deltas[i], ppi_2x)
 
         # 3. 모든 채널 복원
-        return reconstruct_all_channels(ppi_2x, deltas_2x)
+        with span("spectral_reconstruct"):
+            return reconstruct_all_channels(ppi_2x, deltas_2x)
@@ -0,0 +1,75 @@
+"""Tests for the stage benchmark harness (not the benchmarks themselves)."""
+
+import numpy as np
+
+from benchmark import make_cube, run_benchmarks, compare
+
+
+def _results(*records):
+    return {"meta": {}, "results": [dict(status="ok", bands=15, **r) for r in records]}
+
+
+class TestBenchmarkHarness:
+    def test_make_cube(self):
+        cube = make_cube(32, bands=5, seed=1)
+
+        assert cube.shape == (5, 32, 32)
+        assert cube.dtype == np.float32
+        assert 0 <= cube.min() and cube.max() <= 255
+        np.testing.assert_array_equal(cube, make_cube(32, bands=5, seed=1))
+
+    def test_run_records_metrics(self):
+        results = run_benchmarks(
+            [16, 32], ["load", "ppi_simple", "upscale_bicubic"], bands=3, repeat=1, verbose=False
+        )
+
+        records = results["results"]
+        assert [(r["stage"], r["size"]) for r in records] == [
+            ("load", 16), ("ppi_simple", 16), ("upscale_bicubic", 16),
+            ("load", 32), ("ppi_simple", 32), ("upscale_bicubic", 32),
+        ]
+        for record in records:
+            assert record["status"] == "ok"
+            assert record["seconds"] > 0
+            assert record["peak_mb"] > 0
+
+    def test_time_budget_skips_larger_sizes(self):
+        results = run_benchmarks([16, 32], ["ppi_simple"], bands=3, repeat=1,
+                                 memory=False, time_budget=0.0, verbose=False)
+
+        assert [r["status"] for r in results["results"]] == ["ok", "skipped"]
+
+    def test_compare_flags_slowdown_and_memory(self):
+        baseline = _results(
+            {"stage": "guide", "size": 256, "seconds": 1.0, "peak_mb": 10.0},
+            {"stage": "ppi_simple", "size": 256, "seconds": 1.0, "peak_mb": 10.0},
+        )
+        current = _results(
+            {"stage": "guide", "size": 256, "seconds": 1.5, "peak_mb": 10.0},
+            {"stage": "ppi_simple", "size": 256, "seconds": 1.1, "peak_mb": 20.0},
+            {"stage": "ppi_ppid", "size": 256, "seconds": 9.0, "peak_mb": 10.0},
+        )
+
+        regressions = compare(current, baseline, threshold=0.2)
+
+        assert len(regressions) == 2
+        assert regressions[0].startswith("guide @ 256²")
+        assert "peak" in regressions[1]
+        assert compare(current, baseline, threshold=1.5) == []
+
+    def test_compare_flags_skipped_and_missing(self):
+        baseline = _results(
+            {"stage": "guide", "size": 256, "seconds": 1.0},
+            {"stage": "guide", "size": 512, "seconds": 4.0},
+            {"stage": "ppi_simple", "size": 512, "seconds": 1.0},
+        )
+        baseline["results"].append({"stage": "ppi_ppid", "size": 512, "bands": 15, "status": "skipped"})
+        current = _results({"stage": "guide", "size": 256, "seconds": 1.0})
+        current["results"].append({"stage": "guide", "size": 512, "bands": 15, "status": "skipped"})
+
+        regressions = compare(current, baseline)
+
+        assert regressions == [
+            "guide @ 512²: skipped (ran in baseline)",
+            "ppi_simple @ 512²: missing (ran in baseline)",
+        ]
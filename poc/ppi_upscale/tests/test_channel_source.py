@@ -0,0 +1,119 @@
+"""Tests for channel sources."""
+
+import numpy as np
+import pytest
+import scipy.io as sio
+from PIL import Image
+
+from src import (
+    PPISimple,
+    ArraySource,
+    PNGDirectorySource,
+    NpySource,
+    MatSource,
+    MosaicSource,
+    open_channel_source,
+)
+
+
+@pytest.fixture
+def sample_cube():
+    """Create a small uint8 cube (N, H, W) with distinct bands."""
+    rng = np.random.default_rng(1)
+    return rng.integers(0, 256, (3, 10, 14), dtype=np.uint8)
+
+
+@pytest.fixture
+def png_dir(tmp_path, sample_cube):
+    for i, wavelength in enumerate([410, 430, 450]):
+        Image.fromarray(sample_cube[i], mode="L").save(tmp_path / f"{wavelength}nm.png")
+    return tmp_path
+
+
+class TestSources:
+    def test_png_directory(self, png_dir, sample_cube):
+        source = open_channel_source(png_dir)
+
+        assert isinstance(source, PNGDirectorySource)
+        assert source.shape == sample_cube.shape
+        np.testing.assert_array_equal(source[1], sample_cube[1])
+        np.testing.assert_array_equal(source.read_all(), sample_cube)
+
+    def test_png_directory_empty(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            PNGDirectorySource(tmp_path)
+
+    def test_npy_layouts(self, tmp_path, sample_cube):
+        np.save(tmp_path / "nhw.npy", sample_cube)
+        np.save(tmp_path / "hwn.npy", sample_cube.transpose(1, 2, 0))
+
+        nhw = open_channel_source(tmp_path / "nhw.npy")
+        hwn = NpySource(tmp_path / "hwn.npy", layout="HWN")
+
+        assert isinstance(nhw, NpySource)
+        assert hwn.shape == sample_cube.shape
+        np.testing.assert_array_equal(nhw.read_all(), sample_cube)
+        np.testing.assert_array_equal(hwn.read_all(), sample_cube)
+
+    def test_npy_invalid_layout(self, tmp_path, sample_cube):
+        np.save(tmp_path / "cube.npy", sample_cube)
+        with pytest.raises(ValueError):
+            NpySource(tmp_path / "cube.npy", layout="WHN")
+
+    def test_mat_scaled(self, tmp_path, sample_cube):
+        cube01 = sample_cube.transpose(1, 2, 0).astype(np.float32) / 255
+        sio.savemat(tmp_path / "cube.mat", {"img": cube01})
+
+        source = open_channel_source(tmp_path / "cube.mat", scale=255)
+
+        assert isinstance(source, MatSource)
+        assert source.shape == sample_cube.shape
+        np.testing.assert_allclose(source[2], sample_cube[2], atol=1e-3)
+        np.testing.assert_allclose(source.read_all(), sample_cube, atol=1e-3)
+
+    def test_mosaic(self, tmp_path):
+        mosaic = np.arange(3 * 4 * 5 * 6, dtype=np.uint8).reshape(12, 30)
+        Image.fromarray(mosaic, mode="L").save(tmp_path / "frame.png")
+
+        source = open_channel_source(tmp_path / "frame.png")
+
+        assert isinstance(source, MosaicSource)
+        assert source.shape == (15, 4, 6)
+        # Band 6 is row 1, column 1
+        np.testing.assert_array_equal(source[6], mosaic[4:8, 6:12])
+
+    def test_negative_and_out_of_range_index(self, sample_cube):
+        source = ArraySource(sample_cube)
+
+        np.testing.assert_array_equal(source[-1], sample_cube[2])
+        with pytest.raises(IndexError):
+            source.get_band(3)
+
+    def test_iteration_yields_float32(self, sample_cube):
+        bands = list(ArraySource(sample_cube))
+
+        assert len(bands) == 3
+        assert all(band.dtype == np.float32 for band in bands)
+
+    def test_unsupported_file(self, tmp_path):
+        path = tmp_path / "cube.txt"
+        path.write_text("")
+        with pytest.raises(ValueError):
+            open_channel_source(path)
+
+
+class TestGeneratorSource:
+    def test_from_source_matches_png(self, png_dir, tmp_path, sample_cube):
+        np.save(tmp_path / "cube.npy", sample_cube)
+
+        from_png = PPISimple(png_dir).generate_ppi()
+        from_npy = PPISimple.from_source(NpySource(tmp_path / "cube.npy")).generate_ppi()
+
+        np.testing.assert_array_equal(from_png, from_npy)
+
+    def test_input_path_dispatch(self, tmp_path, sample_cube):
+        np.save(tmp_path / "cube.npy", sample_cube)
+
+        generator = PPISimple(tmp_path / "cube.npy")
+
+        np.testing.assert_array_equal(generator.load_channels(), sample_cube)
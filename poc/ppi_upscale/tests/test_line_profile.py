@@ -0,0 +1,86 @@
+"""Tests for batched line profiles."""
+
+import numpy as np
+import pytest
+from scipy.ndimage import map_coordinates
+
+from src import SpectralCube, line_profile, polyline_profile
+from src.line_profile import line_coordinates, polyline_coordinates, sample_bands
+
+
+@pytest.fixture
+def cube():
+    rng = np.random.default_rng(4)
+    return rng.random((6, 30, 40), dtype=np.float32) * 255
+
+
+def reference(cube, rows, cols, order):
+    return np.stack([
+        map_coordinates(band, [rows, cols], order=order, mode="nearest") for band in cube
+    ])
+
+
+class TestCoordinates:
+    def test_line_default_spacing(self):
+        rows, cols = line_coordinates((0, 0), (3, 4))
+        assert len(rows) == 6
+        assert (rows[-1], cols[-1]) == (3, 4)
+
+    def test_polyline_spacing(self):
+        rows, cols = polyline_coordinates([(0, 0), (0, 10), (5, 10)], spacing=2.5)
+        np.testing.assert_allclose(cols[:5], [0, 2.5, 5, 7.5, 10])
+        np.testing.assert_allclose(rows[4:], [0, 2.5, 5])
+
+    def test_polyline_needs_two_points(self):
+        with pytest.raises(ValueError):
+            polyline_coordinates([(1, 1)])
+
+
+class TestProfiles:
+    def test_bilinear_matches_map_coordinates(self, cube):
+        rows, cols = line_coordinates((2.3, 1.7), (27.9, 36.2), 50)
+
+        profile = sample_bands(cube, rows, cols, order=1)
+
+        assert profile.shape == (6, 50)
+        assert profile.dtype == np.float32
+        np.testing.assert_allclose(profile, reference(cube, rows, cols, 1), rtol=1e-5, atol=1e-3)
+
+    def test_nearest_matches_map_coordinates(self, cube):
+        rows, cols = line_coordinates((2.2, 1.1), (27.9, 36.2), 33)
+
+        profile = line_profile(cube, (2.2, 1.1), (27.9, 36.2), num=33, order=0)
+
+        np.testing.assert_array_equal(profile, reference(cube, rows, cols, 0))
+
+    def test_integer_line_hits_pixels(self, cube):
+        profile = line_profile(cube, (5, 0), (5, 39))
+        np.testing.assert_allclose(profile, cube[:, 5, :], rtol=1e-6)
+
+    def test_out_of_bounds_clamped(self, cube):
+        profile = line_profile(cube, (-5, -5), (-5, 50), num=3, order=0)
+        np.testing.assert_array_equal(profile[:, 0], cube[:, 0, 0])
+        np.testing.assert_array_equal(profile[:, -1], cube[:, 0, -1])
+
+    def test_polyline(self, cube):
+        points = [(1, 1), (1, 20), (25, 20)]
+        rows, cols = polyline_coordinates(points)
+
+        profile = polyline_profile(cube, points)
+
+        assert profile.shape == (6, len(rows))
+        np.testing.assert_allclose(profile, reference(cube, rows, cols, 1), rtol=1e-5, atol=1e-3)
+
+    def test_invalid_order(self, cube):
+        with pytest.raises(ValueError):
+            line_profile(cube, (0, 0), (5, 5), order=3)
+
+    def test_spectral_cube_methods(self, cube):
+        spectral_cube = SpectralCube(cube)
+        np.testing.assert_array_equal(
+            spectral_cube.line_profile((0, 0), (20, 30)), line_profile(cube, (0, 0), (20, 30))
+        )
+        np.testing.assert_array_equal(
+            spectral_cube.polyline_profile([(0, 0), (10, 0), (10, 10)]),
+            polyline_profile(cube, [(0, 0), (10, 0), (10, 10)]),
+        )
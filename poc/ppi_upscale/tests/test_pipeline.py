@@ -0,0 +1,73 @@
+"""Tests for the in-memory cube pipeline."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src import PPISimple, PPIIGFPPI, GuidedUpsampler, run_cube_pipeline
+
+
+@pytest.fixture
+def sample_cube():
+    """Create a small uint8 channel cube with some structure."""
+    rng = np.random.default_rng(0)
+    cube = np.zeros((3, 12, 16), dtype=np.uint8)
+    for i in range(3):
+        cube[i] = 60 + i * 40
+        cube[i, :, 8:] += 30
+    cube += rng.integers(0, 5, cube.shape, dtype=np.uint8)
+    return cube
+
+
+class TestFromChannels:
+    def test_channels_loaded(self, sample_cube):
+        generator = PPISimple.from_channels(sample_cube)
+
+        assert generator.input_dir is None
+        assert generator.channels.dtype == np.float32
+        np.testing.assert_array_equal(generator.load_channels(), sample_cube)
+
+    def test_kwargs_forwarded(self, sample_cube):
+        generator = PPIIGFPPI.from_channels(sample_cube, max_iterations=3)
+        assert generator.max_iterations == 3
+
+    def test_invalid_shape(self):
+        with pytest.raises(ValueError):
+            PPISimple.from_channels(np.zeros((12, 16), dtype=np.uint8))
+
+    def test_no_source(self):
+        generator = PPISimple(None)
+        with pytest.raises(ValueError):
+            generator.load_channels()
+
+    def test_matches_png_round_trip(self, sample_cube):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir = Path(tmpdir)
+            for i, wavelength in enumerate([410, 430, 450]):
+                Image.fromarray(sample_cube[i], mode="L").save(tmpdir / f"{wavelength}nm.png")
+            ppi_png = PPISimple(tmpdir).generate_ppi()
+
+        ppi_mem = PPISimple.from_channels(sample_cube).generate_ppi()
+        np.testing.assert_array_equal(ppi_mem, ppi_png)
+
+
+class TestRunCubePipeline:
+    def test_output_shapes(self, sample_cube):
+        result = run_cube_pipeline(sample_cube, method="simple")
+
+        assert result["ppi"].shape == (12, 16)
+        assert result["guide"].shape == (12, 16)
+        assert result["ppi_upscaled"].shape == (24, 32)
+        assert result["channels_upscaled"].shape == (3, 24, 32)
+
+    def test_precomputed_guide_matches(self, sample_cube):
+        result = run_cube_pipeline(sample_cube, method="simple")
+        expected = GuidedUpsampler().upscale(result["ppi"], channels=result["channels"])
+        np.testing.assert_array_equal(result["ppi_upscaled"], expected)
+
+    def test_unknown_method(self, sample_cube):
+        with pytest.raises(ValueError):
+            run_cube_pipeline(sample_cube, method="unknown")
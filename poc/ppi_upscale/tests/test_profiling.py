@@ -0,0 +1,76 @@
+"""Tests for the span profiler."""
+
+import json
+
+import numpy as np
+
+from src import PPIIGFPPI, Profiler, run_cube_pipeline
+from src.profiling import span
+
+
+class TestProfiler:
+    def test_span_without_profiler_is_noop(self):
+        with span("idle", value=1) as info:
+            info["extra"] = 2
+        assert info == {"value": 1, "extra": 2}
+
+    def test_nested_spans(self):
+        profiler = Profiler()
+        with profiler.activate():
+            with span("outer"):
+                with span("inner", index=3) as info:
+                    info["result"] = "ok"
+
+        records = {r["name"]: r for r in profiler.records}
+        assert records["outer"]["depth"] == 0
+        assert records["inner"]["depth"] == 1
+        assert records["inner"]["args"] == {"index": 3, "result": "ok"}
+        assert records["outer"]["wall"] >= records["inner"]["wall"] >= 0
+
+        # Spans outside activate() are not recorded
+        with span("after"):
+            pass
+        assert len(profiler.records) == 2
+
+    def test_trace_memory(self):
+        profiler = Profiler(trace_memory=True)
+        with profiler.activate():
+            with span("outer"):
+                with span("alloc"):
+                    data = np.ones(1 << 20, dtype=np.uint8)
+                del data
+
+        records = {r["name"]: r for r in profiler.records}
+        assert records["alloc"]["alloc_bytes"] >= 1 << 20
+        assert records["alloc"]["net_bytes"] >= 1 << 20
+        # The child's peak counts toward the parent's
+        assert records["outer"]["alloc_bytes"] >= 1 << 20
+        assert records["outer"]["net_bytes"] < 1 << 20
+
+    def test_igfppi_iterations(self):
+        cube = np.random.default_rng(0).integers(0, 255, (3, 16, 16)).astype(np.float32)
+        generator = PPIIGFPPI.from_channels(cube, max_iterations=4)
+        profiler = Profiler()
+        with profiler.activate():
+            generator.generate_ppi()
+
+        records = [r for r in profiler.records if r["name"] == "igfppi_horizontal"]
+        assert records[0]["args"]["iterations"] == generator.iterations_h
+        iterations = [r for r in profiler.records if r["name"] == "igfppi_iteration"]
+        assert len(iterations) == generator.iterations_h + generator.iterations_v
+
+    def test_chrome_trace_and_summary(self, tmp_path):
+        cube = np.random.default_rng(0).integers(0, 255, (3, 8, 8)).astype(np.uint8)
+        profiler = Profiler()
+        with profiler.activate():
+            run_cube_pipeline(cube, method="simple", upscale_method="bicubic")
+
+        path = profiler.write_chrome_trace(tmp_path / "trace.json")
+        events = json.loads(path.read_text())["traceEvents"]
+        assert {e["name"] for e in events} >= {"generate_ppi", "spectral_upsample", "btes_upsample"}
+        assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+        rows = {row["name"]: row for row in profiler.summary()}
+        assert rows["btes_upsample"]["count"] == 3
+        assert rows["btes_upsample"]["depth"] == 1
+        assert "btes_upsample" in profiler.format_summary()
@@ -0,0 +1,66 @@
+"""Equivalence of the pipeline kernels with their reference implementations."""
+
+import numpy as np
+import pytest
+
+from src import GuidedUpsampler, PPIIGFPPI, PPIPPID
+from src.btes_upsample import btes_upsample
+from src.reference import KERNELS, compare_kernel, corpus, corpus_image, directional_upscale
+
+_cube = np.zeros((3, 4, 4), dtype=np.float32)
+_igfppi = PPIIGFPPI.from_channels(_cube)
+
+# Kernels used by the pipeline, with the same signatures as the references
+PIPELINE_KERNELS = {
+    "btes_upsample": btes_upsample,
+    "directional_upscale": GuidedUpsampler()._directional_upscale,
+    "highfreq_correction": PPIPPID.from_channels(_cube)._apply_highfreq_correction,
+    "guided_filter_step_h": _igfppi._guided_filter_step,
+    "guided_filter_step_v": _igfppi._guided_filter_step,
+}
+
+
+class TestReferenceEquivalence:
+    @pytest.mark.parametrize("kernel", sorted(KERNELS))
+    def test_pipeline_kernel_matches_reference(self, kernel):
+        failures = compare_kernel(kernel, PIPELINE_KERNELS[kernel])
+        assert failures == [], "\n".join(failures)
+
+    def test_corpus_is_deterministic(self):
+        first = dict(corpus(seed=3))
+        second = dict(corpus(seed=3))
+
+        assert first.keys() == second.keys()
+        for name in first:
+            for key, value in first[name].items():
+                np.testing.assert_array_equal(value, second[name][key])
+                assert np.isfinite(value).all()
+
+    def test_corpus_covers_odd_even_and_extremes(self):
+        cases = dict(corpus())
+        shapes = {case["image"].shape for case in cases.values()}
+
+        assert any(h % 2 and w % 2 for h, w in shapes)
+        assert any(h % 2 == 0 and w % 2 == 0 for h, w in shapes)
+        assert (1, 1) in shapes
+        extremes = cases["extremes_8x8"]["image"]
+        assert set(np.unique(extremes)) == {0.0, 255.0}
+
+    def test_boundary_deviation_is_reported(self):
+        def no_boundary_fill(img, guide):
+            out = directional_upscale(img, guide)
+            out[-1, :] = 0
+            return out
+
+        failures = compare_kernel("directional_upscale", no_boundary_fill)
+        assert any(failure.startswith("flat_") for failure in failures)
+
+    def test_dtype_change_is_reported(self):
+        failures = compare_kernel(
+            "directional_upscale", lambda img, guide: directional_upscale(img, guide).astype(np.float64)
+        )
+        assert failures and "float64" in failures[0]
+
+    def test_unknown_pattern(self):
+        with pytest.raises(ValueError):
+            corpus_image("stripes", (4, 4))
@@ -0,0 +1,90 @@
+"""Tests for sRGB composite rendering."""
+
+import numpy as np
+import pytest
+
+from src import SpectralCube, render_rgb
+from src.rgb_composite import srgb_matrix, srgb_gamma_lut, LUT_SIZE
+from src.spectral_cube import WAVELENGTHS
+
+
+@pytest.fixture
+def cube():
+    rng = np.random.default_rng(3)
+    return rng.random((15, 24, 40), dtype=np.float32) * 255
+
+
+class TestMatrix:
+    def test_equal_energy_white(self):
+        matrix = srgb_matrix(WAVELENGTHS)
+
+        assert matrix.shape == (15, 3)
+        np.testing.assert_allclose(matrix.sum(axis=0), 1.0, rtol=1e-6)
+
+    def test_long_wavelengths_are_red(self):
+        matrix = srgb_matrix(WAVELENGTHS)
+        assert np.argmax(matrix[-1]) == 0
+        assert np.argmax(matrix[0]) == 2
+
+    def test_gamma_lut_endpoints(self):
+        lut = srgb_gamma_lut()
+        assert lut[0] == 0
+        assert lut[-1] == 255
+        assert np.all(np.diff(lut.astype(int)) >= 0)
+
+
+class TestRenderRGB:
+    def test_flat_spectrum_is_neutral(self):
+        channels = np.full((15, 4, 5), 255, dtype=np.uint8)
+        rgb = render_rgb(channels)
+
+        assert rgb.shape == (4, 5, 3)
+        assert rgb.dtype == np.uint8
+        assert np.all(rgb == 255)
+
+        half = render_rgb(np.full((15, 4, 5), 50.0, dtype=np.float32))
+        assert np.all(half[..., 0] == half[..., 1])
+        assert np.all(half[..., 1] == half[..., 2])
+
+    def test_matches_reference(self, cube):
+        rgb = render_rgb(cube)
+
+        matrix = srgb_matrix(WAVELENGTHS).astype(np.float64)
+        linear = np.clip(np.einsum("nhw,nc->hwc", cube.astype(np.float64), matrix) / 255, 0, 1)
+        encoded = np.where(linear <= 0.0031308, 12.92 * linear, 1.055 * linear ** (1 / 2.4) - 0.055)
+        expected = np.round(encoded * 255)
+
+        # LUT quantization over LUT_SIZE steps costs at most a couple of levels
+        assert np.abs(rgb.astype(int) - expected).max() <= 255 * 2 / np.sqrt(LUT_SIZE)
+
+    def test_gray_world(self, cube):
+        tinted = cube * np.linspace(0.3, 1.0, 15, dtype=np.float32)[:, None, None]
+        rgb = render_rgb(tinted, white_balance="gray_world").reshape(-1, 3).astype(float)
+        unbalanced = render_rgb(tinted).reshape(-1, 3).astype(float)
+
+        def spread(img):
+            means = img.mean(axis=0)
+            return means.max() - means.min()
+
+        assert spread(rgb) < spread(unbalanced)
+
+    def test_explicit_gains(self, cube):
+        rgb = render_rgb(cube, white_balance=(1.0, 0.0, 1.0))
+        assert np.all(rgb[..., 1] == 0)
+
+    def test_custom_wavelengths(self):
+        channels = np.full((31, 3, 3), 255, dtype=np.uint8)
+        rgb = render_rgb(channels, wavelengths=np.arange(400, 710, 10))
+        assert np.all(rgb == 255)
+
+    def test_invalid_arguments(self, cube):
+        with pytest.raises(ValueError):
+            render_rgb(cube[:10])
+        with pytest.raises(ValueError):
+            render_rgb(cube, white_balance="auto")
+        with pytest.raises(ValueError):
+            render_rgb(cube[0])
+
+    def test_spectral_cube_to_rgb(self, cube):
+        spectral_cube = SpectralCube(cube, wavelengths=WAVELENGTHS)
+        np.testing.assert_array_equal(spectral_cube.to_rgb(), render_rgb(cube))
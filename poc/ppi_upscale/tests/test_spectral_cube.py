@@ -0,0 +1,86 @@
+"""Tests for SpectralCube."""
+
+import numpy as np
+import pytest
+
+from src import SpectralCube
+
+
+@pytest.fixture
+def cube():
+    rng = np.random.default_rng(2)
+    return rng.random((5, 20, 30), dtype=np.float32) * 255
+
+
+@pytest.fixture
+def mask():
+    mask = np.zeros((20, 30), dtype=bool)
+    mask[3:9, 4:15] = True
+    mask[12, 25] = True
+    return mask
+
+
+class TestLayouts:
+    def test_interleaved_built_lazily(self, cube):
+        spectral_cube = SpectralCube(cube)
+
+        assert not spectral_cube.has_interleaved
+        interleaved = spectral_cube.interleaved
+        assert interleaved.shape == (20, 30, 5)
+        assert interleaved.flags.c_contiguous
+        np.testing.assert_array_equal(interleaved, cube.transpose(1, 2, 0))
+
+    def test_from_interleaved(self, cube):
+        spectral_cube = SpectralCube.from_interleaved(cube.transpose(1, 2, 0))
+
+        assert spectral_cube.has_interleaved
+        assert spectral_cube.shape == cube.shape
+        np.testing.assert_array_equal(spectral_cube.planar, cube)
+
+    def test_invalid_shape(self):
+        with pytest.raises(ValueError):
+            SpectralCube(np.zeros((20, 30)))
+
+    def test_wavelength_count(self, cube):
+        with pytest.raises(ValueError):
+            SpectralCube(cube, wavelengths=[410, 430])
+
+
+class TestQueries:
+    @pytest.mark.parametrize("interleaved", [False, True])
+    def test_spectrum(self, cube, interleaved):
+        spectral_cube = SpectralCube(cube, interleaved=interleaved)
+
+        np.testing.assert_array_equal(spectral_cube.spectrum(7, 11), cube[:, 7, 11])
+
+        ys, xs = np.array([0, 7, 19]), np.array([0, 11, 29])
+        np.testing.assert_array_equal(spectral_cube.spectra(ys, xs), cube[:, ys, xs].T)
+
+    @pytest.mark.parametrize("interleaved", [False, True])
+    def test_roi_mask(self, cube, mask, interleaved):
+        spectral_cube = SpectralCube(cube, interleaved=interleaved)
+        pixels = cube[:, mask].astype(np.float64)
+
+        mean, std = spectral_cube.roi_stats(mask)
+
+        np.testing.assert_allclose(mean, pixels.mean(axis=1))
+        np.testing.assert_allclose(std, pixels.std(axis=1))
+        np.testing.assert_allclose(spectral_cube.roi_mean(mask), mean)
+        np.testing.assert_allclose(spectral_cube.roi_std(mask), std)
+
+    @pytest.mark.parametrize("interleaved", [False, True])
+    def test_roi_rectangle(self, cube, interleaved):
+        spectral_cube = SpectralCube(cube, interleaved=interleaved)
+        region = (slice(2, 10), slice(5, 20))
+        pixels = cube[:, 2:10, 5:20].reshape(5, -1).astype(np.float64)
+
+        np.testing.assert_allclose(spectral_cube.roi_mean(region), pixels.mean(axis=1))
+        np.testing.assert_allclose(spectral_cube.roi_std(region), pixels.std(axis=1))
+
+    def test_empty_mask(self, cube):
+        with pytest.raises(ValueError):
+            SpectralCube(cube).roi_mean(np.zeros((20, 30), dtype=bool))
+
+    def test_mask_shape_mismatch(self, cube):
+        with pytest.raises(ValueError):
+            SpectralCube(cube).roi_mean(np.ones((10, 10), dtype=bool))